@@ -0,0 +1,270 @@
+"""
+Offline load benchmark for the Senti-Core API.
+
+Starts the fixture-backed Gemini/Serper stand-in (fake_backends.py), boots
+the real API with uvicorn pointed at it, then drives /api/analyze and the
+legacy /process_input/ at each concurrency level. Reports p50/p95/p99
+latency, throughput, error counts and server memory, so scheduler, cache
+and parser changes can be compared before deploying.
+
+Nothing leaves the machine: the LLM and search calls hit 127.0.0.1.
+
+Usage:
+    python benchmarks/bench_load.py [--concurrency 1,4,16] [--requests 32]
+        [--endpoints analyze,legacy] [--topic-pool 0] [--llm-latency 1.0]
+        [--search-latency 0.3] [--server-workers 0] [--no-warmup]
+        [--keep-rate-limits] [--json]
+
+--server-workers N starts the server through serve.py with N worker
+processes and shared SQLite state, as in production; the default runs a
+single uvicorn process.
+
+--topic-pool K cycles through K topics per level so the result cache gets
+hits; the default (0) makes every request a distinct topic (all misses).
+Rate limits are disabled unless --keep-rate-limits is given, so the numbers
+show the API's own overhead rather than the configured Gemini quota.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_backends import FakeBackends, Latency  # noqa: E402
+
+APP_DIR = Path(__file__).parent.parent / "crewgooglegemini"
+
+ENDPOINTS = {
+    "analyze": "/api/analyze",
+    "legacy": "/process_input/",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _child_pids(pid: int) -> List[int]:
+    try:
+        return [int(child) for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()]
+    except OSError:
+        return []
+
+
+def server_memory(pid: int) -> Dict[str, Optional[float]]:
+    """
+    Current and peak RSS in MB of the server process plus its worker
+    processes, summed (Linux only)
+    """
+    memory = {"rss_mb": None, "peak_rss_mb": None}
+    fields = {"VmRSS:": "rss_mb", "VmHWM:": "peak_rss_mb"}
+    for process in [pid] + _child_pids(pid):
+        try:
+            for line in Path(f"/proc/{process}/status").read_text().splitlines():
+                key = fields.get(line.split(":")[0] + ":")
+                if key:
+                    memory[key] = round((memory[key] or 0) + int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+    return memory
+
+
+def start_server(port: int, env: Dict[str, str], workers: int = 0) -> subprocess.Popen:
+    if workers:
+        command = [sys.executable, "serve.py", "--workers", str(workers)]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "endpoints:app"]
+    return subprocess.Popen(
+        command + ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR,
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, path: str = "/api/ready", timeout: float = 120.0):
+    """Poll `path` until the server answers 200 (the crew stack is warm for /api/ready)"""
+    deadline = time.monotonic() + timeout
+    last = None
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.get(f"{base_url}{path}", timeout=2)
+            last = response.json()
+            if response.status_code == 200:
+                return
+            if last.get("warmup", {}).get("status") == "failed":
+                sys.exit(f"server warm-up failed: {last['warmup'].get('error')}")
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    sys.exit(f"server not ready after {timeout:.0f}s (last status: {last})")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    path: str,
+    concurrency: int,
+    requests: int,
+    topic_pool: int,
+    label: str,
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def one(i: int):
+        topic = f"bench {label} c{concurrency} #{i % topic_pool if topic_pool else i}"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json={"topic": topic, "noofarticles": 3})
+                status = str(response.status_code)
+                if response.status_code == 200 and not response.json().get("success", True):
+                    status = "200-failed"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == "200":
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - started
+
+    return {
+        "endpoint": path,
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "statuses": statuses,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "wall_s": round(wall, 3),
+    }
+
+
+async def drive(args, base_url: str, server: subprocess.Popen) -> List[Dict[str, Any]]:
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for name in args.endpoints:
+            for concurrency in args.concurrency:
+                level = await run_level(
+                    client, ENDPOINTS[name], concurrency, args.requests, args.topic_pool, name
+                )
+                level.update(server_memory(server.pid))
+                results.append(level)
+                if not args.json:
+                    print_row(level)
+    return results
+
+
+def print_header():
+    print(f"{'endpoint':<18} {'conc':>4} {'ok/n':>8} {'p50 s':>8} {'p95 s':>8} "
+          f"{'p99 s':>8} {'req/s':>8} {'rss MB':>8} {'peak MB':>8}  other statuses")
+
+
+def print_row(level: Dict[str, Any]):
+    others = {k: v for k, v in level["statuses"].items() if k != "200"}
+    print(f"{level['endpoint']:<18} {level['concurrency']:>4} "
+          f"{level['ok']:>3}/{level['requests']:<4} {level['p50_s']:>8} {level['p95_s']:>8} "
+          f"{level['p99_s']:>8} {level['throughput_rps']:>8} "
+          f"{level['rss_mb'] or '-':>8} {level['peak_rss_mb'] or '-':>8}  {others or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="requests per level")
+    parser.add_argument("--endpoints", type=lambda s: s.split(","), default=list(ENDPOINTS))
+    parser.add_argument("--topic-pool", type=int, default=0, help="distinct topics per level (0 = all distinct)")
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--search-jitter", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request client timeout")
+    parser.add_argument("--server-workers", type=int, default=0, help="worker processes via serve.py (0 = one uvicorn process)")
+    parser.add_argument("--no-warmup", action="store_true", help="skip warm-up; the first request loads the crew stack")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="use the configured RPM/TPM limits")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    backends = FakeBackends(
+        llm_latency=Latency(args.llm_latency, args.llm_jitter),
+        search_latency=Latency(args.search_latency, args.search_jitter),
+    ).start()
+
+    workdir = tempfile.mkdtemp(prefix="senti-bench-")
+    env = dict(os.environ)
+    env.update(backends.env())
+    env.update({
+        "SENTI_JOB_DB": os.path.join(workdir, "jobs.db"),
+        "SENTI_MONITOR_DB": os.path.join(workdir, "monitor.db"),
+        "SENTI_HISTORY_DB": os.path.join(workdir, "history.db"),
+        "SENTI_STATE_DIR": os.path.join(workdir, "state"),
+        "SENTI_JOB_WORKERS": "0",
+        "SENTI_WARMUP": "0" if args.no_warmup else "1",
+    })
+    if not args.keep_rate_limits:
+        env.update({"SENTI_LLM_RPM": "0", "SENTI_SEARCH_RPM": "0"})
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(port, env, args.server_workers)
+    try:
+        started = time.perf_counter()
+        wait_until_ready(base_url, "/api/health" if args.no_warmup else "/api/ready")
+        startup = round(time.perf_counter() - started, 2)
+        if not args.json:
+            print(f"server ready in {startup}s; fake backends at {backends.url}")
+            print_header()
+        results = asyncio.run(drive(args, base_url, server))
+        if args.json:
+            print(json.dumps({
+                "startup_s": startup,
+                "llm_latency_s": args.llm_latency,
+                "search_latency_s": args.search_latency,
+                "backend_calls": backends.counts,
+                "levels": results,
+            }, indent=2))
+        else:
+            print(f"\nbackend calls: {backends.counts}")
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        backends.stop()
+
+
+if __name__ == "__main__":
+    main()
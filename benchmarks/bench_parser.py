@@ -0,0 +1,139 @@
+"""
+Micro-benchmark for agent output parsing.
+
+Compares the original regex/keyword parser (called three times per fusion
+output, as analyze_sentiment_multimodal used to) with the compiled
+single-pass parser in crewgooglegemini/parsing.py (called once).
+
+Usage:
+    python benchmarks/bench_parser.py [--repeat N]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "crewgooglegemini"))
+
+from parsing import parse_agent_output  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+# ---------------------------------------------
+# Reference: parser as it was before the rewrite
+# ---------------------------------------------
+
+def legacy_extract_json_from_text(text):
+    try:
+        json_match = re.search(r'\{[\s\S]*\}', text)
+        if json_match:
+            return json.loads(json_match.group())
+    except Exception:
+        pass
+    return {"raw_analysis": text, "extracted": True, "format": "text"}
+
+
+def legacy_parse_agent_output(output, agent_name):
+    result = {
+        "agent_name": agent_name,
+        "timestamp": datetime.now().isoformat(),
+        "raw_output": output,
+    }
+    score_patterns = [
+        r'sentiment[_\s]*score[:\s]+(-?\d+(?:\.\d+)?)',
+        r'score[:\s]+(-?\d+(?:\.\d+)?)',
+        r'rating[:\s]+(-?\d+(?:\.\d+)?)',
+    ]
+    for pattern in score_patterns:
+        match = re.search(pattern, output, re.IGNORECASE)
+        if match:
+            result["sentiment_score"] = float(match.group(1))
+            break
+    if "sentiment_score" not in result:
+        positive_words = ['positive', 'good', 'excellent', 'great', 'optimistic']
+        negative_words = ['negative', 'bad', 'poor', 'pessimistic', 'concerning']
+        output_lower = output.lower()
+        pos_count = sum(word in output_lower for word in positive_words)
+        neg_count = sum(word in output_lower for word in negative_words)
+        result["sentiment_score"] = 5.0 if pos_count > neg_count else -5.0 if neg_count > pos_count else 0.0
+    confidence_match = re.search(r'confidence[:\s]+(\d+(?:\.\d+)?)\s*%?', output, re.IGNORECASE)
+    result["confidence"] = float(confidence_match.group(1)) if confidence_match else 75.0
+    findings = []
+    for line in output.split('\n'):
+        line = line.strip()
+        if line.startswith(('-', '•', '*', '→')) or (len(line) > 0 and line[0].isdigit() and '.' in line[:3]):
+            finding = re.sub(r'^[-•*→\d.)\s]+', '', line).strip()
+            if finding and len(finding) > 10:
+                findings.append(finding)
+    result["key_findings"] = findings[:5] if findings else ["Analysis completed"]
+    return result
+
+
+def legacy_pipeline(output):
+    legacy_parse_agent_output(output, "FusionAgent")
+    legacy_parse_agent_output(output, "LexiconAgent")
+    legacy_parse_agent_output(output, "VisionAgent")
+
+
+def current_pipeline(output):
+    parse_agent_output(output, "FusionAgent")
+
+
+# ---------------------------------------------
+# Synthetic agent outputs
+# ---------------------------------------------
+
+def make_text_output(size):
+    block = (
+        "The discussion around the topic is mixed with some optimistic voices.\n"
+        "- Users appreciate the new design and the overall build quality\n"
+        "- Several reviewers mention battery life concerns in daily use\n"
+        "Visual content shows bright colors and smiling faces in most clips.\n"
+    )
+    body = (block * (size // len(block) + 1))[: size - 40]
+    return body + "\nSentiment score: 4.5\nConfidence: 82%\n"
+
+
+def make_json_output(size):
+    filler = "Detailed synthesis of text and visual signals. " * (size // 48)
+    report = {
+        "agent_name": "FusionAgent",
+        "final_sentiment_score": 4.5,
+        "confidence": 82,
+        "key_findings": ["Design is praised by most users", "Battery life is a recurring concern"],
+        "synthesis": filler,
+    }
+    return "```json\n" + json.dumps(report, indent=2) + "\n```"
+
+
+def bench(fn, output, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(output)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'output':<14}{'size':>10}{'legacy ms':>12}{'current ms':>12}{'MB/s':>10}{'speedup':>10}")
+    for kind, make in (("free text", make_text_output), ("json", make_json_output)):
+        for size in SIZES:
+            output = make(size)
+            legacy = bench(legacy_pipeline, output, args.repeat)
+            current = bench(current_pipeline, output, args.repeat)
+            throughput = len(output) / current / 1e6
+            print(
+                f"{kind:<14}{len(output):>10}{legacy * 1000:>12.2f}{current * 1000:>12.2f}"
+                f"{throughput:>10.1f}{legacy / current:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Startup-time benchmark for the API process.
+
+Imports crewgooglegemini/endpoints.py in fresh interpreters with
+`python -X importtime`, reports the wall-clock import time and the modules
+with the largest cumulative import cost, and checks that crewai stays off
+the import path. With --warmup it also times pipeline.warm_up(), which is
+what the server runs in the background after startup.
+
+Run it per release and keep the --json line to track regressions:
+
+    python benchmarks/bench_startup.py [--runs N] [--top N] [--warmup] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent / "crewgooglegemini"
+
+# Heavy modules that must not be imported by `import endpoints`
+DEFERRED_MODULES = ("crewai", "crewai_tools", "litellm")
+
+IMPORT_SNIPPET = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "import endpoints\n"
+    "elapsed = time.perf_counter() - started\n"
+    "loaded = [m for m in {deferred!r} if m in sys.modules]\n"
+    "print('RESULT', elapsed, ','.join(loaded) or '-')\n"
+)
+
+WARMUP_SNIPPET = (
+    "import pipeline\n"
+    "state = pipeline.warm_up()\n"
+    "print('RESULT', state.seconds, state.status)\n"
+)
+
+
+def run_python(code: str, importtime: bool = False):
+    """Run `code` in a fresh interpreter inside the app directory"""
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    env = dict(os.environ, SENTI_JOB_DB=os.environ.get("SENTI_JOB_DB", "/tmp/senti-bench-jobs.db"))
+    proc = subprocess.run(
+        args + ["-c", code], cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    result = next(
+        (line.split()[1:] for line in proc.stdout.splitlines() if line.startswith("RESULT")),
+        None,
+    )
+    if result is None:
+        sys.exit(f"benchmark child failed:\n{proc.stderr[-2000:]}")
+    return result, proc.stderr
+
+
+def parse_importtime(stderr: str):
+    """Return {module: cumulative_us} from -X importtime output"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us | cumulative_us | <indent>module"
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.strip()
+        cumulative[module] = max(cumulative.get(module, 0), int(cumulative_us))
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--warmup", action="store_true", help="also time pipeline.warm_up()")
+    parser.add_argument("--json", action="store_true", help="print one JSON summary line")
+    args = parser.parse_args()
+
+    code = IMPORT_SNIPPET.format(deferred=DEFERRED_MODULES)
+    times = []
+    leaked = set()
+    for _ in range(args.runs):
+        (elapsed, loaded), _ = run_python(code)
+        times.append(float(elapsed))
+        if loaded != "-":
+            leaked.update(loaded.split(","))
+
+    _, stderr = run_python(code, importtime=True)
+    modules = parse_importtime(stderr)
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[: args.top]
+
+    summary = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_median_s": round(statistics.median(times), 3),
+        "import_min_s": round(min(times), 3),
+        "deferred_modules_loaded": sorted(leaked),
+    }
+    if args.warmup:
+        (seconds, status), _ = run_python(WARMUP_SNIPPET)
+        summary["warmup_s"] = float(seconds)
+        summary["warmup_status"] = status
+
+    if args.json:
+        print(json.dumps(summary))
+        return
+
+    print(f"import endpoints: median {summary['import_median_s']:.3f}s, "
+          f"min {summary['import_min_s']:.3f}s over {args.runs} runs")
+    print(f"deferred modules loaded at import: {', '.join(summary['deferred_modules_loaded']) or 'none'}")
+    if args.warmup:
+        print(f"warm-up: {summary['warmup_s']:.3f}s ({summary['warmup_status']})")
+    print()
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for module, micros in slowest:
+        print(f"{module:<40} {micros / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Offline stand-ins for the Gemini and Serper APIs.
+
+One threaded HTTP server answers both:
+
+    POST /v1/chat/completions   OpenAI-compatible chat completion. The stage
+                                (lexicon, vision, fusion) is detected from the
+                                agent role in the prompt and answered with the
+                                recorded report in fixtures/llm_responses.json.
+    POST /search                Serper-compatible search. Returns the recorded
+                                results in fixtures/serper_search.json with
+                                "{query}" replaced by the query.
+
+Each response is delayed by a configurable latency (mean +- jitter), so the
+API's scheduling, caching and rate limiting can be load-tested without any
+network access. Point the app at it with:
+
+    SENTI_LLM_MODEL=openai/fake-gemini
+    SENTI_LLM_BASE_URL=http://127.0.0.1:<port>/v1
+    SENTI_SERPER_URL=http://127.0.0.1:<port>
+
+Run standalone:
+    python benchmarks/fake_backends.py [--port 8765] [--llm-latency 1.5] [--search-latency 0.3]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Matched against the agent's system prompt ("You are <role>. ...")
+STAGE_MARKERS = (
+    ("fusion", "You are FusionAgent"),
+    ("lexicon", "You are LexiconAgent"),
+    ("vision", "You are VisionAgent"),
+)
+
+
+class Latency:
+    """Mean +- uniform jitter, in seconds"""
+
+    def __init__(self, mean: float, jitter: float = 0.0):
+        self.mean = mean
+        self.jitter = jitter
+
+    def sleep(self):
+        delay = self.mean + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FakeBackends:
+    """Fixture-backed LLM and search server running on a daemon thread"""
+
+    def __init__(
+        self,
+        port: int = 0,
+        llm_latency: Latency = Latency(1.0, 0.2),
+        search_latency: Latency = Latency(0.3, 0.1),
+        fixtures: Path = FIXTURES,
+    ):
+        self.llm_latency = llm_latency
+        self.search_latency = search_latency
+        self.llm_responses = json.loads((fixtures / "llm_responses.json").read_text())
+        self.search_template = (fixtures / "serper_search.json").read_text()
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBackends":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the API at this server"""
+        return {
+            "SENTI_LLM_MODEL": "openai/fake-gemini",
+            "SENTI_LLM_BASE_URL": f"{self.url}/v1",
+            "SENTI_SERPER_URL": self.url,
+            "GOOGLE_API_KEY": "offline-benchmark",
+            "SERPER_API_KEY": "offline-benchmark",
+            "OPENAI_API_KEY": "offline-benchmark",
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def chat_completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        stage = next((s for s, marker in STAGE_MARKERS if marker in prompt), "fusion")
+        self._count(f"llm:{stage}")
+        self.llm_latency.sleep()
+
+        report = json.dumps(self.llm_responses[stage])
+        content = f"Thought: I now can give a great answer\nFinal Answer: {report}"
+        prompt_tokens = len(prompt) // 4 + 1
+        completion_tokens = len(content) // 4 + 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-gemini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._count("search")
+        self.search_latency.sleep()
+        query = json.dumps(str(body.get("q", "")))[1:-1]
+        return json.loads(self.search_template.replace("{query}", query))
+
+    def _handler(self):
+        backends = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+
+                if self.path.rstrip("/").endswith("/chat/completions"):
+                    payload = backends.chat_completion(body)
+                elif self.path.rstrip("/") in ("/search", "/news", "/images"):
+                    payload = backends.search(body)
+                else:
+                    self.send_error(404)
+                    return
+
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Gemini/Serper stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="mean seconds per LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.3, help="mean seconds per search")
+    parser.add_argument("--search-jitter", type=float, default=0.1)
+    args = parser.parse_args()
+
+    backends = FakeBackends(
+        port=args.port,
+        llm_latency=Latency(args.llm_latency, args.llm_jitter),
+        search_latency=Latency(args.search_latency, args.search_jitter),
+    ).start()
+    print(f"Fake backends listening on {backends.url}")
+    for name, value in backends.env().items():
+        print(f"  export {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        backends.stop()
+
+
+if __name__ == "__main__":
+    main()
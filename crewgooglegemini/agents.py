@@ -1,99 +1,207 @@
-from crewai import Agent, LLM
+from crewai import Agent
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+import threading
 
-# Load .env file from project root
-env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
-
-# Import tools after loading .env - handle both relative and absolute imports
+# Handle both relative and absolute imports
 try:
+    from .config import load_env, debug_enabled
     from .tools import tool
+    from .llm_client import SentiLLM
+    from .http_client import litellm_client_params
 except ImportError:
+    from config import load_env, debug_enabled
     from tools import tool
+    from llm_client import SentiLLM
+    from http_client import litellm_client_params
+
+load_env()
+
+# =============================================
+# MODEL ROUTING - Cheapest adequate Gemini model per agent
+# =============================================
+#
+# Lexicon and vision do bounded extraction over three search results, so a
+# flash model is enough; the fusion step that produces the final verdict
+# keeps pro. Per-agent overrides: SENTI_LLM_MODEL_LEXICON / _VISION / _FUSION.
+# SENTI_LLM_MODEL sets every agent at once (e.g. the benchmark's fake model).
+#
+# A call that hits a rate limit, timeout or overload is retried on the
+# SENTI_LLM_FALLBACK models in order, skipping the model that just failed.
+
+DEFAULT_MODEL = "gemini/gemini-2.5-pro"
+DEFAULT_ROUTES = {
+    "lexicon": "gemini/gemini-2.5-flash",
+    "vision": "gemini/gemini-2.5-flash",
+    "fusion": "gemini/gemini-2.5-pro",
+}
+DEFAULT_FALLBACKS = "gemini/gemini-2.5-flash,gemini/gemini-2.5-flash-lite"
+
+_llms = {}  # model -> SentiLLM, shared by every agent routed to it
+_routed = set()  # models whose fallbacks are attached
+_llm_lock = threading.Lock()
 
-# Load Google Gemini API key
-google_api_key = os.environ.get("GOOGLE_API_KEY")
 
-if not google_api_key:
-    raise ValueError(
-        "GOOGLE_API_KEY not found in environment variables. "
-        "Please add it to your .env file"
+def model_route(name: str) -> str:
+    """Model configured for the agent template `name`"""
+    return (
+        os.environ.get(f"SENTI_LLM_MODEL_{name.upper()}")
+        or os.environ.get("SENTI_LLM_MODEL")
+        or DEFAULT_ROUTES[name]
     )
 
-# Use CrewAI's LLM wrapper for Google Gemini
-# Using Gemini 2.5 Pro for better quality and speed
-llm = LLM(
-    model="gemini/gemini-2.5-pro",
-    api_key=google_api_key,
-    temperature=0.3,
-    max_tokens=2048
-)
+
+def fallback_models() -> list:
+    # A single-model setup (SENTI_LLM_MODEL) gets no Gemini fallbacks unless asked
+    default = "" if os.environ.get("SENTI_LLM_MODEL") else DEFAULT_FALLBACKS
+    value = os.environ.get("SENTI_LLM_FALLBACK", default)
+    return [model.strip() for model in value.split(",") if model.strip()]
+
+
+def _build_llm(model: str) -> SentiLLM:
+    # Load Google Gemini API key
+    google_api_key = os.environ.get("GOOGLE_API_KEY")
+    if not google_api_key:
+        raise ValueError(
+            "GOOGLE_API_KEY not found in environment variables. "
+            "Please add it to your .env file"
+        )
+
+    # Use CrewAI's LLM wrapper for Google Gemini, rate limited across all crews.
+    # is_litellm keeps CrewAI from swapping in its native Gemini class, which
+    # would bypass SentiLLM.call (rate limits, fallbacks, metrics, tracing).
+    # SENTI_LLM_BASE_URL points at an OpenAI-compatible server
+    # (benchmarks/fake_backends.py). All calls go over the shared keep-alive
+    # pool (http_client.py).
+    return SentiLLM(
+        model=model,
+        api_key=google_api_key,
+        base_url=os.environ.get("SENTI_LLM_BASE_URL") or None,
+        temperature=0.3,
+        max_tokens=2048,
+        is_litellm=True,
+        **litellm_client_params(model)
+    )
+
+
+def _shared_llm(model: str) -> SentiLLM:
+    # Callers hold _llm_lock
+    if model not in _llms:
+        _llms[model] = _build_llm(model)
+    return _llms[model]
+
+
+def get_llm(model: str = None) -> SentiLLM:
+    """
+    Shared LLM for `model` (default: SENTI_LLM_MODEL or Gemini 2.5 Pro) with
+    its fallbacks attached. Created on first use so that importing this
+    module (or starting the API) works before GOOGLE_API_KEY is configured.
+    """
+    model = model or os.environ.get("SENTI_LLM_MODEL") or DEFAULT_MODEL
+    if model not in _routed:
+        with _llm_lock:
+            if model not in _routed:
+                llm = _shared_llm(model)
+                llm.set_fallbacks([_shared_llm(name) for name in fallback_models()])
+                _routed.add(model)
+    return _llms[model]
+
+
+def llm_for(name: str) -> SentiLLM:
+    """Routed LLM for the agent template `name` ('lexicon', 'vision', 'fusion')"""
+    return get_llm(model_route(name))
 
 
 # =============================================
 # SENTI-CORE AGENTS - Multimodal Sentiment Analysis
 # =============================================
+#
+# Agent definitions are kept as plain templates so that every analysis can
+# build its own Agent instances. Agents carry per-run state (tools handler,
+# rpm controller, iteration counters), so sharing them across concurrent
+# requests is not safe.
 
-# LexiconAgent - Text Analysis Specialist
-lexicon_agent = Agent(
-    role="LexiconAgent - Text Sentiment Analyst",
-    goal="Perform deep linguistic and semantic analysis of text content from {topic} on social media platforms",
-    verbose=True,
-    memory=False,  # Disabled for speed
-    backstory=(
-        "You are an expert in natural language processing and sentiment analysis. "
-        "Your specialty is analyzing text content, detecting emotional tone, "
-        "identifying key themes, and recognizing linguistic patterns including "
-        "sarcasm, irony, and subtle emotional cues. You provide detailed text-based "
-        "sentiment scores and insights. BE CONCISE AND QUICK."
+AGENT_TEMPLATES = {
+    # LexiconAgent - Text Analysis Specialist
+    "lexicon": dict(
+        role="LexiconAgent - Text Sentiment Analyst",
+        goal="Perform deep linguistic and semantic analysis of text content from {topic} on social media platforms",
+        backstory=(
+            "You are an expert in natural language processing and sentiment analysis. "
+            "Your specialty is analyzing text content, detecting emotional tone, "
+            "identifying key themes, and recognizing linguistic patterns including "
+            "sarcasm, irony, and subtle emotional cues. You provide detailed text-based "
+            "sentiment scores and insights. BE CONCISE AND QUICK."
+        ),
+        max_iter=3,  # Limit iterations for speed
     ),
-    tools=[tool],
-    llm=llm,
-    allow_delegation=False,
-    max_iter=3,  # Limit iterations for speed
-)
-
-# VisionAgent - Visual Content Analyst
-vision_agent = Agent(
-    role="VisionAgent - Visual Content Analyst",
-    goal="Analyze visual elements, imagery, and video content related to {topic} to determine visual sentiment",
-    verbose=True,
-    memory=False,  # Disabled for speed
-    backstory=(
-        "You are a visual content analysis expert specializing in interpreting "
-        "images, video thumbnails, and visual metadata from social media. "
-        "You assess visual mood, color psychology, facial expressions, "
-        "composition, and visual themes to determine the emotional impact "
-        "and sentiment conveyed through visual elements. BE FAST AND CONCISE."
+    # VisionAgent - Visual Content Analyst
+    "vision": dict(
+        role="VisionAgent - Visual Content Analyst",
+        goal="Analyze visual elements, imagery, and video content related to {topic} to determine visual sentiment",
+        backstory=(
+            "You are a visual content analysis expert specializing in interpreting "
+            "images, video thumbnails, and visual metadata from social media. "
+            "You assess visual mood, color psychology, facial expressions, "
+            "composition, and visual themes to determine the emotional impact "
+            "and sentiment conveyed through visual elements. BE FAST AND CONCISE."
+        ),
+        max_iter=2,  # Fewer iterations for speed
     ),
-    tools=[tool],
-    llm=llm,
-    allow_delegation=False,
-    max_iter=2,  # Fewer iterations for speed
-)
-
-# FusionAgent (Context Agent) - Multimodal Integration
-fusion_agent = Agent(
-    role="FusionAgent - Multimodal Context Analyzer",
-    goal="Synthesize text and visual analysis to detect true sentiment, including sarcasm and contextual contradictions about {topic}",
-    verbose=True,
-    memory=False,  # Disabled for speed
-    backstory=(
-        "You are a master of context and nuance. By comparing text sentiment "
-        "with visual sentiment, you can detect sarcasm, irony, and contradictions. "
-        "When text says one thing but visuals show another, you identify the true "
-        "intent. You provide the final, most accurate sentiment analysis by "
-        "understanding the complete multimodal context of social media content. "
-        "FOCUS ON SPEED - provide quick, actionable insights."
+    # FusionAgent (Context Agent) - Multimodal Integration
+    "fusion": dict(
+        role="FusionAgent - Multimodal Context Analyzer",
+        goal="Synthesize text and visual analysis to detect true sentiment, including sarcasm and contextual contradictions about {topic}",
+        backstory=(
+            "You are a master of context and nuance. By comparing text sentiment "
+            "with visual sentiment, you can detect sarcasm, irony, and contradictions. "
+            "When text says one thing but visuals show another, you identify the true "
+            "intent. You provide the final, most accurate sentiment analysis by "
+            "understanding the complete multimodal context of social media content. "
+            "FOCUS ON SPEED - provide quick, actionable insights."
+        ),
+        max_iter=2,  # Limit iterations for quick response
     ),
-    tools=[tool],
-    llm=llm,
-    allow_delegation=False,
-    max_iter=2,  # Limit iterations for quick response
-)
-
-# Legacy agents for backward compatibility
-news_researcher = lexicon_agent
-news_analyzer = fusion_agent
+}
+
+
+def build_agent(name: str, **overrides) -> Agent:
+    """Create a fresh Agent from its template"""
+    params = dict(
+        verbose=debug_enabled(),  # SENTI_DEBUG=1 prints every agent step
+        memory=False,  # Disabled for speed
+        tools=[tool],
+        llm=llm_for(name),
+        allow_delegation=False,
+    )
+    params.update(AGENT_TEMPLATES[name])
+    params.update(overrides)
+    return Agent(**params)
+
+
+def build_agents(**overrides) -> dict:
+    """Create a fresh set of Senti-Core agents for a single analysis"""
+    return {name: build_agent(name, **overrides) for name in AGENT_TEMPLATES}
+
+
+# Module-level instances for legacy callers (crew.py, old imports), built on
+# first access. The API builds its own agents per request via build_agents().
+LEGACY_AGENTS = {
+    "lexicon_agent": "lexicon",
+    "vision_agent": "vision",
+    "fusion_agent": "fusion",
+    # Legacy agents for backward compatibility
+    "news_researcher": "lexicon",
+    "news_analyzer": "fusion",
+}
+_legacy_agents = {}
+
+
+def __getattr__(name: str):
+    if name == "llm":
+        return get_llm()
+    if name in LEGACY_AGENTS:
+        template = LEGACY_AGENTS[name]
+        if template not in _legacy_agents:
+            _legacy_agents[template] = build_agent(template)
+        return _legacy_agents[template]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
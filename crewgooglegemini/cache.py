@@ -0,0 +1,332 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Handle both relative and absolute imports
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+# =============================================
+# TTL CACHES - Shared key/value stores for search and result caching
+# =============================================
+#
+# Every backend exposes the same small interface:
+#   get(key)        -> value or None (expired entries count as misses)
+#   get_entry(key)  -> (value, stored_at) or None, for callers that judge freshness
+#   set(key, value) -> store and evict the least recently used entries over max_entries
+# Values must be JSON-serialisable so they can move between backends.
+#
+# A cache is an optimisation, so a remote backend that is down must not fail
+# the request: RedisCache answers a failed get as a miss and drops a failed
+# set, counting both under ERRORS{component="cache"}.
+
+# Seconds before a Redis connect or command gives up (unless the URL sets
+# socket_timeout / socket_connect_timeout itself)
+REDIS_TIMEOUT = 2.0
+
+
+class MemoryCache:
+    """In-process LRU cache with a time-to-live per entry"""
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.time() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk LRU cache that survives restarts.
+    One table per namespace, so several caches can share a database file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "cache",
+        ttl: float = 900.0,
+        max_entries: int = 512,
+    ):
+        self.path = str(path)
+        self.table = f"cache_{namespace}"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed "
+                f"ON {self.table} (accessed_at)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads by default
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                with conn:
+                    conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            with self._lock:
+                self.misses += 1
+            return None
+        with conn:
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0]), row[1]
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key: str):
+        conn = self._conn()
+        with conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class RedisCache:
+    """
+    Cache backed by Redis or any Redis-compatible server (KeyDB, Valkey, ...).
+    Entries expire server-side; a sorted set of access times keeps the
+    namespace within max_entries. Connection and command errors degrade
+    to misses (get) and no-ops (set, delete, clear).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        namespace: str = "cache",
+        ttl: float = 900.0,
+        max_entries: int = 512,
+    ):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "The redis package is required for a Redis cache backend. "
+                "Install it with: pip install redis"
+            )
+
+        self.url = url
+        self.prefix = f"senti:{namespace}:"
+        self.lru_key = f"senti:{namespace}:__lru__"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=REDIS_TIMEOUT, socket_connect_timeout=REDIS_TIMEOUT
+        )
+        self._errors = redis.exceptions.RedisError
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _failed(self, error: Exception):
+        with self._lock:
+            self.errors += 1
+        metrics.ERRORS.inc("cache", type(error).__name__)
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        try:
+            raw = self._client.get(self.prefix + key)
+            if raw is None:
+                self._client.zrem(self.lru_key, key)
+            else:
+                self._client.zadd(self.lru_key, {key: time.time()})
+        except self._errors as e:
+            self._failed(e)
+            raw = None
+        if raw is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        entry = json.loads(raw)
+        return entry["value"], entry["stored_at"]
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        payload = json.dumps({"value": value, "stored_at": now})
+        try:
+            self._set(key, payload, now)
+        except self._errors as e:
+            self._failed(e)
+
+    def _set(self, key: str, payload: str, now: float):
+        pipe = self._client.pipeline()
+        pipe.set(self.prefix + key, payload, ex=max(1, int(self.ttl)))
+        pipe.zadd(self.lru_key, {key: now})
+        pipe.execute()
+
+        overflow = self._client.zcard(self.lru_key) - self.max_entries
+        if overflow > 0:
+            evicted = self._client.zrange(self.lru_key, 0, overflow - 1)
+            if evicted:
+                keys = [k.decode() if isinstance(k, bytes) else k for k in evicted]
+                self._client.delete(*[self.prefix + k for k in keys])
+                self._client.zrem(self.lru_key, *keys)
+
+    def delete(self, key: str):
+        try:
+            self._client.delete(self.prefix + key)
+            self._client.zrem(self.lru_key, key)
+        except self._errors as e:
+            self._failed(e)
+
+    def clear(self):
+        try:
+            keys = self._client.zrange(self.lru_key, 0, -1)
+            if keys:
+                keys = [k.decode() if isinstance(k, bytes) else k for k in keys]
+                self._client.delete(*[self.prefix + k for k in keys])
+            self._client.delete(self.lru_key)
+        except self._errors as e:
+            self._failed(e)
+
+    def __len__(self) -> int:
+        return self._client.zcard(self.lru_key)
+
+    def stats(self) -> dict:
+        try:
+            entries = len(self)
+        except self._errors:
+            # Health checks report the outage rather than failing
+            entries = None
+        return {
+            "backend": "redis",
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+def make_cache(
+    namespace: str,
+    ttl: float,
+    max_entries: int,
+    path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+):
+    """
+    Pick a backend: Redis when a URL is given, SQLite when a path is given,
+    otherwise an in-process cache.
+    """
+    if redis_url:
+        return RedisCache(redis_url, namespace=namespace, ttl=ttl, max_entries=max_entries)
+    if path:
+        return SQLiteCache(path, namespace=namespace, ttl=ttl, max_entries=max_entries)
+    return MemoryCache(ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,96 @@
+import json
+import os
+from typing import Any, Dict, Optional
+
+# Handle both relative and absolute imports
+try:
+    from .schemas import REPORT_MODELS
+except ImportError:
+    from schemas import REPORT_MODELS
+
+# =============================================
+# CONTEXT COMPACTION - Bounded upstream summary for the fusion prompt
+# =============================================
+#
+# Fusion used to receive the lexicon and vision raw outputs verbatim as task
+# context, so its prompt grew with every token the upstream agents wrote.
+# In "compact" mode the two validated reports are condensed into one JSON
+# summary instead:
+#
+#   numbers / booleans     kept
+#   strings                cut to MAX_TEXT characters
+#   lists                  first MAX_ITEMS entries, each cut to MAX_TEXT
+#   dicts (emotions)       the MAX_ITEMS largest numeric entries
+#   sources                replaced by their count
+#
+# The text and item caps are lowered until the summary fits in
+# SUMMARY_MAX_CHARS (at the smallest caps the size is bounded by the number
+# of schema fields), so the fusion prompt no longer depends on how long the
+# upstream answers were. "full" keeps the old behaviour.
+
+FUSION_CONTEXT_MODES = ("compact", "full")
+FUSION_CONTEXT = os.environ.get("SENTI_FUSION_CONTEXT", "compact")
+SUMMARY_MAX_CHARS = int(os.environ.get("SENTI_FUSION_SUMMARY_CHARS", "1500"))
+
+MAX_ITEMS = 3
+MAX_TEXT = 160
+
+# Identify the report but carry no signal fusion needs
+DROPPED_FIELDS = ("agent_name", "analysis_type", "timestamp", "raw_output", "status")
+
+
+def _cut(text: Any, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def compact_report(
+    stage: str,
+    report: Optional[Dict[str, Any]],
+    max_items: int = MAX_ITEMS,
+    max_text: int = MAX_TEXT,
+) -> Dict[str, Any]:
+    """Condense one stage report to its schema fields with capped sizes"""
+    if not report:
+        return {"status": "missing"}
+
+    compact: Dict[str, Any] = {}
+    for field in REPORT_MODELS[stage].model_fields:
+        if field in DROPPED_FIELDS or field not in report:
+            continue
+        value = report[field]
+        if field == "sources":
+            compact["source_count"] = len(value or [])
+        elif isinstance(value, (bool, int, float)) or value is None:
+            compact[field] = value
+        elif isinstance(value, dict):
+            numeric = [(k, v) for k, v in value.items() if isinstance(v, (int, float))]
+            top = sorted(numeric, key=lambda kv: kv[1], reverse=True)[:max_items]
+            compact[field] = {_cut(k, max_text): v for k, v in top}
+        elif isinstance(value, (list, tuple)):
+            compact[field] = [_cut(item, max_text) for item in value[:max_items]]
+        else:
+            compact[field] = _cut(value, max_text)
+    return compact
+
+
+def upstream_summary(reports: Dict[str, Optional[Dict[str, Any]]], max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """
+    One JSON object with a compact entry per upstream stage, shrunk until it
+    fits in max_chars or the caps reach one item of 20 characters.
+    """
+    max_items, max_text = MAX_ITEMS, MAX_TEXT
+    while True:
+        summary = json.dumps(
+            {stage: compact_report(stage, report, max_items, max_text) for stage, report in reports.items()},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        if len(summary) <= max_chars or (max_items == 1 and max_text <= 20):
+            return summary
+        if max_text > 40:
+            max_text //= 2
+        elif max_items > 1:
+            max_items -= 1
+        else:
+            max_text = 20
@@ -0,0 +1,26 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# =============================================
+# CONFIGURATION - Environment loading shared by all modules
+# =============================================
+
+PROJECT_ROOT = Path(__file__).parent.parent
+ENV_PATH = PROJECT_ROOT / ".env"
+
+_env_loaded = False
+
+
+def load_env():
+    """Load the project .env file once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv(dotenv_path=ENV_PATH)
+        _env_loaded = True
+
+
+def debug_enabled() -> bool:
+    """SENTI_DEBUG=1 turns on verbose agent and crew output (off in production)"""
+    return os.environ.get("SENTI_DEBUG", "0").lower() in ("1", "true", "yes")
@@ -1,32 +1,69 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from crewai import Crew, Process
 import os
 import json
+import asyncio
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Literal, Optional
 from datetime import datetime
-from dotenv import load_dotenv
 
-# Load .env file from project root
-env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
-
-# Handle both relative and absolute imports
+# Handle both relative and absolute imports. None of these import crewai;
+# the crew stack is loaded by pipeline.warm_up() after startup.
 try:
-    from crewgooglegemini.tasks import lexicon_task, vision_task, fusion_task
-    from crewgooglegemini.agents import lexicon_agent, vision_agent, fusion_agent
+    from crewgooglegemini.config import load_env
+    from crewgooglegemini.pipeline import run_pipeline, start_warm_up, warmup_state
+    from crewgooglegemini.tools import search_cache
+    from crewgooglegemini.ratelimit import llm_limiter, search_limiter
 except ImportError:
     try:
-        from .tasks import lexicon_task, vision_task, fusion_task
-        from .agents import lexicon_agent, vision_agent, fusion_agent
+        from .config import load_env
+        from .pipeline import run_pipeline, start_warm_up, warmup_state
+        from .tools import search_cache
+        from .ratelimit import llm_limiter, search_limiter
     except ImportError:
-        from tasks import lexicon_task, vision_task, fusion_task
-        from agents import lexicon_agent, vision_agent, fusion_agent
+        from config import load_env
+        from pipeline import run_pipeline, start_warm_up, warmup_state
+        from tools import search_cache
+        from ratelimit import llm_limiter, search_limiter
+
+# Load .env file from project root
+load_env()
+
+try:
+    from .executor import AnalysisExecutor, AdmissionRejected, AnalysisCancelled, AnalysisTimeout, CancelToken
+    from .result_cache import ResultCache
+    from .jobs import JobQueue
+    from .monitor import TopicMonitor
+    from .retrieval import retrieve
+    from .prescore import prescore, is_clear_cut, PRESCORE_ENABLED, PRESCORE_THRESHOLD
+    from .parsing import parse_agent_output, extract_json_from_text
+    from .images import ImageRejected, MAX_UPLOAD_BYTES, analyze_image, image_analyzer, save_upload
+    from .tracing import tracer
+    from .llm_usage import model_usage
+    from .llm_cache import llm_cache
+    from .history import history, parse_time
+    from . import http_client
+    from . import metrics
+except ImportError:
+    from executor import AnalysisExecutor, AdmissionRejected, AnalysisCancelled, AnalysisTimeout, CancelToken
+    from result_cache import ResultCache
+    from jobs import JobQueue
+    from monitor import TopicMonitor
+    from retrieval import retrieve
+    from prescore import prescore, is_clear_cut, PRESCORE_ENABLED, PRESCORE_THRESHOLD
+    from parsing import parse_agent_output, extract_json_from_text
+    from images import ImageRejected, MAX_UPLOAD_BYTES, analyze_image, image_analyzer, save_upload
+    from tracing import tracer
+    from llm_usage import model_usage
+    from llm_cache import llm_cache
+    from history import history, parse_time
+    import http_client
+    import metrics
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,10 +81,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files directory
+# Mount static files directory; a missing directory serves 404s rather than
+# failing the import
 static_path = Path(__file__).parent.parent / "static"
-static_path.mkdir(exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+app.mount("/static", StaticFiles(directory=str(static_path), check_dir=False), name="static")
+
+# Bounded worker pool so crew runs never block the event loop
+executor = AnalysisExecutor.from_env()
+
+# Topic-level cache of finished analyses (stale-while-revalidate)
+result_cache = ResultCache.from_env()
+_background_refreshes = set()
+
+# How much of each agent's raw LLM answer goes into responses: "full",
+# "truncated" (first SENTI_RAW_OUTPUT_CHARS characters) or "omit".
+# Requests can override the default with their raw_output field.
+RAW_OUTPUT_MODES = ("full", "truncated", "omit")
+RAW_OUTPUT_DEFAULT = os.environ.get("SENTI_RAW_OUTPUT", "full")
+if RAW_OUTPUT_DEFAULT not in RAW_OUTPUT_MODES:
+    # Field defaults are not validated, so a typo would reach every response
+    raise ValueError(
+        f"Unknown SENTI_RAW_OUTPUT: {RAW_OUTPUT_DEFAULT} (use one of {', '.join(RAW_OUTPUT_MODES)})"
+    )
+RAW_OUTPUT_CHARS = int(os.environ.get("SENTI_RAW_OUTPUT_CHARS", "500"))
 
 # =============================================
 # REQUEST/RESPONSE MODELS
@@ -56,7 +112,20 @@ app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 class AnalysisRequest(BaseModel):
     topic: str = Field(..., min_length=1, max_length=200, description="The topic to analyze")
     noofarticles: int = Field(default=3, ge=1, le=5, description="Number of content items to analyze (max 3 for speed)")
-    platforms: List[str] = Field(default=["tiktok", "instagram", "twitter"], description="Social media platforms")
+    platforms: List[str] = Field(default=["tiktok", "instagram", "twitter"], max_length=8, description="Social media platforms, searched concurrently (one query each)")
+    no_cache: bool = Field(default=False, description="Skip cached analyses and cached LLM responses (fresh results are still cached)")
+    raw_output: Literal["full", "truncated", "omit"] = Field(default=RAW_OUTPUT_DEFAULT, description="Include, truncate or omit each report's raw agent output")
+
+class JobRequest(AnalysisRequest):
+    priority: int = Field(default=0, ge=0, le=9, description="Higher priority jobs run first")
+
+class MonitorRequest(BaseModel):
+    topic: str = Field(..., min_length=1, max_length=200, description="The topic to monitor")
+    interval_minutes: float = Field(default=60, ge=1, le=7 * 24 * 60, description="Minutes between polls")
+
+class BatchAnalysisRequest(BaseModel):
+    requests: List[AnalysisRequest] = Field(..., min_length=1, max_length=500, description="Topics to analyze")
+    concurrency: int = Field(default=4, ge=1, le=32, description="Analyses to run at the same time")
 
 class AgentReport(BaseModel):
     agent_name: str
@@ -77,191 +146,223 @@ class SentiCoreResponse(BaseModel):
     vision_report: Optional[Dict[str, Any]] = None
     fusion_report: Optional[Dict[str, Any]] = None
     final_sentiment: Optional[Dict[str, Any]] = None
+    timings: Optional[Dict[str, Any]] = None
+    cache_status: Optional[str] = None
     error: Optional[str] = None
 
 # =============================================
 # HELPER FUNCTIONS
 # =============================================
 
-def extract_json_from_text(text: str) -> Dict[str, Any]:
+def stage_report(pipeline_result, stage: str, agent_name: str, analysis_type: str) -> Dict[str, Any]:
+    """Build one agent's report from its own task output"""
+    return build_report(pipeline_result.raw(stage), pipeline_result.report(stage), agent_name, analysis_type)
+
+def build_report(
+    raw_output: str, report: Optional[Dict[str, Any]], agent_name: str, analysis_type: str
+) -> Dict[str, Any]:
+    """The validated report when there is one, else the legacy text parse"""
+    if report is None:
+        report = parse_agent_output(raw_output, agent_name)
+        report["analysis_type"] = analysis_type
+    else:
+        report = dict(report)
+    report.setdefault("timestamp", datetime.now().isoformat())
+    report["raw_output"] = raw_output
+    report["status"] = "completed"
+    return report
+
+def trim_raw_output(report: Optional[Dict[str, Any]], mode: str) -> Optional[Dict[str, Any]]:
+    """Copy of an agent report with raw_output shaped by mode ("full", "truncated" or "omit")"""
+    if not report or "raw_output" not in report or mode == "full":
+        return report
+    report = dict(report)
+    raw = report.pop("raw_output") or ""
+    if mode == "truncated":
+        report["raw_output"] = raw[:RAW_OUTPUT_CHARS]
+        report["raw_output_chars"] = len(raw)
+    return report
+
+def shape_raw_output(result: Dict[str, Any], mode: str) -> Dict[str, Any]:
+    """Copy of an analysis result with every report's raw_output shaped by mode"""
+    if mode == "full":
+        return result
+    return dict(result, **{
+        field: trim_raw_output(result[field], mode)
+        for field in ("lexicon_report", "vision_report", "fusion_report")
+        if result.get(field)
+    })
+
+def run_analysis(
+    topic: str,
+    noofarticles: int,
+    platforms: List[str],
+    cancel: Optional[CancelToken] = None,
+    on_stage: Optional[Callable[[str, str, Optional[Dict[str, Any]]], None]] = None,
+    no_cache: bool = False,
+    raw_output: str = "full",
+) -> Dict[str, Any]:
     """
-    Attempt to extract structured JSON data from agent output.
-    If not found, create structured data from text.
+    Run the Senti-Core crew and build the response payload.
+    Raises on failure; see analyze_sentiment_multimodal for the safe wrapper.
+    no_cache skips LLM response cache lookups for this run; raw_output
+    shapes the reports' raw agent output ("full", "truncated" or "omit").
     """
-    try:
-        # Try to find JSON in the text
-        json_match = re.search(r'\{[\s\S]*\}', text)
-        if json_match:
-            return json.loads(json_match.group())
-    except:
-        pass
+    started = time.perf_counter()
+    engine, outcome = "crew", "error"
+    with tracer.span("analysis", topic=topic, noofarticles=noofarticles) as span, llm_cache.bypass(no_cache):
+        try:
+            result = _run_analysis(topic, noofarticles, platforms, cancel, on_stage)
+            if result.get("timings", {}).get("mode") == "local":
+                engine = "local"
+            outcome = "ok"
+            if span is not None:
+                span.set(engine=engine, score=result["final_sentiment"]["overall_score"])
+            history.record(result, noofarticles)
+            return shape_raw_output(result, raw_output)
+        except AnalysisCancelled:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            metrics.ERRORS.inc("analysis", type(e).__name__)
+            raise
+        finally:
+            metrics.ANALYSIS_SECONDS.observe(time.perf_counter() - started, engine, outcome)
+
+def _run_analysis(
+    topic: str,
+    noofarticles: int,
+    platforms: List[str],
+    cancel: Optional[CancelToken],
+    on_stage: Optional[Callable[[str, str, Optional[Dict[str, Any]]], None]],
+) -> Dict[str, Any]:
+    timestamp = datetime.now().isoformat()
+
+    # Clear-cut topics are answered by the local scorer without any LLM call.
+    # The per-platform searches are cached, so the crew reuses them if we fall through.
+    if PRESCORE_ENABLED:
+        started = time.perf_counter()
+        try:
+            search_results = retrieve(topic, noofarticles, platforms)
+        except Exception:
+            search_results = None
+        if search_results is not None:
+            search_seconds = time.perf_counter() - started
+            local_score = prescore(search_results)
+            if is_clear_cut(local_score, PRESCORE_THRESHOLD):
+                timings = {
+                    "search": round(search_seconds, 3),
+                    "prescore": round(time.perf_counter() - started - search_seconds, 3),
+                    "total": round(time.perf_counter() - started, 3),
+                    "mode": "local",
+                }
+                return build_local_result(topic, platforms, local_score, timestamp, timings)
+
+    # Fresh agents and tasks are built per request inside the pipeline, so
+    # concurrent analyses never share state
+    pipeline_result = run_pipeline(topic, noofarticles, cancel=cancel, on_stage=on_stage, platforms=platforms)
+    
+    # Every stage returns a schema-validated report; free-text parsing is
+    # only a fallback for outputs that somehow skipped validation
+    lexicon_report = stage_report(pipeline_result, "lexicon", "LexiconAgent", "text_sentiment")
+    vision_report = stage_report(pipeline_result, "vision", "VisionAgent", "visual_sentiment")
+    fusion_report = stage_report(pipeline_result, "fusion", "FusionAgent", "multimodal_fusion")
+    
+    # Create final sentiment summary
+    final_sentiment = {
+        "overall_score": fusion_report.get("sentiment_score", 0.0),
+        "confidence": fusion_report.get("confidence", 75.0),
+        "sentiment_label": get_sentiment_label(fusion_report.get("sentiment_score", 0.0)),
+        "analysis_quality": "high" if fusion_report.get("confidence", 0) > 70 else "moderate",
+        "timestamp": timestamp
+    }
     
-    # Fallback: create structured data from text
     return {
-        "raw_analysis": text,
-        "extracted": True,
-        "format": "text"
+        "success": True,
+        "topic": topic,
+        "platforms": platforms,
+        "content_analyzed": noofarticles,
+        "timestamp": timestamp,
+        "lexicon_report": lexicon_report,
+        "vision_report": vision_report,
+        "fusion_report": fusion_report,
+        "final_sentiment": final_sentiment,
+        "timings": pipeline_result.timing_report()
     }
 
-def parse_agent_output(output: str, agent_name: str) -> Dict[str, Any]:
-    """
-    Parse agent output into structured format.
-    Extracts sentiment scores, key findings, and confidence levels.
-    """
-    result = {
-        "agent_name": agent_name,
-        "timestamp": datetime.now().isoformat(),
-        "raw_output": output,
-    }
-    
-    # Extract sentiment score (looking for patterns like "score: 7" or "sentiment: -3")
-    score_patterns = [
-        r'sentiment[_\s]*score[:\s]+(-?\d+(?:\.\d+)?)',
-        r'score[:\s]+(-?\d+(?:\.\d+)?)',
-        r'rating[:\s]+(-?\d+(?:\.\d+)?)',
+def build_local_result(
+    topic: str,
+    platforms: List[str],
+    local_score: Dict[str, Any],
+    timestamp: str,
+    timings: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Shape a local pre-score as a full SentiCoreResponse payload"""
+    score = local_score["sentiment_score"]
+    confidence = local_score["confidence"]
+    findings = [
+        f"{item['link']}: score {item['score']:+.1f} ({item['sentiment_words']} sentiment words)"
+        for item in local_score["per_item"]
     ]
     
-    for pattern in score_patterns:
-        match = re.search(pattern, output, re.IGNORECASE)
-        if match:
-            result["sentiment_score"] = float(match.group(1))
-            break
-    
-    if "sentiment_score" not in result:
-        # Fallback sentiment detection
-        positive_words = ['positive', 'good', 'excellent', 'great', 'optimistic']
-        negative_words = ['negative', 'bad', 'poor', 'pessimistic', 'concerning']
-        
-        output_lower = output.lower()
-        pos_count = sum(word in output_lower for word in positive_words)
-        neg_count = sum(word in output_lower for word in negative_words)
-        
-        if pos_count > neg_count:
-            result["sentiment_score"] = 5.0
-        elif neg_count > pos_count:
-            result["sentiment_score"] = -5.0
-        else:
-            result["sentiment_score"] = 0.0
+    lexicon_report = {
+        "agent_name": "LocalLexiconScorer",
+        "analysis_type": "text_sentiment",
+        "status": "completed",
+        "summary": "Clear-cut text sentiment scored locally from search snippets",
+        "sentiment_score": score,
+        "confidence": confidence,
+        "key_findings": findings[:5] or ["Analysis completed"],
+        "timestamp": timestamp,
+    }
     
-    # Extract confidence (looking for patterns like "confidence: 85%")
-    confidence_match = re.search(r'confidence[:\s]+(\d+(?:\.\d+)?)\s*%?', output, re.IGNORECASE)
-    if confidence_match:
-        result["confidence"] = float(confidence_match.group(1))
-    else:
-        result["confidence"] = 75.0  # Default confidence
+    vision_report = {
+        "agent_name": "VisionAgent",
+        "analysis_type": "visual_sentiment",
+        "status": "skipped",
+        "summary": "Skipped: text sentiment was clear-cut",
+        "sentiment_score": 0.0,
+        "confidence": 0.0,
+        "key_findings": []
+    }
     
-    # Extract key findings (bullet points or numbered lists)
-    findings = []
-    lines = output.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith(('-', '•', '*', '→')) or (len(line) > 0 and line[0].isdigit() and '.' in line[:3]):
-            finding = re.sub(r'^[-•*→\d.)\s]+', '', line).strip()
-            if finding and len(finding) > 10:
-                findings.append(finding)
+    fusion_report = dict(lexicon_report, analysis_type="multimodal_fusion", sarcasm_detected=False)
     
-    result["key_findings"] = findings[:5] if findings else ["Analysis completed"]
+    final_sentiment = {
+        "overall_score": score,
+        "confidence": confidence,
+        "sentiment_label": get_sentiment_label(score),
+        "analysis_quality": "fast-path",
+        "engine": "local",
+        "timestamp": timestamp
+    }
     
-    return result
+    return {
+        "success": True,
+        "topic": topic,
+        "platforms": platforms,
+        "content_analyzed": local_score["items"],
+        "timestamp": timestamp,
+        "lexicon_report": lexicon_report,
+        "vision_report": vision_report,
+        "fusion_report": fusion_report,
+        "final_sentiment": final_sentiment,
+        "timings": timings
+    }
 
-def analyze_sentiment_multimodal(topic: str, noofarticles: int, platforms: List[str]) -> Dict[str, Any]:
+def analyze_sentiment_multimodal(
+    topic: str,
+    noofarticles: int,
+    platforms: List[str],
+    cancel: Optional[CancelToken] = None,
+    no_cache: bool = False,
+) -> Dict[str, Any]:
     """
     Perform multimodal sentiment analysis using the Senti-Core agent system.
     Returns structured JSON with all agent reports.
     """
     try:
-        timestamp = datetime.now().isoformat()
-        
-        # Create the crew with all three agents - optimized for speed
-        crew = Crew(
-            agents=[lexicon_agent, vision_agent, fusion_agent],
-            tasks=[lexicon_task, vision_task, fusion_task],
-            process=Process.sequential,
-            verbose=True,
-            max_rpm=10,  # Rate limiting for Gemini API
-            memory=False  # Disable memory for faster execution
-        )
-        
-        # Execute the analysis
-        result = crew.kickoff(inputs={
-            'topic': topic,
-            'noofarticles': str(noofarticles)
-        })
-        
-        # Parse the result
-        result_text = str(result)
-        
-        # Try to read the output file if it exists
-        output_file = "senti-core-analysis.json"
-        fusion_output = result_text
-        
-        if os.path.exists(output_file):
-            try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    fusion_output = f.read()
-            except:
-                pass
-        
-        # Parse each agent's contribution
-        # Note: In sequential process, each task builds on the previous
-        # We'll extract insights from the final output
-        
-        lexicon_report = {
-            "agent_name": "LexiconAgent",
-            "analysis_type": "text_sentiment",
-            "status": "completed",
-            "summary": "Text-based sentiment analysis completed",
-            "sentiment_score": 0.0,
-            "confidence": 0.0,
-            "key_findings": []
-        }
-        
-        vision_report = {
-            "agent_name": "VisionAgent",
-            "analysis_type": "visual_sentiment",
-            "status": "completed",
-            "summary": "Visual content analysis completed",
-            "sentiment_score": 0.0,
-            "confidence": 0.0,
-            "key_findings": []
-        }
-        
-        fusion_report = parse_agent_output(fusion_output, "FusionAgent")
-        fusion_report["analysis_type"] = "multimodal_fusion"
-        
-        # Try to extract individual agent insights from the fusion output
-        # Look for sections mentioning each agent
-        if "lexicon" in fusion_output.lower() or "text" in fusion_output.lower():
-            text_section = fusion_output
-            lexicon_report = parse_agent_output(text_section, "LexiconAgent")
-            lexicon_report["analysis_type"] = "text_sentiment"
-        
-        if "vision" in fusion_output.lower() or "visual" in fusion_output.lower():
-            visual_section = fusion_output
-            vision_report = parse_agent_output(visual_section, "VisionAgent")
-            vision_report["analysis_type"] = "visual_sentiment"
-        
-        # Create final sentiment summary
-        final_sentiment = {
-            "overall_score": fusion_report.get("sentiment_score", 0.0),
-            "confidence": fusion_report.get("confidence", 75.0),
-            "sentiment_label": get_sentiment_label(fusion_report.get("sentiment_score", 0.0)),
-            "analysis_quality": "high" if fusion_report.get("confidence", 0) > 70 else "moderate",
-            "timestamp": timestamp
-        }
-        
-        return {
-            "success": True,
-            "topic": topic,
-            "platforms": platforms,
-            "content_analyzed": noofarticles,
-            "timestamp": timestamp,
-            "lexicon_report": lexicon_report,
-            "vision_report": vision_report,
-            "fusion_report": fusion_report,
-            "final_sentiment": final_sentiment
-        }
-            
+        return run_analysis(topic, noofarticles, platforms, cancel=cancel, no_cache=no_cache)
     except Exception as e:
         return {
             "success": False,
@@ -272,6 +373,51 @@ def analyze_sentiment_multimodal(topic: str, noofarticles: int, platforms: List[
             "error": str(e)
         }
 
+async def run_analysis_request(request: AnalysisRequest) -> Dict[str, Any]:
+    """Run one analysis on the worker pool"""
+    return await executor.run(
+        analyze_sentiment_multimodal,
+        topic=request.topic,
+        noofarticles=request.noofarticles,
+        platforms=request.platforms,
+        no_cache=request.no_cache
+    )
+
+async def _refresh_cached_result(key: str, request: AnalysisRequest):
+    """Background re-run for a stale cache entry"""
+    try:
+        result_cache.store(key, await run_analysis_request(request))
+    except Exception:
+        # Keep serving the stale entry; the next request will try again
+        pass
+    finally:
+        result_cache.end_refresh(key)
+
+async def cached_analysis(request: AnalysisRequest) -> Dict[str, Any]:
+    """
+    Serve an analysis from the result cache when possible.
+    Stale entries are returned immediately and refreshed in the background.
+    With no_cache the lookup is skipped, but the fresh result is still stored.
+    Cached results keep the full raw_output; it is shaped per request.
+    """
+    key = ResultCache.key(request.topic, request.noofarticles, request.platforms)
+    if request.no_cache:
+        cached, state = None, "bypass"
+    else:
+        cached, state = result_cache.lookup(key)
+    metrics.CACHE_REQUESTS.inc("result", state or "miss")
+    
+    if cached is not None:
+        if state == "stale" and result_cache.begin_refresh(key):
+            task = asyncio.create_task(_refresh_cached_result(key, request))
+            _background_refreshes.add(task)
+            task.add_done_callback(_background_refreshes.discard)
+        return shape_raw_output(dict(cached, cache_status=state), request.raw_output)
+    
+    result = await run_analysis_request(request)
+    result_cache.store(key, result)
+    return shape_raw_output(dict(result, cache_status=state or "miss"), request.raw_output)
+
 def get_sentiment_label(score: float) -> str:
     """Convert sentiment score to label"""
     if score >= 7:
@@ -285,6 +431,49 @@ def get_sentiment_label(score: float) -> str:
     else:
         return "Very Negative"
 
+# Durable submit/poll queue. SENTI_JOB_WORKERS=0 leaves execution to
+# standalone `python jobs.py` workers sharing the same database.
+job_queue = JobQueue.from_env(run_analysis)
+JOB_WORKERS = int(os.environ.get("SENTI_JOB_WORKERS", "2"))
+
+# Scheduled incremental re-analysis of registered topics. SENTI_MONITOR_WORKERS=0
+# leaves polling to standalone `python monitor.py` processes.
+topic_monitor = TopicMonitor.from_env()
+MONITOR_WORKERS = int(os.environ.get("SENTI_MONITOR_WORKERS", "1"))
+
+# Scrape-time gauges for state owned by this module
+metrics.registry.register(metrics.Gauge(
+    "senti_executor_in_flight",
+    "Analyses running or queued on the worker pool",
+    collect=lambda: {(): executor.stats()["in_flight"]},
+))
+metrics.registry.register(metrics.Gauge(
+    "senti_rate_limit_queue_depth",
+    "Callers waiting on a shared rate limiter",
+    labels=("limiter",),
+    collect=lambda: {
+        ("llm",): llm_limiter.stats()["queue_depth"],
+        ("search",): search_limiter.stats()["queue_depth"],
+    },
+))
+metrics.registry.register(metrics.Gauge(
+    "senti_jobs",
+    "Background jobs by status",
+    labels=("status",),
+    collect=lambda: {
+        (status,): count
+        for status, count in job_queue.stats().items()
+        if status in ("queued", "running", "succeeded", "failed")
+    },
+))
+
+# Import the crew stack in the background at startup (0 = on first analysis)
+WARMUP_ENABLED = os.environ.get("SENTI_WARMUP", "1").lower() in ("1", "true", "yes")
+
+# Seconds running analyses, jobs and monitor polls get to finish on shutdown
+# before they are cancelled (cancelled jobs go back to the queue)
+DRAIN_SECONDS = float(os.environ.get("SENTI_DRAIN_SECONDS", "30"))
+
 # =============================================
 # API ENDPOINTS
 # =============================================
@@ -315,16 +504,316 @@ async def analyze_sentiment_endpoint(request: AnalysisRequest):
     Returns complete JSON receipt with all agent reports.
     """
     try:
-        result = analyze_sentiment_multimodal(
+        result = await cached_analysis(request)
+        
+        return SentiCoreResponse(**result)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except AnalysisTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Stage names reported by the pipeline -> (agent name, analysis type)
+STREAM_STAGES = {
+    "lexicon": ("LexiconAgent", "text_sentiment"),
+    "vision": ("VisionAgent", "visual_sentiment"),
+    "fusion": ("FusionAgent", "multimodal_fusion"),
+}
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+# Streaming variant of the analysis endpoint
+@app.post("/api/analyze/stream")
+async def analyze_sentiment_stream(request: AnalysisRequest):
+    """
+    Stream the analysis as Server-Sent Events while the stages finish:
+    `search`, then `lexicon` and `vision` (in completion order), `fusion`,
+    and finally `result` with the full SentiCoreResponse, or `error`.
+    Closing the connection cancels the remaining stages.
+    """
+    if executor.kind != "thread":
+        raise HTTPException(status_code=501, detail="Streaming requires SENTI_EXECUTOR=thread")
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def on_stage(stage: str, output: str, report: Optional[Dict[str, Any]]):
+        # Runs on a worker thread, so build the report here and only hand the
+        # event over; it matches the stage's entry in the final result
+        if stage in STREAM_STAGES:
+            agent_name, analysis_type = STREAM_STAGES[stage]
+            payload = trim_raw_output(build_report(output, report, agent_name, analysis_type), request.raw_output)
+        else:
+            payload = {"results": output}
+        loop.call_soon_threadsafe(events.put_nowait, (stage, payload))
+    
+    # Submit before responding so a full pool still answers 429/503
+    try:
+        future = executor.submit(
+            run_analysis,
             topic=request.topic,
             noofarticles=request.noofarticles,
-            platforms=request.platforms
+            platforms=request.platforms,
+            on_stage=on_stage,
+            no_cache=request.no_cache,
+            raw_output=request.raw_output
         )
-        
-        return SentiCoreResponse(**result)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    async def event_stream():
+        waiter = asyncio.ensure_future(executor.wait(future))
+        waiter.add_done_callback(lambda _: events.put_nowait((None, None)))
+        try:
+            while True:
+                stage, payload = await events.get()
+                if stage is None:
+                    break
+                yield format_sse(stage, payload)
+            
+            try:
+                result = waiter.result()
+                yield format_sse("result", SentiCoreResponse(**result).model_dump())
+            except AdmissionRejected as e:
+                yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+            except AnalysisTimeout as e:
+                yield format_sse("error", {"status_code": 504, "detail": str(e)})
+            except Exception as e:
+                yield format_sse("error", {"status_code": 500, "detail": str(e)})
+        finally:
+            # Client went away: stop the stages that have not run yet
+            if not waiter.done():
+                future.token.cancel()
+                waiter.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Batch analysis endpoint
+@app.post("/api/analyze/batch")
+async def analyze_sentiment_batch(batch: BatchAnalysisRequest):
+    """
+    Analyze many topics in one request and stream results as NDJSON, one
+    line per input item in completion order. Duplicate topics are analyzed
+    once, overlapping searches are shared through the search cache, and all
+    LLM calls draw from the process-wide rate limiter rather than a budget
+    per crew. A failing item never fails the batch.
+    """
+    # Identical requests (after normalization) run once and fan out
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(batch.requests):
+        key = ResultCache.key(item.topic, item.noofarticles, item.platforms)
+        groups.setdefault(key, []).append(index)
+    
+    semaphore = asyncio.Semaphore(min(batch.concurrency, len(groups)))
+    
+    async def run_item(indices: List[int]):
+        item = batch.requests[indices[0]]
+        async with semaphore:
+            deadline = asyncio.get_running_loop().time() + executor.timeout
+            while True:
+                try:
+                    # Items in a group may differ in raw_output; shape per line
+                    result = await cached_analysis(item.model_copy(update={"raw_output": "full"}))
+                    if not result.get("success"):
+                        # analyze_sentiment_multimodal reports failures in the body
+                        return indices, {"error": result.get("error") or "Analysis failed", "status_code": 500}
+                    return indices, {"result": result}
+                except AdmissionRejected as e:
+                    # Other traffic filled the pool; wait for a slot rather than fail
+                    if e.status_code != 429 or asyncio.get_running_loop().time() > deadline:
+                        return indices, {"error": e.detail, "status_code": e.status_code}
+                    await asyncio.sleep(1.0)
+                except AnalysisTimeout as e:
+                    return indices, {"error": str(e), "status_code": 504}
+                except Exception as e:
+                    return indices, {"error": str(e), "status_code": 500}
+    
+    async def ndjson_lines():
+        pending = [asyncio.ensure_future(run_item(indices)) for indices in groups.values()]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                indices, outcome = await next_done
+                for index in indices:
+                    line = {"index": index, "topic": batch.requests[index].topic}
+                    line.update(outcome)
+                    if "result" in outcome:
+                        line["result"] = shape_raw_output(outcome["result"], batch.requests[index].raw_output)
+                    yield json.dumps(line, default=str) + "\n"
+        finally:
+            # Client went away: cancel whatever has not finished
+            for task in pending:
+                task.cancel()
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+def capped_receive(receive: Callable, limit: int) -> Callable:
+    """ASGI receive that answers 413 once more than `limit` body bytes arrive"""
+    received = 0
+
+    async def receive_capped():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail=f"Image exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+        return message
+
+    return receive_capped
+
+# Analyze an uploaded image with the VisionAgent prompt
+@app.post("/api/analyze/image")
+async def analyze_image_endpoint(request: Request):
+    """
+    Multipart upload with one `file` field (JPEG, PNG, WebP, GIF or BMP).
+    The image is streamed to disk, downsampled and sent to the vision model;
+    identical images are answered from the content-hash cache.
+    """
+    # Reject obviously oversized bodies before reading them
+    try:
+        declared = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared > MAX_UPLOAD_BYTES + 64 * 1024:
+        raise HTTPException(status_code=413, detail=f"Image exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+
+    # Chunked bodies have no Content-Length, so the limit is also enforced on
+    # the bytes as they arrive; Starlette spools the file part to a temporary
+    # file past 1 MB, so the body is never held in memory as a whole
+    request = Request(request.scope, receive=capped_receive(request.receive, MAX_UPLOAD_BYTES + 64 * 1024))
+    form = await request.form(max_files=1, max_fields=8)
+    try:
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=422, detail="Missing image file field 'file'")
+        path, sha256, size = await save_upload(upload)
+    except ImageRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    finally:
+        await form.close()
+
+    cached = image_analyzer.cached(sha256)
+    if cached is not None:
+        path.unlink(missing_ok=True)
+        return dict(cached, cache_status="hit")
+
+    try:
+        return await executor.run(analyze_image, str(path), sha256, size)
+    except ImageRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except AdmissionRejected as e:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except AnalysisTimeout as e:
+        # The job may have timed out while still queued, before
+        # analyze_image could remove the upload
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
+        path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Submit an analysis job
+@app.post("/api/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Queue an analysis and return its job ID immediately.
+    Poll GET /api/jobs/{job_id} for status and the final SentiCoreResponse.
+    """
+    job_id = job_queue.submit(
+        {
+            "topic": request.topic,
+            "noofarticles": request.noofarticles,
+            "platforms": request.platforms,
+            "no_cache": request.no_cache,
+            "raw_output": request.raw_output,
+        },
+        priority=request.priority,
+    )
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+# Poll an analysis job
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Return job status, attempts and, once finished, the analysis result"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# Register a topic for scheduled monitoring
+@app.post("/api/monitors", status_code=201)
+async def add_monitor(request: MonitorRequest):
+    """
+    Poll the topic every interval_minutes and analyze only search results
+    that were not seen on earlier polls. Re-registering a topic updates its
+    interval and keeps its history.
+    """
+    return topic_monitor.add(request.topic, request.interval_minutes * 60)
+
+@app.get("/api/monitors")
+async def list_monitors():
+    """All registered monitors with their schedule"""
+    return {"monitors": topic_monitor.list()}
+
+@app.get("/api/monitors/{monitor_id}")
+async def get_monitor(monitor_id: str, window_hours: float = 168):
+    """Monitor state, sentiment time series and rolling aggregate"""
+    monitor = topic_monitor.get(monitor_id, window=window_hours * 3600)
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Monitor not found")
+    return monitor
+
+@app.post("/api/monitors/{monitor_id}/run", status_code=202)
+async def run_monitor(monitor_id: str):
+    """Poll a monitor as soon as a poller is free"""
+    if not topic_monitor.trigger(monitor_id):
+        raise HTTPException(status_code=404, detail="Monitor not found")
+    return {"monitor_id": monitor_id, "status": "due"}
+
+@app.delete("/api/monitors/{monitor_id}")
+async def delete_monitor(monitor_id: str):
+    """Stop monitoring and drop the topic's seen items and series"""
+    if not topic_monitor.remove(monitor_id):
+        raise HTTPException(status_code=404, detail="Monitor not found")
+    return {"monitor_id": monitor_id, "status": "deleted"}
+
+# Sentiment history
+@app.get("/api/history")
+async def get_history(
+    topic: Optional[str] = None,
+    since: Optional[str] = Query(None, alias="from"),
+    until: Optional[str] = Query(None, alias="to"),
+    limit: int = Query(100, ge=1, le=1000),
+    include_results: bool = False,
+):
+    """
+    Past analyses newest first, optionally for one topic and a time range.
+    from/to take ISO 8601 timestamps or epoch seconds.
+    """
+    try:
+        since_ts, until_ts = parse_time(since), parse_time(until)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    analyses = history.query(topic, since_ts, until_ts, limit=limit, include_results=include_results)
+    return {"topic": topic, "from": since, "to": until, "count": len(analyses), "analyses": analyses}
+
+@app.get("/api/history/aggregates")
+async def get_history_aggregates(
+    topic: Optional[str] = None,
+    window_hours: float = Query(168, gt=0),
+    bucket: Literal["hour", "day"] = "day",
+):
+    """Rolling mean sentiment and an hourly or daily series from pre-aggregated buckets"""
+    return history.aggregates(topic, window=window_hours * 3600, bucket=bucket)
+
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
@@ -333,17 +822,76 @@ async def health_check():
         "status": "healthy",
         "message": "Senti-Core API is running",
         "version": "2.0.0",
-        "agents": ["LexiconAgent", "VisionAgent", "FusionAgent"]
+        "agents": ["LexiconAgent", "VisionAgent", "FusionAgent"],
+        "warmup": warmup_state.to_dict(),
+        "executor": executor.stats(),
+        "search_cache": search_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "image_cache": image_analyzer.stats(),
+        "llm_cache": llm_cache.stats(),
+        "history": history.stats(),
+        "jobs": job_queue.stats(),
+        "monitors": topic_monitor.stats(),
+        "rate_limits": {"llm": llm_limiter.stats(), "search": search_limiter.stats()},
+        "http": http_client.stats(),
+        "llm_models": model_usage.to_dict(),
+        "tracing": tracer.stats()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the crew stack is loaded, 503 before"""
+    state = warmup_state.to_dict()
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content={"ready": False, "warmup": state})
+    return {"ready": True, "warmup": state}
+
 # Legacy endpoint for backward compatibility
 @app.post("/process_input/")
 async def process_input(request: AnalysisRequest):
     """Legacy endpoint - use /api/analyze instead"""
-    result = analyze_sentiment_multimodal(
-        topic=request.topic,
-        noofarticles=request.noofarticles,
-        platforms=request.platforms
-    )
+    try:
+        result = await cached_analysis(request)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except AnalysisTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return result
 
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the in-process job workers"""
+    job_queue.scale(JOB_WORKERS)
+
+@app.on_event("startup")
+async def start_monitor_pollers():
+    """Start the in-process topic monitor pollers"""
+    topic_monitor.scale(MONITOR_WORKERS)
+
+@app.on_event("startup")
+async def start_background_warm_up():
+    """Load crewai and build the LLM without delaying the first health check"""
+    if WARMUP_ENABLED:
+        start_warm_up()
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """
+    Stop accepting analyses, let running ones finish for up to DRAIN_SECONDS,
+    then signal whatever is left to stop
+    """
+    await asyncio.gather(
+        asyncio.to_thread(executor.drain, DRAIN_SECONDS),
+        asyncio.to_thread(job_queue.drain, DRAIN_SECONDS),
+        asyncio.to_thread(topic_monitor.drain, DRAIN_SECONDS),
+    )
+    executor.shutdown()
+    job_queue.stop()
+    topic_monitor.stop()
+    http_client.close_http_client()
+
@@ -0,0 +1,70 @@
+from typing import Optional, Tuple, Type
+
+import httpx
+
+# =============================================
+# ERROR CLASSIFICATION - Which failures are worth another attempt
+# =============================================
+#
+# Shared by the job queue (retry with backoff) and the LLM client (move on
+# to a fallback model). Errors are classified by type and HTTP status, never
+# by their message: "connection refused: invalid API key" or a ValueError
+# about "5000 tokens" must not be retried.
+
+# 408 Request Timeout, 425 Too Early, 429 Too Many Requests and the
+# gateway/overload family
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+TRANSIENT_TYPES: Tuple[Type[BaseException], ...] = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+# litellm is only present with the crew stack; its exceptions also carry a
+# status_code, so this list is a safety net for ones that do not
+try:
+    import litellm
+
+    TRANSIENT_TYPES += tuple(
+        getattr(litellm, name)
+        for name in (
+            "RateLimitError", "ServiceUnavailableError", "Timeout",
+            "APIConnectionError", "InternalServerError",
+        )
+        if isinstance(getattr(litellm, name, None), type)
+    )
+except ImportError:
+    pass
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status attached to an SDK error, if any"""
+    response = getattr(error, "response", None)
+    for code in (
+        getattr(error, "status_code", None),
+        getattr(response, "status_code", None),
+        getattr(error, "code", None),
+    ):
+        if isinstance(code, int) and not isinstance(code, bool):
+            return code
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    True for timeouts, dropped connections, rate limits and 5xx answers.
+    Wrapped errors are judged by their cause, since crewai and litellm
+    re-raise provider errors inside their own exception types.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, TRANSIENT_TYPES):
+            return True
+        if status_code(error) in TRANSIENT_STATUS_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
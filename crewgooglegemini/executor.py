@@ -0,0 +1,242 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+# =============================================
+# ANALYSIS EXECUTOR - Bounded worker pool for crew runs
+# =============================================
+#
+# Crew.kickoff() is synchronous and takes 30-90 seconds, so it must never run
+# on the event loop. Analyses are handed to a fixed-size pool; requests beyond
+# the pool plus a short waiting line are rejected up front instead of piling up.
+
+
+class AdmissionRejected(Exception):
+    """Raised when the executor cannot accept another analysis"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AnalysisTimeout(Exception):
+    """Raised when an analysis exceeds its per-request time limit"""
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a worker once its analysis has been cancelled"""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag shared between the request and its worker.
+    Worker code calls check() at safe points (between agent steps).
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self, *_args, **_kwargs):
+        # Accepts and ignores arguments so it can be used directly as a
+        # CrewAI step_callback.
+        if self._event.is_set():
+            raise AnalysisCancelled("Analysis was cancelled")
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float, interval: float = 0.1) -> bool:
+    """Poll predicate until it is true or timeout seconds pass; returns its last value"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+class AnalysisExecutor:
+    """
+    Runs blocking analyses on a thread or process pool with admission control.
+
+    - max_workers analyses run at once
+    - up to max_queue more may wait for a free worker
+    - anything beyond that is rejected with 429, or 503 while shutting down
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_queue: int = 16,
+        timeout: float = 180.0,
+        kind: str = "thread",
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.kind = kind
+
+        if kind == "process":
+            self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="senti-analysis"
+            )
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._accepting = True
+        self._tokens = set()
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisExecutor":
+        """Build an executor from SENTI_* environment variables"""
+        max_workers = int(os.environ.get("SENTI_WORKERS", "8"))
+        return cls(
+            max_workers=max_workers,
+            max_queue=int(os.environ.get("SENTI_MAX_QUEUE", str(max_workers * 2))),
+            timeout=float(os.environ.get("SENTI_ANALYSIS_TIMEOUT", "180")),
+            kind=os.environ.get("SENTI_EXECUTOR", "thread"),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _admit(self):
+        with self._lock:
+            if not self._accepting:
+                self.rejected += 1
+                raise AdmissionRejected(503, "Server is shutting down, retry shortly")
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    429, "Too many analyses in progress, retry shortly"
+                )
+            self._in_flight += 1
+
+    def _release(self, token: CancelToken, _future=None):
+        # Called when the worker actually finishes, not when the caller gives
+        # up, so a timed-out analysis keeps its slot until it unwinds.
+        with self._lock:
+            self._in_flight -= 1
+            self._tokens.discard(token)
+            self.completed += 1
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        token: Optional[CancelToken] = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Admit fn(*args, **kwargs) and queue it on the pool.
+        Raises AdmissionRejected straight away when the executor is full, so
+        callers can answer with an HTTP error before doing anything else.
+
+        In thread mode fn receives a `cancel` keyword holding the CancelToken.
+        """
+        self._admit()
+        token = token or CancelToken()
+
+        if self.kind == "thread":
+            kwargs["cancel"] = token
+        try:
+            future = self._pool.submit(partial(fn, *args, **kwargs))
+        except RuntimeError:
+            # Pool already shut down
+            self._release(token)
+            raise AdmissionRejected(503, "Server is shutting down, retry shortly")
+
+        with self._lock:
+            self._tokens.add(token)
+        future.add_done_callback(partial(self._release, token))
+        future.token = token
+        return future
+
+    async def wait(self, future: Future, timeout: Optional[float] = None) -> Any:
+        """
+        Await a submitted analysis. The token is triggered on timeout or when
+        the awaiting request goes away. Process workers cannot be interrupted
+        mid-run; they are only cancelled if they have not started yet.
+        """
+        limit = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=limit)
+        except asyncio.TimeoutError:
+            future.token.cancel()
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise AnalysisTimeout(f"Analysis exceeded {limit:g}s time limit")
+        except asyncio.CancelledError:
+            # Client disconnected or server is stopping
+            future.token.cancel()
+            future.cancel()
+            raise
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        token: Optional[CancelToken] = None,
+        **kwargs,
+    ) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await its result"""
+        future = self.submit(fn, *args, token=token, **kwargs)
+        return await self.wait(future, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "available": max(0, self.capacity - self._in_flight),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "accepting": self._accepting,
+            }
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Stop accepting work and wait up to `timeout` seconds for in-flight
+        analyses to finish. Returns True when nothing is left running.
+        """
+        with self._lock:
+            self._accepting = False
+        return wait_until(self._idle, timeout)
+
+    def _idle(self) -> bool:
+        with self._lock:
+            return self._in_flight == 0
+
+    def shutdown(self, cancel_running: bool = True):
+        """Stop accepting work and optionally signal running analyses to stop"""
+        with self._lock:
+            self._accepting = False
+            tokens = list(self._tokens)
+        if cancel_running:
+            for token in tokens:
+                token.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,308 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Handle both relative and absolute imports
+try:
+    from .config import PROJECT_ROOT
+    from .tools import search_cache
+    from . import metrics
+except ImportError:
+    from config import PROJECT_ROOT
+    from tools import search_cache
+    import metrics
+
+# =============================================
+# SENTIMENT HISTORY - Append-only store of every finished analysis
+# =============================================
+#
+#   analyses          one row per fresh analysis (cache hits are not new
+#                     analyses), indexed on (topic_key, ts) and ts
+#   history_buckets   hourly per-topic count / score / confidence sums,
+#                     updated in the same transaction as the insert
+#
+# GET /api/history reads rows by topic and time range straight off the
+# index. The rolling aggregates behind GET /api/history/aggregates sum at most
+# one bucket row per hour of the window, never the analyses themselves, so a
+# dashboard gets a trend in milliseconds without re-running a crew. Stored
+# results leave out the agents' raw_output to keep rows small.
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "history.db"
+BUCKET_SECONDS = 3600
+BUCKET_SIZES = {"hour": 1, "day": 24}
+DEFAULT_WINDOW = 7 * 24 * 3600
+MAX_LIMIT = 1000
+
+REPORT_FIELDS = ("lexicon_report", "vision_report", "fusion_report")
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """
+    Epoch seconds from an ISO 8601 timestamp or a number; None passes
+    through. Timestamps without an offset are taken as UTC.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {value!r} (use ISO 8601 or epoch seconds)")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def utc_iso(ts: float) -> str:
+    """ISO 8601 with an explicit UTC offset, so it round-trips through parse_time"""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+class HistoryStore:
+    """SQLite history of analysis results with hourly pre-aggregated buckets"""
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = str(path)
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.failed = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, "
+                "topic TEXT NOT NULL, topic_key TEXT NOT NULL, platforms TEXT NOT NULL, "
+                "noofarticles INTEGER, engine TEXT NOT NULL, sentiment_score REAL NOT NULL, "
+                "confidence REAL NOT NULL, sentiment_label TEXT, result TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS analyses_topic_ts ON analyses (topic_key, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS analyses_ts ON analyses (ts)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_buckets ("
+                "topic_key TEXT NOT NULL, bucket INTEGER NOT NULL, topic TEXT NOT NULL, "
+                "analyses INTEGER NOT NULL, score_sum REAL NOT NULL, confidence_sum REAL NOT NULL, "
+                "score_min REAL NOT NULL, score_max REAL NOT NULL, "
+                "PRIMARY KEY (topic_key, bucket))"
+            )
+
+    @classmethod
+    def from_env(cls) -> "HistoryStore":
+        return cls(
+            path=os.environ.get("SENTI_HISTORY_DB", str(DEFAULT_DB_PATH)),
+            enabled=os.environ.get("SENTI_HISTORY", "1").lower() in ("1", "true", "yes"),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---------------------------------------------
+    # Writes
+    # ---------------------------------------------
+
+    def record(self, result: Dict[str, Any], noofarticles: Optional[int] = None) -> Optional[int]:
+        """
+        Append one successful analysis and fold it into its hourly bucket.
+        Best effort: a failed write is counted, never raised, so history
+        can not fail an analysis. Returns the row id.
+        """
+        if not self.enabled or not result.get("success"):
+            return None
+        try:
+            return self._record(result, noofarticles)
+        except Exception as e:
+            # Database errors, but also results whose score is not a number
+            with self._lock:
+                self.failed += 1
+            metrics.ERRORS.inc("history", type(e).__name__)
+            return None
+
+    def _record(self, result: Dict[str, Any], noofarticles: Optional[int]) -> int:
+        final = result.get("final_sentiment") or {}
+        score = float(final.get("overall_score", 0.0))
+        confidence = float(final.get("confidence", 0.0))
+        topic = result["topic"]
+        topic_key = search_cache.normalize(topic)
+        now = time.time()
+        stored = dict(result)
+        stored.pop("cache_status", None)
+        for field in REPORT_FIELDS:
+            if stored.get(field):
+                stored[field] = {k: v for k, v in stored[field].items() if k != "raw_output"}
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row_id = conn.execute(
+                "INSERT INTO analyses (ts, topic, topic_key, platforms, noofarticles, engine, "
+                "sentiment_score, confidence, sentiment_label, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    now, topic, topic_key, json.dumps(result.get("platforms", [])), noofarticles,
+                    final.get("engine", "crew"), score, confidence, final.get("sentiment_label"),
+                    json.dumps(stored, default=str),
+                ),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO history_buckets (topic_key, bucket, topic, analyses, score_sum, "
+                "confidence_sum, score_min, score_max) VALUES (?, ?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (topic_key, bucket) DO UPDATE SET "
+                "topic = excluded.topic, analyses = analyses + 1, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "confidence_sum = confidence_sum + excluded.confidence_sum, "
+                "score_min = MIN(score_min, excluded.score_min), "
+                "score_max = MAX(score_max, excluded.score_max)",
+                (topic_key, int(now // BUCKET_SECONDS), topic, score, confidence, score, score),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.recorded += 1
+        return row_id
+
+    # ---------------------------------------------
+    # Reads
+    # ---------------------------------------------
+
+    def query(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 100,
+        include_results: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Analyses newest first, optionally for one topic and a [since, until] range"""
+        clauses, params = [], []
+        if topic:
+            clauses.append("topic_key = ?")
+            params.append(search_cache.normalize(topic))
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = "id, ts, topic, platforms, noofarticles, engine, sentiment_score, confidence, sentiment_label"
+        if include_results:
+            columns += ", result"
+        rows = self._conn().execute(
+            f"SELECT {columns} FROM analyses {where} ORDER BY ts DESC LIMIT ?",
+            (*params, min(limit, MAX_LIMIT)),
+        ).fetchall()
+
+        entries = []
+        for row in rows:
+            entry = {
+                "id": row["id"],
+                "timestamp": utc_iso(row["ts"]),
+                "topic": row["topic"],
+                "platforms": json.loads(row["platforms"]),
+                "noofarticles": row["noofarticles"],
+                "engine": row["engine"],
+                "sentiment_score": row["sentiment_score"],
+                "confidence": row["confidence"],
+                "sentiment_label": row["sentiment_label"],
+            }
+            if include_results:
+                entry["result"] = json.loads(row["result"])
+            entries.append(entry)
+        return entries
+
+    def aggregates(
+        self,
+        topic: Optional[str] = None,
+        window: float = DEFAULT_WINDOW,
+        bucket: str = "day",
+        until: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rolling mean score/confidence over `window` seconds before `until`
+        (default now) and a per-hour or per-day series, from the buckets.
+        Bucket edges are whole UTC hours (days for bucket="day"), so the
+        window is rounded out to them.
+        """
+        if bucket not in BUCKET_SIZES:
+            raise ValueError(f"Unknown bucket: {bucket} (use one of {', '.join(BUCKET_SIZES)})")
+        until = time.time() if until is None else until
+        first = int((until - window) // BUCKET_SECONDS)
+        last = int(until // BUCKET_SECONDS)
+        size = BUCKET_SIZES[bucket]
+
+        clauses, params = ["bucket BETWEEN ? AND ?"], [first, last]
+        if topic:
+            clauses.append("topic_key = ?")
+            params.append(search_cache.normalize(topic))
+        where = " AND ".join(clauses)
+        conn = self._conn()
+        total = conn.execute(
+            "SELECT SUM(analyses), SUM(score_sum), SUM(confidence_sum), MIN(score_min), MAX(score_max) "
+            f"FROM history_buckets WHERE {where}",
+            params,
+        ).fetchone()
+        series = conn.execute(
+            f"SELECT bucket / {size} AS slot, SUM(analyses), SUM(score_sum), SUM(confidence_sum), "
+            f"MIN(score_min), MAX(score_max) FROM history_buckets WHERE {where} "
+            "GROUP BY slot ORDER BY slot",
+            params,
+        ).fetchall()
+
+        def summary(analyses, score_sum, confidence_sum, score_min, score_max) -> Dict[str, Any]:
+            return {
+                "analyses": analyses or 0,
+                "sentiment_score": round(score_sum / analyses, 2) if analyses else None,
+                "confidence": round(confidence_sum / analyses, 1) if analyses else None,
+                "min_score": score_min,
+                "max_score": score_max,
+            }
+
+        return {
+            "topic": topic,
+            "window_seconds": window,
+            "from": utc_iso(first * BUCKET_SECONDS),
+            "to": utc_iso((last + 1) * BUCKET_SECONDS),
+            "bucket": bucket,
+            "rolling": summary(*total),
+            "series": [
+                dict(
+                    summary(*row[1:]),
+                    start=utc_iso(row[0] * size * BUCKET_SECONDS),
+                )
+                for row in series
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        analyses, topics = self._conn().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT topic_key) FROM analyses"
+        ).fetchone()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "analyses": analyses,
+                "topics": topics,
+                "recorded_here": self.recorded,
+                "failed_writes": self.failed,
+            }
+
+
+history = HistoryStore.from_env()
@@ -0,0 +1,158 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Handle both relative and absolute imports
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+# =============================================
+# HTTP CLIENT - One pooled, keep-alive client for all outbound calls
+# =============================================
+#
+# Gemini (through litellm) and Serper are called 6-10 times per analysis.
+# Sharing a single httpx.Client keeps their connections open between calls,
+# so only the first request to each host pays for the TCP and TLS handshake.
+# HTTP/2 is used when the `h2` package is installed (pip install httpx[http2]),
+# letting concurrent stage threads multiplex over one connection per host.
+#
+# Connection reuse is measured with httpcore's trace hook: every response is
+# counted, and so is every new connection. The difference was served on a
+# connection that was already open.
+
+MAX_CONNECTIONS = int(os.environ.get("SENTI_HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE = int(os.environ.get("SENTI_HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.environ.get("SENTI_HTTP_KEEPALIVE_EXPIRY", "120"))
+CONNECT_TIMEOUT = float(os.environ.get("SENTI_HTTP_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("SENTI_HTTP_TIMEOUT", "120"))
+HTTP2_REQUESTED = os.environ.get("SENTI_HTTP2", "1").lower() in ("1", "true", "yes")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConnectionStats:
+    """Requests, new connections and TLS handshakes seen by the shared client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http_versions: Dict[str, int] = {}
+
+    def trace(self, host: str):
+        def on_event(event: str, info: Dict[str, Any]):
+            if event == "connection.connect_tcp.complete":
+                with self._lock:
+                    self.connections += 1
+                metrics.HTTP_CONNECTIONS.inc(host)
+            elif event == "connection.start_tls.complete":
+                with self._lock:
+                    self.tls_handshakes += 1
+        return on_event
+
+    def on_request(self, request: httpx.Request):
+        request.extensions["trace"] = self.trace(request.url.host)
+
+    def on_response(self, response: httpx.Response):
+        with self._lock:
+            self.requests += 1
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+        metrics.HTTP_REQUESTS.inc(response.request.url.host, response.http_version)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(self.requests - self.connections, 0)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": reused,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+                "http_versions": dict(self.http_versions),
+            }
+
+
+HTTP2_ENABLED = HTTP2_REQUESTED and http2_available()
+connection_stats = ConnectionStats()
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """The process-wide pooled client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=HTTP2_ENABLED,
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                    event_hooks={
+                        "request": [connection_stats.on_request],
+                        "response": [connection_stats.on_response],
+                    },
+                )
+    return _client
+
+
+def close_http_client():
+    """Close pooled connections (API shutdown)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _forget_client_in_child():
+    # A forked worker process must not share the parent's sockets
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_client_in_child)
+
+
+def litellm_client_params(model: str) -> Dict[str, Any]:
+    """
+    Route litellm through the shared client. OpenAI-compatible providers pick
+    it up from litellm.client_session; Gemini's native handler takes it as a
+    per-call `client`, returned here for the LLM's extra completion params.
+    """
+    try:
+        import litellm
+        from litellm.llms.custom_httpx.http_handler import HTTPHandler
+    except ImportError:
+        return {}
+
+    client = get_http_client()
+    litellm.client_session = client
+    if model.startswith(("gemini/", "vertex_ai/")):
+        return {"client": HTTPHandler(client=client)}
+    return {}
+
+
+def stats() -> Dict[str, Any]:
+    return dict(
+        connection_stats.to_dict(),
+        http2=HTTP2_ENABLED,
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive=MAX_KEEPALIVE,
+    )
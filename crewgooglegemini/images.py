@@ -0,0 +1,304 @@
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Handle both relative and absolute imports
+try:
+    from .config import PROJECT_ROOT
+    from .cache import make_cache
+    from .executor import CancelToken
+    from .parsing import find_json_object
+    from .schemas import VisionReport, REPORT_MAX_RETRIES
+    from .tracing import tracer
+    from . import metrics
+except ImportError:
+    from config import PROJECT_ROOT
+    from cache import make_cache
+    from executor import CancelToken
+    from parsing import find_json_object
+    from schemas import VisionReport, REPORT_MAX_RETRIES
+    from tracing import tracer
+    import metrics
+
+# =============================================
+# IMAGE ANALYSIS - Uploaded images straight to Gemini's vision input
+# =============================================
+#
+#   upload --(64 KB chunks, sha256 on the fly)--> data/uploads/<tmp>
+#          --> hash already analyzed? return cached report
+#          --> downsample to a MAX_SIDE px JPEG in memory
+#          --> one multimodal LLM call --> VisionReport
+#
+# The upload is deleted as soon as it has been analyzed (or rejected), and
+# the thumbnail is never written to disk, so only in-flight uploads use
+# disk space; only the report is cached. The LLM payload never exceeds one
+# MAX_SIDE x MAX_SIDE JPEG regardless of the uploaded resolution.
+
+UPLOAD_DIR = Path(os.environ.get("SENTI_IMAGE_DIR", str(PROJECT_ROOT / "data" / "uploads")))
+MAX_UPLOAD_BYTES = int(os.environ.get("SENTI_IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_SIDE = int(os.environ.get("SENTI_IMAGE_MAX_SIDE", "1024"))
+JPEG_QUALITY = int(os.environ.get("SENTI_IMAGE_JPEG_QUALITY", "85"))
+CHUNK_SIZE = 64 * 1024
+
+# Refuse to decode images that would expand past this many pixels
+MAX_PIXELS = 50_000_000
+
+ALLOWED_TYPES = ("image/jpeg", "image/png", "image/webp", "image/gif", "image/bmp")
+
+# Bump when the prompt or schema changes so old cached reports are ignored
+PROMPT_VERSION = "1"
+
+IMAGE_PROMPT = (
+    "You are VisionAgent - Visual Content Analyst. Analyze this social media "
+    "image and determine the sentiment it conveys. Consider visual mood and "
+    "atmosphere, color psychology, facial expressions, composition and any "
+    "visible text.\n\n"
+    "Answer with a single JSON object (no surrounding prose) containing:\n"
+    "- agent_name: 'VisionAgent'\n"
+    "- analysis_type: 'visual_sentiment'\n"
+    "- content_analyzed: 1\n"
+    "- sentiment_score: number from -10 to +10\n"
+    "- confidence: number from 0 to 100\n"
+    "- key_findings: list of 3-5 main visual insights\n"
+    "- visual_themes: list of visual patterns\n"
+    "- mood_indicators: list of visual mood descriptors\n"
+    "- color_sentiment: emotional impact of colors"
+)
+
+
+class ImageRejected(Exception):
+    """Upload that cannot be analyzed; carries the HTTP status to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def save_upload(upload, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[Path, str, int]:
+    """
+    Stream an UploadFile to UPLOAD_DIR in fixed-size chunks, hashing as it
+    goes. Returns (path, sha256 hex, size). Oversized uploads are cut off
+    at max_bytes and rejected with 413.
+    """
+    import aiofiles
+
+    if upload.content_type not in ALLOWED_TYPES:
+        raise ImageRejected(415, f"Unsupported image type: {upload.content_type}")
+
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = UPLOAD_DIR / f"upload-{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageRejected(413, f"Image exceeds the {max_bytes} byte upload limit")
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    if size == 0:
+        path.unlink(missing_ok=True)
+        raise ImageRejected(400, "Empty upload")
+    return path, digest.hexdigest(), size
+
+
+def make_thumbnail(source: Path) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Downsample `source` to fit MAX_SIDE x MAX_SIDE and return its size
+    info and JPEG bytes. JPEGs are decoded at reduced scale (draft mode), so
+    large photos never get fully decoded. Images declaring more than
+    MAX_PIXELS pixels are rejected before any pixel data is read.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source) as image:
+            original_size = image.size
+            if original_size[0] * original_size[1] > MAX_PIXELS:
+                raise ImageRejected(422, f"Image exceeds {MAX_PIXELS} pixels")
+            image.draft("RGB", (MAX_SIDE, MAX_SIDE))
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image.thumbnail((MAX_SIDE, MAX_SIDE))
+
+            out = io.BytesIO()
+            image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+            size = image.size
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise ImageRejected(422, f"Could not decode image ({type(e).__name__})")
+
+    jpeg = out.getvalue()
+    return {
+        "width": original_size[0],
+        "height": original_size[1],
+        "thumbnail_width": size[0],
+        "thumbnail_height": size[1],
+        "thumbnail_bytes": len(jpeg),
+    }, jpeg
+
+
+def _vision_messages(jpeg: bytes, feedback: Optional[str] = None):
+    text = IMAGE_PROMPT if not feedback else f"{IMAGE_PROMPT}\n\nYour previous answer was rejected: {feedback}"
+    data_url = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("ascii")
+    return [{
+        "role": "user",
+        "content": [
+            {"type": "text", "text": text},
+            {"type": "image_url", "image_url": {"url": data_url}},
+        ],
+    }]
+
+
+def call_vision_model(jpeg: bytes, cancel: Optional[CancelToken] = None) -> VisionReport:
+    """One multimodal LLM call, retried once when the answer fails validation"""
+    try:
+        from .agents import llm_for
+    except ImportError:
+        from agents import llm_for
+
+    llm = llm_for("vision")
+    feedback = None
+    for _ in range(REPORT_MAX_RETRIES + 1):
+        if cancel is not None:
+            cancel.check()
+        response = llm.call(_vision_messages(jpeg, feedback))
+        data = find_json_object(str(response))
+        if data is None:
+            feedback = "Answer with a single JSON object matching the VisionReport schema."
+            continue
+        try:
+            return VisionReport.model_validate(data)
+        except ValueError as e:
+            feedback = f"The JSON does not match the VisionReport schema: {e}"
+    raise ValueError(f"Vision model returned an invalid report: {feedback}")
+
+
+class ImageAnalyzer:
+    """
+    Content-addressed image analysis. Reports are cached by the image's
+    sha256, and concurrent uploads of the same image share one LLM call.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.analyzed = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(cls) -> "ImageAnalyzer":
+        return cls(make_cache(
+            "images",
+            ttl=float(os.environ.get("SENTI_IMAGE_CACHE_TTL", str(7 * 24 * 3600))),
+            max_entries=int(os.environ.get("SENTI_IMAGE_CACHE_SIZE", "1024")),
+            path=os.environ.get("SENTI_IMAGE_CACHE_DB"),
+        ))
+
+    @staticmethod
+    def key(sha256: str) -> str:
+        return f"v{PROMPT_VERSION}:{sha256}"
+
+    def cached(self, sha256: str) -> Optional[Dict[str, Any]]:
+        result = self.cache.get(self.key(sha256))
+        metrics.CACHE_REQUESTS.inc("image", "hit" if result is not None else "miss")
+        return result
+
+    def analyze(
+        self,
+        upload_path: str,
+        sha256: str,
+        size: int,
+        cancel: Optional[CancelToken] = None,
+    ) -> Dict[str, Any]:
+        """Thumbnail + vision call for one saved upload; always removes the upload"""
+        key = self.key(sha256)
+        try:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return dict(cached, cache_status="hit")
+
+            with self._lock:
+                future = self._in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._in_flight[key] = future
+                else:
+                    self.coalesced += 1
+            if not owner:
+                metrics.CACHE_REQUESTS.inc("image", "coalesced")
+                return dict(future.result(), cache_status="coalesced")
+
+            try:
+                result = self._analyze(Path(upload_path), sha256, size, cancel)
+                self.cache.set(key, result)
+                future.set_result(result)
+                return dict(result, cache_status="miss")
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+        finally:
+            Path(upload_path).unlink(missing_ok=True)
+
+    def _analyze(self, source: Path, sha256: str, size: int, cancel: Optional[CancelToken]) -> Dict[str, Any]:
+        timings = {}
+        with tracer.span("image.analyze", sha256=sha256, bytes=size):
+            started = time.perf_counter()
+            with tracer.span("image.thumbnail"):
+                image_info, jpeg = make_thumbnail(source)
+            timings["thumbnail"] = round(time.perf_counter() - started, 3)
+
+            started = time.perf_counter()
+            report = call_vision_model(jpeg, cancel)
+            timings["vision"] = round(time.perf_counter() - started, 3)
+            metrics.STAGE_SECONDS.observe(timings["vision"], "image")
+
+        with self._lock:
+            self.analyzed += 1
+        return {
+            "success": True,
+            "image": dict(image_info, sha256=sha256, bytes=size),
+            "vision_report": dict(report.model_dump(), timestamp=datetime.now().isoformat()),
+            "timings": timings,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        stats.update(analyzed=self.analyzed, coalesced=self.coalesced)
+        return stats
+
+
+# Shared per process; analyze_image is the picklable entry point for the
+# worker pool (thread or process mode)
+image_analyzer = ImageAnalyzer.from_env()
+
+
+def analyze_image(
+    upload_path: str,
+    sha256: str,
+    size: int,
+    cancel: Optional[CancelToken] = None,
+) -> Dict[str, Any]:
+    return image_analyzer.analyze(upload_path, sha256, size, cancel=cancel)
@@ -0,0 +1,397 @@
+import argparse
+import json
+import os
+import random
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Handle both relative and absolute imports
+try:
+    from .executor import CancelToken, AnalysisCancelled, wait_until
+    from .errors import is_transient
+except ImportError:
+    from executor import CancelToken, AnalysisCancelled, wait_until
+    from errors import is_transient
+
+# =============================================
+# JOB QUEUE - Durable submit/poll analyses backed by SQLite
+# =============================================
+#
+# Jobs live in a single SQLite table, so the API process and any number of
+# standalone worker processes can share one queue without a broker:
+#
+#   API:     POST /api/jobs  -> JobQueue.submit()  -> status "queued"
+#   Worker:  claim() -> runner(**payload) -> "succeeded" | retry | "failed"
+#   API:     GET /api/jobs/{id} -> JobQueue.get()
+#
+# A claimed job holds a lease tagged with a random owner. The worker renews
+# it while the job runs, for at most `timeout` seconds. If the worker dies or
+# hangs, the lease expires and another worker picks the job up. Each pickup
+# counts as an attempt, so a job that keeps killing its worker fails after
+# max_attempts. Status updates only apply while the worker still owns the
+# lease, so a worker that lost its job cannot overwrite the new owner's state.
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "jobs.db"
+
+
+class JobQueue:
+    """SQLite-backed priority queue with retries and a local worker pool"""
+
+    def __init__(
+        self,
+        runner: Callable[..., Dict[str, Any]],
+        path: str = str(DEFAULT_DB_PATH),
+        max_attempts: int = 3,
+        backoff: float = 5.0,
+        lease: float = 600.0,
+        timeout: float = 180.0,
+        poll_interval: float = 1.0,
+    ):
+        self.runner = runner
+        self.path = str(path)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._stops: List[threading.Event] = []
+        self._running: Dict[str, CancelToken] = {}
+        self.retried = 0
+        self.lost_leases = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, "
+                "payload TEXT NOT NULL, result TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+                "available_at REAL NOT NULL, lease_expires REAL, lease_owner TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "lease_owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_owner TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_ready "
+                "ON jobs (status, priority DESC, available_at)"
+            )
+
+    @classmethod
+    def from_env(cls, runner: Callable[..., Dict[str, Any]]) -> "JobQueue":
+        return cls(
+            runner,
+            path=os.environ.get("SENTI_JOB_DB", str(DEFAULT_DB_PATH)),
+            max_attempts=int(os.environ.get("SENTI_JOB_MAX_ATTEMPTS", "3")),
+            backoff=float(os.environ.get("SENTI_JOB_BACKOFF", "5")),
+            lease=float(os.environ.get("SENTI_JOB_LEASE", "600")),
+            timeout=float(os.environ.get(
+                "SENTI_JOB_TIMEOUT", os.environ.get("SENTI_ANALYSIS_TIMEOUT", "180")
+            )),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---------------------------------------------
+    # Producer side
+    # ---------------------------------------------
+
+    def submit(self, payload: Dict[str, Any], priority: int = 0) -> str:
+        """Queue a job; higher priority runs first, FIFO within a priority"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, status, priority, payload, max_attempts, "
+            "available_at, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+            (job_id, priority, json.dumps(payload), self.max_attempts, now, now, now),
+        )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "finished_at": row["finished_at"],
+            "next_attempt_at": row["available_at"] if row["status"] == "queued" else None,
+            "request": json.loads(row["payload"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+        }
+
+    # ---------------------------------------------
+    # Worker side
+    # ---------------------------------------------
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """
+        Atomically take the best ready job, including ones with lapsed
+        leases. Returns the claimed row with its new attempt count and
+        lease_owner. Lapsed jobs that have used up their attempts are
+        failed instead.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_expires = NULL, "
+                "lease_owner = NULL, updated_at = ?, finished_at = ? "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                ("Worker stopped responding on the last attempt", now, now, now),
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY priority DESC, available_at, created_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_expires = ?, lease_owner = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease, uuid.uuid4().hex, now, row["id"]),
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _update_owned(self, job_id: str, owner: str, assignments: str, params: tuple) -> bool:
+        # Only the worker holding the lease may change a running job
+        updated = self._conn().execute(
+            f"UPDATE jobs SET {assignments}, lease_expires = NULL, lease_owner = NULL "
+            "WHERE id = ? AND lease_owner = ?",
+            (*params, job_id, owner),
+        ).rowcount
+        if not updated:
+            with self._lock:
+                self.lost_leases += 1
+        return bool(updated)
+
+    def _finish(self, job_id: str, owner: str, status: str, result=None, error: Optional[str] = None) -> bool:
+        now = time.time()
+        return self._update_owned(
+            job_id, owner,
+            "status = ?, result = ?, error = ?, updated_at = ?, finished_at = ?",
+            (status, json.dumps(result) if result is not None else None, error, now, now),
+        )
+
+    def _retry_later(self, job_id: str, owner: str, attempts: int, error: str) -> bool:
+        # Exponential backoff with jitter: backoff, 2x, 4x, ...
+        delay = self.backoff * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+        now = time.time()
+        retried = self._update_owned(
+            job_id, owner,
+            "status = 'queued', error = ?, available_at = ?, updated_at = ?",
+            (error, now + delay, now),
+        )
+        if retried:
+            with self._lock:
+                self.retried += 1
+        return retried
+
+    def _requeue(self, job_id: str, owner: str) -> bool:
+        # Shutdown interrupted the job; give the attempt back
+        now = time.time()
+        return self._update_owned(
+            job_id, owner,
+            "status = 'queued', attempts = MAX(attempts - 1, 0), available_at = ?, updated_at = ?",
+            (now, now),
+        )
+
+    def _keep_lease(self, job_id: str, owner: str, token: CancelToken, timed_out: threading.Event,
+                    done: threading.Event):
+        """
+        Renew the lease of a running job until it is done. Past `timeout`
+        the job is cancelled and the lease is left to lapse, so a job that
+        ignores cancellation is reclaimed (and counted as an attempt) later.
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout > 0 else None
+        interval = self.lease / 3
+        while True:
+            wait = interval if deadline is None else min(interval, max(deadline - time.monotonic(), 0))
+            if done.wait(wait):
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out.set()
+                token.cancel()
+                return
+            try:
+                renewed = self._conn().execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+                    (time.time() + self.lease, job_id, owner),
+                ).rowcount
+            except sqlite3.OperationalError:
+                # Database busy; the lease still has two thirds left
+                continue
+            if not renewed:
+                # Another worker reclaimed the job; stop duplicating its work
+                token.cancel()
+                return
+
+    def run_one(self) -> bool:
+        """Claim and execute a single job; returns False when nothing was ready"""
+        row = self.claim()
+        if row is None:
+            return False
+
+        job_id, owner, attempts = row["id"], row["lease_owner"], row["attempts"]
+        token = CancelToken()
+        timed_out, done = threading.Event(), threading.Event()
+        with self._lock:
+            self._running[job_id] = token
+        threading.Thread(
+            target=self._keep_lease,
+            args=(job_id, owner, token, timed_out, done),
+            name=f"senti-job-lease-{job_id[:8]}",
+            daemon=True,
+        ).start()
+
+        try:
+            result = self.runner(cancel=token, **json.loads(row["payload"]))
+            self._finish(job_id, owner, "succeeded", result=result)
+        except AnalysisCancelled:
+            error = f"Job exceeded {self.timeout:g}s time limit"
+            if not timed_out.is_set():
+                self._requeue(job_id, owner)
+            elif attempts < row["max_attempts"]:
+                self._retry_later(job_id, owner, attempts, error)
+            else:
+                self._finish(job_id, owner, "failed", error=error)
+        except Exception as e:
+            if is_transient(e) and attempts < row["max_attempts"]:
+                self._retry_later(job_id, owner, attempts, str(e))
+            else:
+                self._finish(job_id, owner, "failed", error=str(e))
+        finally:
+            done.set()
+            with self._lock:
+                self._running.pop(job_id, None)
+        return True
+
+    def _work(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                if self.run_one():
+                    continue
+            except sqlite3.OperationalError:
+                # Database busy under heavy contention; back off and retry
+                pass
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def scale(self, workers: int):
+        """Grow or shrink the local worker pool to `workers` threads"""
+        with self._lock:
+            while len(self._workers) < workers:
+                stop = threading.Event()
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stop,),
+                    name=f"senti-job-worker-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(thread)
+                self._stops.append(stop)
+                thread.start()
+            while len(self._workers) > workers:
+                # Surplus workers exit after their current job
+                self._workers.pop()
+                self._stops.pop().set()
+        self._wakeup.set()
+
+    def drain(self, timeout: float) -> bool:
+        """Stop claiming; False if jobs are still running after `timeout` (stop() re-queues them)"""
+        self.scale(0)
+        return wait_until(self._idle, timeout)
+
+    def _idle(self) -> bool:
+        with self._lock:
+            return not self._running
+
+    def stop(self, cancel_running: bool = True):
+        """Stop all local workers; running jobs are cancelled and re-queued"""
+        self.scale(0)
+        if cancel_running:
+            with self._lock:
+                tokens = list(self._running.values())
+            for token in tokens:
+                token.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = dict(
+            self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        )
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "running_here": len(self._running),
+                "retried": self.retried,
+                "lost_leases": self.lost_leases,
+                "queued": counts.get("queued", 0),
+                "running": counts.get("running", 0),
+                "succeeded": counts.get("succeeded", 0),
+                "failed": counts.get("failed", 0),
+            }
+
+
+def main():
+    """Run analysis workers without the API server"""
+    parser = argparse.ArgumentParser(description="Senti-Core job queue worker")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SENTI_JOB_WORKERS", "2")),
+        help="Number of worker threads",
+    )
+    args = parser.parse_args()
+
+    # Imported here so the API process can import this module cheaply
+    try:
+        from .endpoints import run_analysis
+    except ImportError:
+        from endpoints import run_analysis
+
+    queue = JobQueue.from_env(run_analysis)
+    queue.scale(args.workers)
+    print(f"Senti-Core job worker started with {args.workers} workers on {queue.path}")
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    stopped.wait()
+    # Let running jobs finish; anything still running afterwards is re-queued
+    queue.drain(float(os.environ.get("SENTI_DRAIN_SECONDS", "30")))
+    queue.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Handle both relative and absolute imports
+try:
+    from .cache import make_cache
+except ImportError:
+    from cache import make_cache
+
+# =============================================
+# LLM RESPONSE CACHE - Skip Gemini for repeated and near-repeated prompts
+# =============================================
+#
+# Sits under SentiLLM.call, before the rate limiter:
+#
+#   exact  sha256(model, temperature, tools, messages) -> cached response
+#   near   MinHash LSH over the canonicalized prompt text (opt-in): a prompt
+#          that differs from a cached one only in case, spacing, punctuation,
+#          plurals or "iphone17" vs "iphone 17" reuses its response
+#
+# Near matches are checked before they are served. The estimated Jaccard
+# similarity of the prompts' word 3-shingles must reach the threshold, and
+# at most MAX_TOKEN_DIFF distinct words may differ. No differing word may
+# repeat in the prompt, since a repeated word is usually the topic itself.
+# This keeps "Tesla" from being answered with the cached "Ford" analysis
+# even though the templated prompts are otherwise identical.
+#
+# Exact entries live in a make_cache backend (memory, SQLite or Redis); the
+# near-duplicate index is per process and points at those entries.
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+LETTER_DIGIT = re.compile(r"(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])")
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+MAX_TOKEN_DIFF = 2
+REPEATED_TOKEN = 3
+_PRIME = (1 << 31) - 1
+
+_bypass: contextvars.ContextVar = contextvars.ContextVar("senti_llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass(enabled: bool = True) -> Iterator[None]:
+    """Skip cache lookups (responses are still stored) inside this block"""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def canonical_tokens(text: str) -> List[str]:
+    """Lowercased word tokens with letters/digits split and plural 's' dropped"""
+    tokens = TOKEN_PATTERN.findall(LETTER_DIGIT.sub(" ", text.lower()))
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in tokens
+    ]
+
+
+def _near_text(messages) -> Optional[str]:
+    """Role-tagged prompt text, or None when the prompt carries non-text parts"""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages:
+        content = message.get("content", "")
+        if not isinstance(content, str):
+            return None
+        parts.append(f"{message.get('role', '')}: {content}")
+    return "\n".join(parts)
+
+
+class MinHasher:
+    """MinHash signatures over hashed shingles with NUM_PERM universal hashes"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)[:, None]
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)[:, None]
+
+    def signature(self, tokens: List[str]) -> np.ndarray:
+        shingles = {
+            " ".join(tokens[i:i + SHINGLE_SIZE])
+            for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) % _PRIME for s in shingles), dtype=np.int64, count=len(shingles)
+        )[None, :]
+        return ((self.a * hashes + self.b) % _PRIME).min(axis=1)
+
+
+class NearDuplicateIndex:
+    """LRU-bounded MinHash LSH index from prompt signatures to exact cache keys"""
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 256, bands: int = BANDS):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bands = bands
+        self.hasher = MinHasher()
+        self.rows = NUM_PERM // bands
+        self._entries: "OrderedDict[str, Tuple[str, np.ndarray, Counter]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, bytes], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, partition: str, signature: np.ndarray) -> List[Tuple[str, int, bytes]]:
+        return [
+            (partition, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, partition: str, key: str, tokens: List[str]):
+        signature = self.hasher.signature(tokens)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (partition, signature, Counter(tokens))
+            for band_key in self._band_keys(partition, signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        partition, signature, _ = self._entries.pop(key)
+        for band_key in self._band_keys(partition, signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def find(self, partition: str, tokens: List[str]) -> Optional[str]:
+        """Cache key of the most similar safe match, if any"""
+        signature = self.hasher.signature(tokens)
+        counts = Counter(tokens)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(partition, signature):
+                candidates |= self._buckets.get(band_key, set())
+            best, best_similarity = None, self.threshold
+            for key in candidates:
+                _, other_signature, other_counts = self._entries[key]
+                similarity = float((signature == other_signature).mean())
+                if similarity >= best_similarity and _safe_match(counts, other_counts):
+                    best, best_similarity = key, similarity
+            if best is not None:
+                self._entries.move_to_end(best)
+            return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _safe_match(counts: Counter, other: Counter) -> bool:
+    differing = counts.keys() ^ other.keys()
+    if len(differing) > MAX_TOKEN_DIFF:
+        return False
+    return all(max(counts[t], other[t]) < REPEATED_TOKEN for t in differing)
+
+
+class CacheLookup:
+    """Result of LLMResponseCache.get; pass it back to put() on a miss"""
+
+    __slots__ = ("key", "partition", "tokens", "response", "match")
+
+    def __init__(self, key: str, partition: str, tokens: Optional[List[str]]):
+        self.key = key
+        self.partition = partition
+        self.tokens = tokens
+        self.response: Optional[str] = None
+        self.match = "miss"  # exact | near | miss | bypass
+
+
+class LLMResponseCache:
+    """Exact plus optional near-duplicate cache of LLM text responses"""
+
+    def __init__(self, cache, near: Optional[NearDuplicateIndex] = None, enabled: bool = True):
+        self.cache = cache
+        self.near = near
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counts = {"exact": 0, "near": 0, "miss": 0, "bypass": 0}
+
+    bypass = staticmethod(bypass)
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        near = None
+        if os.environ.get("SENTI_LLM_CACHE_NEAR", "0").lower() in ("1", "true", "yes"):
+            near = NearDuplicateIndex(
+                threshold=float(os.environ.get("SENTI_LLM_CACHE_NEAR_THRESHOLD", "0.9")),
+                max_entries=int(os.environ.get("SENTI_LLM_CACHE_NEAR_SIZE", "256")),
+            )
+        return cls(
+            make_cache(
+                "llm",
+                ttl=float(os.environ.get("SENTI_LLM_CACHE_TTL", "3600")),
+                max_entries=int(os.environ.get("SENTI_LLM_CACHE_SIZE", "2048")),
+                path=os.environ.get("SENTI_LLM_CACHE_DB"),
+                redis_url=os.environ.get("SENTI_LLM_CACHE_REDIS"),
+            ),
+            near=near,
+            enabled=os.environ.get("SENTI_LLM_CACHE", "1").lower() in ("1", "true", "yes"),
+        )
+
+    @staticmethod
+    def _partition(model: str, temperature: Optional[float], tools: Any) -> str:
+        names = sorted(
+            str((tool.get("function") or {}).get("name") if isinstance(tool, dict) else tool)
+            for tool in tools or []
+        )
+        return f"{model}|{temperature}|{','.join(names)}"
+
+    def get(self, model: str, messages, temperature: Optional[float] = None, tools: Any = None) -> CacheLookup:
+        partition = self._partition(model, temperature, tools)
+        body = json.dumps(messages, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{partition}\n{body}".encode()).hexdigest()
+        text = _near_text(messages) if self.near is not None else None
+        lookup = CacheLookup(key, partition, canonical_tokens(text) if text else None)
+
+        if _bypass.get():
+            lookup.match = "bypass"
+        else:
+            entry = self.cache.get(key)
+            if entry is not None:
+                lookup.response, lookup.match = entry["response"], "exact"
+            elif lookup.tokens:
+                near_key = self.near.find(partition, lookup.tokens)
+                if near_key is not None:
+                    entry = self.cache.get(near_key)
+                    if entry is None:
+                        # Expired in the backend; forget it here too
+                        self.near.discard(near_key)
+                    else:
+                        lookup.response, lookup.match = entry["response"], "near"
+        with self._lock:
+            self.counts[lookup.match] += 1
+        return lookup
+
+    def put(self, lookup: CacheLookup, response: Any):
+        """Store a text response for the looked-up prompt"""
+        if not isinstance(response, str) or not response.strip():
+            return
+        self.cache.set(lookup.key, {"response": response})
+        if self.near is not None and lookup.tokens:
+            self.near.add(lookup.partition, lookup.key, lookup.tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        with self._lock:
+            stats.update(
+                enabled=self.enabled,
+                near_duplicates=self.near is not None,
+                near_entries=len(self.near) if self.near is not None else 0,
+                exact_hits=self.counts["exact"],
+                near_hits=self.counts["near"],
+                lookups_missed=self.counts["miss"],
+                bypassed=self.counts["bypass"],
+            )
+        return stats
+
+
+llm_cache = LLMResponseCache.from_env()
@@ -0,0 +1,153 @@
+import time
+from typing import List
+
+from crewai import LLM
+from pydantic import PrivateAttr
+
+# Handle both relative and absolute imports
+try:
+    from .ratelimit import llm_limiter, estimate_tokens
+    from .errors import is_transient
+    from .llm_usage import call_cost, model_usage
+    from .llm_cache import llm_cache
+    from .tracing import tracer
+    from . import metrics
+except ImportError:
+    from ratelimit import llm_limiter, estimate_tokens
+    from errors import is_transient
+    from llm_usage import call_cost, model_usage
+    from llm_cache import llm_cache
+    from tracing import tracer
+    import metrics
+
+# =============================================
+# LLM CLIENT - CrewAI LLM wrapper shared by all agents
+# =============================================
+
+
+# Gemini bills an image as a fixed number of tokens, whatever its payload size
+IMAGE_TOKENS = 258
+
+
+def prompt_text(messages) -> str:
+    """Flatten a string or chat message list into plain text"""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            # Multimodal content: keep the text parts, skip inline image data
+            parts.extend(str(part.get("text", "")) for part in content if part.get("type") == "text")
+        else:
+            parts.append(str(content))
+    return "\n".join(parts)
+
+
+def prompt_tokens(messages) -> int:
+    """Estimated prompt tokens, counting each inline image at IMAGE_TOKENS"""
+    images = 0
+    if not isinstance(messages, str):
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, list):
+                images += sum(1 for part in content if part.get("type") == "image_url")
+    return estimate_tokens(prompt_text(messages)) + images * IMAGE_TOKENS
+
+
+def agent_label(agent) -> str:
+    """Short agent name for metrics, e.g. 'LexiconAgent' from its role"""
+    role = getattr(agent, "role", None)
+    return role.split(" - ")[0].strip() if role else "unknown"
+
+
+class SentiLLM(LLM):
+    """
+    CrewAI LLM that waits on the process-wide limiter before every call.
+    Each call reserves its prompt plus max_tokens from the token budget and
+    hands back whatever the response did not use. Calls are timed, counted
+    and costed per agent and model, and traced as "llm.call" spans.
+
+    When the model fails with a rate limit, timeout or overload error, the
+    call is retried once on each fallback model in order (see agents.py).
+
+    Text responses are cached (llm_cache.py) under the primary model, so a
+    repeated prompt skips the limiter and the provider entirely. Calls that
+    execute tools themselves (available_functions) are never cached.
+    """
+
+    _fallbacks: List["SentiLLM"] = PrivateAttr(default_factory=list)
+
+    def set_fallbacks(self, fallbacks: List["SentiLLM"]):
+        self._fallbacks = [llm for llm in fallbacks if llm.model != self.model]
+
+    def call(self, messages, *args, **kwargs):
+        lookup = None
+        if llm_cache.enabled and not kwargs.get("available_functions"):
+            lookup = llm_cache.get(self.model, messages, self.temperature, kwargs.get("tools"))
+            metrics.CACHE_REQUESTS.inc("llm", "hit" if lookup.match == "exact" else lookup.match)
+            if lookup.response is not None:
+                with tracer.span("llm.cache", model=self.model, agent=agent_label(kwargs.get("from_agent")),
+                                 match=lookup.match):
+                    return lookup.response
+
+        response = self._call_with_fallbacks(messages, *args, **kwargs)
+        if lookup is not None:
+            llm_cache.put(lookup, response)
+        return response
+
+    def _call_with_fallbacks(self, messages, *args, **kwargs):
+        try:
+            return self._call_once(messages, *args, **kwargs)
+        except Exception as e:
+            if not self._fallbacks or not is_transient(e):
+                raise
+            error = e
+
+        for fallback in self._fallbacks:
+            metrics.LLM_FALLBACKS.inc(self.model, fallback.model)
+            try:
+                return fallback._call_once(messages, *args, fallback=True, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                error = e
+        raise error
+
+    def _call_once(self, messages, *args, fallback: bool = False, **kwargs):
+        agent = agent_label(kwargs.get("from_agent"))
+        prompt_count = prompt_tokens(messages)
+        reserved = prompt_count + (self.max_tokens or 0)
+
+        with tracer.span("llm.call", model=self.model, agent=agent, prompt_tokens=prompt_count,
+                         fallback=fallback) as span:
+            waited = llm_limiter.acquire(reserved)
+            metrics.RATE_LIMIT_WAIT_SECONDS.observe(waited, "llm")
+
+            started = time.perf_counter()
+            try:
+                response = super().call(messages, *args, **kwargs)
+            except Exception as e:
+                # The provider rejected or dropped the call; completion tokens were not spent
+                elapsed = time.perf_counter() - started
+                llm_limiter.refund(self.max_tokens or 0)
+                metrics.LLM_SECONDS.observe(elapsed, agent, self.model, "error")
+                metrics.ERRORS.inc("llm", type(e).__name__)
+                model_usage.record(self.model, elapsed, ok=False, fallback=fallback)
+                raise
+            elapsed = time.perf_counter() - started
+            metrics.LLM_SECONDS.observe(elapsed, agent, self.model, "ok")
+
+            completion_tokens = estimate_tokens(str(response))
+            for kind, tokens in (("prompt", prompt_count), ("completion", completion_tokens)):
+                metrics.LLM_TOKENS.observe(tokens, agent, kind)
+                metrics.LLM_TOKENS_TOTAL.inc(agent, kind, amount=tokens)
+            cost = call_cost(self.model, prompt_count, completion_tokens)
+            metrics.LLM_COST.inc(agent, self.model, amount=cost)
+            model_usage.record(self.model, elapsed, ok=True, cost=cost, fallback=fallback)
+            if span is not None:
+                span.set(completion_tokens=completion_tokens, rate_limit_wait=round(waited, 3),
+                         cost_usd=round(cost, 6))
+
+        llm_limiter.refund(reserved - prompt_count - completion_tokens)
+        return response
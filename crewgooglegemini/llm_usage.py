@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Dict
+
+# =============================================
+# LLM USAGE - Per-model latency and estimated spend
+# =============================================
+#
+# Kept free of crewai imports so /api/health can report usage before the
+# crew stack is loaded. Costs are estimates from the same token counts the
+# rate limiter uses, priced at list price.
+
+# USD per million (prompt, completion) tokens, matched on the model name
+# without its provider prefix. Unknown models are counted at zero cost.
+PRICES_PER_MILLION = {
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+}
+
+
+def call_cost(model: str, prompt: int, completion: int) -> float:
+    """Estimated USD cost of one call"""
+    prices = PRICES_PER_MILLION.get(model.split("/")[-1])
+    if prices is None:
+        return 0.0
+    return (prompt * prices[0] + completion * prices[1]) / 1_000_000
+
+
+class ModelUsage:
+    """Per-model call counts, latency and estimated spend for /api/health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, float]] = {}
+
+    def record(self, model: str, seconds: float, ok: bool, cost: float = 0.0, fallback: bool = False):
+        with self._lock:
+            usage = self._models.setdefault(
+                model, {"calls": 0, "errors": 0, "fallback_calls": 0, "seconds": 0.0, "cost_usd": 0.0}
+            )
+            usage["calls"] += 1
+            usage["errors"] += 0 if ok else 1
+            usage["fallback_calls"] += 1 if fallback else 0
+            usage["seconds"] += seconds
+            usage["cost_usd"] += cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                model: {
+                    "calls": int(u["calls"]),
+                    "errors": int(u["errors"]),
+                    "fallback_calls": int(u["fallback_calls"]),
+                    "mean_seconds": round(u["seconds"] / u["calls"], 3) if u["calls"] else None,
+                    "cost_usd": round(u["cost_usd"], 6),
+                }
+                for model, u in self._models.items()
+            }
+
+
+model_usage = ModelUsage()
@@ -0,0 +1,254 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# =============================================
+# METRICS - Prometheus text exposition without extra dependencies
+# =============================================
+#
+# Counters, gauges and histograms keep their values in this process and are
+# rendered by GET /metrics in the Prometheus text format (version 0.0.4).
+# Label values are passed positionally in the order the metric declares.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache hits (ms) up to full multi-agent analyses (minutes)
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (64, 256, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Tuple[str, ...]) -> Tuple[str, ...]:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {values}")
+        return tuple(str(v) for v in values)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Point-in-time values read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None,
+    ):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        try:
+            values = self.collect() if self.collect else {}
+        except Exception:
+            values = {}
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*s[0]], s[1], s[2])) for key, s in self._series.items())
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+ANALYSIS_SECONDS = registry.register(Histogram(
+    "senti_analysis_seconds",
+    "End-to-end analysis latency",
+    labels=("engine", "outcome"),
+))
+STAGE_SECONDS = registry.register(Histogram(
+    "senti_stage_seconds",
+    "Pipeline stage latency (search, lexicon, vision, fusion)",
+    labels=("stage",),
+))
+LLM_SECONDS = registry.register(Histogram(
+    "senti_llm_call_seconds",
+    "Latency of one LLM call, excluding rate limiter wait",
+    labels=("agent", "model", "outcome"),
+))
+LLM_TOKENS = registry.register(Histogram(
+    "senti_llm_tokens",
+    "Estimated tokens per LLM call",
+    labels=("agent", "kind"),
+    buckets=TOKEN_BUCKETS,
+))
+LLM_TOKENS_TOTAL = registry.register(Counter(
+    "senti_llm_tokens_total",
+    "Estimated tokens sent to and received from the LLM",
+    labels=("agent", "kind"),
+))
+LLM_COST = registry.register(Counter(
+    "senti_llm_cost_usd_total",
+    "Estimated LLM spend in USD from token estimates and list prices",
+    labels=("agent", "model"),
+))
+LLM_FALLBACKS = registry.register(Counter(
+    "senti_llm_fallbacks_total",
+    "Calls retried on a fallback model after a rate limit, timeout or overload",
+    labels=("from_model", "to_model"),
+))
+LLM_ESCALATIONS = registry.register(Counter(
+    "senti_llm_escalations_total",
+    "Stages re-run on the escalation model after a low-confidence report",
+    labels=("stage",),
+))
+RATE_LIMIT_WAIT_SECONDS = registry.register(Histogram(
+    "senti_rate_limit_wait_seconds",
+    "Time spent waiting on the shared rate limiter",
+    labels=("limiter",),
+))
+SEARCH_SECONDS = registry.register(Histogram(
+    "senti_search_seconds",
+    "Latency of outbound search API calls",
+    labels=("outcome",),
+))
+HTTP_REQUESTS = registry.register(Counter(
+    "senti_http_requests_total",
+    "Outbound requests on the shared HTTP client",
+    labels=("host", "http_version"),
+))
+HTTP_CONNECTIONS = registry.register(Counter(
+    "senti_http_connections_opened_total",
+    "New connections opened by the shared HTTP client; requests beyond these reused a kept-alive connection",
+    labels=("host",),
+))
+CACHE_REQUESTS = registry.register(Counter(
+    "senti_cache_requests_total",
+    "Cache lookups by cache and result (hit, miss, stale, coalesced, bypass)",
+    labels=("cache", "result"),
+))
+MONITOR_POLLS = registry.register(Counter(
+    "senti_monitor_polls_total",
+    "Scheduled monitor polls by outcome (analyzed, unchanged, removed, lost_lease, error)",
+    labels=("outcome",),
+))
+MONITOR_ITEMS = registry.register(Counter(
+    "senti_monitor_items_total",
+    "Search results seen by monitors, split into new and already analyzed",
+    labels=("result",),
+))
+ERRORS = registry.register(Counter(
+    "senti_errors_total",
+    "Failures by component and exception type",
+    labels=("component", "error"),
+))
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format"""
+    return registry.render()
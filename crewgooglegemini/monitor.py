@@ -0,0 +1,631 @@
+import argparse
+import os
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Handle both relative and absolute imports
+try:
+    from .config import PROJECT_ROOT, debug_enabled
+    from .executor import CancelToken, AnalysisCancelled, wait_until
+    from .tools import search_cache, format_results
+    from .retrieval import result_key
+    from .prescore import prescore, is_clear_cut, PRESCORE_THRESHOLD
+    from .parsing import parse_agent_output
+    from .tracing import tracer
+    from .history import utc_iso
+    from . import metrics
+except ImportError:
+    from config import PROJECT_ROOT, debug_enabled
+    from executor import CancelToken, AnalysisCancelled, wait_until
+    from tools import search_cache, format_results
+    from retrieval import result_key
+    from prescore import prescore, is_clear_cut, PRESCORE_THRESHOLD
+    from parsing import parse_agent_output
+    from tracing import tracer
+    from history import utc_iso
+    import metrics
+
+# =============================================
+# TOPIC MONITORING - Scheduled, incremental re-analysis
+# =============================================
+#
+# Registered topics are polled on their own interval:
+#
+#   claim due monitor -> search -> drop results already seen for the topic
+#       -> no new items: reschedule, nothing else (no LLM call)
+#       -> new items:    analyze ONLY those -> store items + one series point
+#
+# Seen results are keyed on their normalized URL, so the steady-state cost
+# of a monitor is one search per poll plus analysis proportional to the
+# content that actually appeared. Polls skip the search cache: its TTL
+# (SENTI_SEARCH_CACHE_TTL) can be longer than the poll interval, and a
+# cached result set would never contain anything new. Like the job queue, monitors live in
+# SQLite and are claimed under a lease, so the API process and standalone
+# `python monitor.py` workers can share one database. The lease is tagged
+# with a random owner and renewed while the poll runs, for at most `timeout`
+# seconds; a poller that lost its lease records nothing.
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "monitor.db"
+
+# How new items are scored:
+#   llm   - one LexiconAgent task over the new items only (default)
+#   local - prescore's lexicon scorer, no LLM calls
+#   auto  - local when the scorer is confident, otherwise the LexiconAgent
+ENGINES = ("llm", "local", "auto")
+
+# Rolling aggregate window for GET /api/monitors/{id}
+DEFAULT_WINDOW = 7 * 24 * 3600
+
+MONITOR_DESCRIPTION = (
+    "Analyze the textual content of these newly published social media items "
+    "about {topic}. They have not been analyzed before; do not search for more "
+    "content and do not assume anything about earlier items.\n\n"
+    "{new_items}\n\n"
+    "Extract the primary emotional tone, key themes, language patterns, any "
+    "sarcasm or irony, and an overall text sentiment score (-10 to +10) for "
+    "these {noofarticles} items."
+)
+
+
+def extract_items(results: Any) -> List[Dict[str, str]]:
+    """
+    Search results as monitor items. Results without a link are keyed on
+    their text, so an unchanged snippet is still recognised next time.
+    """
+    if not isinstance(results, dict):
+        return []
+    items = {}
+    for result in results.get("organic", []):
+        key = result_key(result)
+        items.setdefault(key, {
+            "key": key,
+            "link": result.get("link", ""),
+            "title": result.get("title", ""),
+            "snippet": result.get("snippet", ""),
+        })
+    return list(items.values())
+
+
+def analyze_local(topic: str, items: List[Dict[str, str]]) -> Dict[str, Any]:
+    score = prescore({"organic": items})
+    return {
+        "engine": "local",
+        "sentiment_score": score["sentiment_score"],
+        "confidence": score["confidence"],
+        "key_findings": [],
+        "clear_cut": is_clear_cut(score, PRESCORE_THRESHOLD),
+    }
+
+
+def analyze_llm(topic: str, items: List[Dict[str, str]], cancel: CancelToken) -> Dict[str, Any]:
+    """One LexiconAgent task over the new items, without search tools"""
+    from crewai import Crew, Process
+
+    try:
+        from .agents import build_agent
+        from .tasks import build_task
+    except ImportError:
+        from agents import build_agent
+        from tasks import build_task
+
+    agent = build_agent("lexicon", tools=[])
+    task = build_task("lexicon", agent, tools=[], description=MONITOR_DESCRIPTION)
+    crew = Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=debug_enabled(),
+        memory=False,
+        step_callback=cancel.check,
+    )
+    output = crew.kickoff(inputs={
+        "topic": topic,
+        "noofarticles": str(len(items)),
+        "new_items": format_results({"organic": items}),
+    }).tasks_output[0]
+
+    if output.pydantic is not None:
+        report = output.pydantic.model_dump()
+    else:
+        report = parse_agent_output(output.raw, "LexiconAgent")
+    return {
+        "engine": "llm",
+        "sentiment_score": report.get("sentiment_score", 0.0),
+        "confidence": report.get("confidence", 0.0),
+        "key_findings": report.get("key_findings", []),
+    }
+
+
+def make_analyzer(engine: str) -> Callable[[str, List[Dict[str, str]], CancelToken], Dict[str, Any]]:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown monitor engine: {engine}")
+
+    def analyze(topic: str, items: List[Dict[str, str]], cancel: CancelToken) -> Dict[str, Any]:
+        if engine != "llm":
+            local = analyze_local(topic, items)
+            if engine == "local" or local.pop("clear_cut"):
+                return local
+        return analyze_llm(topic, items, cancel)
+
+    return analyze
+
+
+class TopicMonitor:
+    """SQLite-backed monitor schedule, seen-item store and sentiment series"""
+
+    def __init__(
+        self,
+        path: str = str(DEFAULT_DB_PATH),
+        analyze: Optional[Callable[..., Dict[str, Any]]] = None,
+        search: Optional[Callable[[str], Any]] = None,
+        lease: float = 600.0,
+        timeout: float = 180.0,
+        poll_interval: float = 5.0,
+    ):
+        self.path = str(path)
+        self.analyze = analyze or make_analyzer("llm")
+        self.search = search or (lambda topic: search_cache.search(topic, fresh=True))
+        self.lease = lease
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._stops: List[threading.Event] = []
+        self._running: Dict[str, CancelToken] = {}
+        self.lost_leases = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS monitors ("
+                "id TEXT PRIMARY KEY, topic TEXT NOT NULL, topic_key TEXT NOT NULL UNIQUE, "
+                "interval REAL NOT NULL, enabled INTEGER NOT NULL DEFAULT 1, "
+                "next_run_at REAL NOT NULL, lease_expires REAL, lease_owner TEXT, "
+                "last_run_at REAL, last_error TEXT, runs INTEGER NOT NULL DEFAULT 0, "
+                "items_seen INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(monitors)")}
+            if "lease_owner" not in columns:
+                conn.execute("ALTER TABLE monitors ADD COLUMN lease_owner TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS monitors_due ON monitors (enabled, next_run_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS monitor_items ("
+                "monitor_id TEXT NOT NULL, item_key TEXT NOT NULL, link TEXT, title TEXT, "
+                "snippet TEXT, first_seen REAL NOT NULL, last_seen REAL NOT NULL, "
+                "point_id INTEGER, PRIMARY KEY (monitor_id, item_key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS monitor_points ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, monitor_id TEXT NOT NULL, "
+                "ts REAL NOT NULL, new_items INTEGER NOT NULL, sentiment_score REAL NOT NULL, "
+                "confidence REAL NOT NULL, engine TEXT NOT NULL, key_findings TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS monitor_points_series ON monitor_points (monitor_id, ts)"
+            )
+
+    @classmethod
+    def from_env(cls) -> "TopicMonitor":
+        return cls(
+            path=os.environ.get("SENTI_MONITOR_DB", str(DEFAULT_DB_PATH)),
+            analyze=make_analyzer(os.environ.get("SENTI_MONITOR_ENGINE", "llm")),
+            lease=float(os.environ.get("SENTI_MONITOR_LEASE", "600")),
+            timeout=float(os.environ.get(
+                "SENTI_MONITOR_TIMEOUT", os.environ.get("SENTI_ANALYSIS_TIMEOUT", "180")
+            )),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---------------------------------------------
+    # Registration
+    # ---------------------------------------------
+
+    def add(self, topic: str, interval: float) -> Dict[str, Any]:
+        """Register a topic, or update the interval of an existing monitor"""
+        topic_key = search_cache.normalize(topic)
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO monitors (id, topic, topic_key, interval, next_run_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (topic_key) DO UPDATE SET "
+            "interval = excluded.interval, enabled = 1",
+            (uuid.uuid4().hex, topic, topic_key, interval, now, now),
+        )
+        row = conn.execute("SELECT * FROM monitors WHERE topic_key = ?", (topic_key,)).fetchone()
+        self._wakeup.set()
+        return self._describe(row)
+
+    def remove(self, monitor_id: str) -> bool:
+        """Delete a monitor with its seen items and series"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = conn.execute("DELETE FROM monitors WHERE id = ?", (monitor_id,)).rowcount
+            conn.execute("DELETE FROM monitor_items WHERE monitor_id = ?", (monitor_id,))
+            conn.execute("DELETE FROM monitor_points WHERE monitor_id = ?", (monitor_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            token = self._running.get(monitor_id)
+        if token is not None:
+            token.cancel()
+        return bool(deleted)
+
+    def trigger(self, monitor_id: str) -> bool:
+        """Make a monitor due now"""
+        updated = self._conn().execute(
+            "UPDATE monitors SET next_run_at = ? WHERE id = ?", (time.time(), monitor_id)
+        ).rowcount
+        self._wakeup.set()
+        return bool(updated)
+
+    def list(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT * FROM monitors ORDER BY created_at").fetchall()
+        return [self._describe(row) for row in rows]
+
+    def get(self, monitor_id: str, window: float = DEFAULT_WINDOW, limit: int = 500) -> Optional[Dict[str, Any]]:
+        """Monitor state with its time series and rolling aggregate over `window` seconds"""
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM monitors WHERE id = ?", (monitor_id,)).fetchone()
+        if row is None:
+            return None
+        since = time.time() - window
+        points = conn.execute(
+            "SELECT ts, new_items, sentiment_score, confidence, engine FROM monitor_points "
+            "WHERE monitor_id = ? AND ts >= ? ORDER BY ts DESC LIMIT ?",
+            (monitor_id, since, limit),
+        ).fetchall()
+        aggregate = conn.execute(
+            "SELECT SUM(new_items), SUM(sentiment_score * new_items), "
+            "SUM(confidence * new_items), COUNT(*) FROM monitor_points "
+            "WHERE monitor_id = ? AND ts >= ?",
+            (monitor_id, since),
+        ).fetchone()
+        items, score_sum, confidence_sum, polls = aggregate
+
+        monitor = self._describe(row)
+        monitor["rolling"] = {
+            "window_seconds": window,
+            "items": items or 0,
+            "points": polls,
+            # Item-weighted, so a poll with many new items counts for more
+            "sentiment_score": round(score_sum / items, 2) if items else None,
+            "confidence": round(confidence_sum / items, 1) if items else None,
+        }
+        monitor["series"] = [
+            {
+                "timestamp": utc_iso(p["ts"]),
+                "new_items": p["new_items"],
+                "sentiment_score": p["sentiment_score"],
+                "confidence": p["confidence"],
+                "engine": p["engine"],
+            }
+            for p in reversed(points)
+        ]
+        return monitor
+
+    @staticmethod
+    def _describe(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "monitor_id": row["id"],
+            "topic": row["topic"],
+            "interval_seconds": row["interval"],
+            "enabled": bool(row["enabled"]),
+            "runs": row["runs"],
+            "items_seen": row["items_seen"],
+            "last_run_at": row["last_run_at"],
+            "next_run_at": row["next_run_at"],
+            "last_error": row["last_error"],
+        }
+
+    # ---------------------------------------------
+    # Polling
+    # ---------------------------------------------
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """
+        Atomically take the most overdue monitor, including ones with lapsed
+        leases. Returns the claimed row with its new lease_owner.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM monitors WHERE enabled = 1 AND next_run_at <= ? "
+                "AND (lease_expires IS NULL OR lease_expires < ?) "
+                "ORDER BY next_run_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE monitors SET lease_expires = ?, lease_owner = ? WHERE id = ?",
+                    (now + self.lease, uuid.uuid4().hex, row["id"]),
+                )
+                row = conn.execute("SELECT * FROM monitors WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def poll(self, row: sqlite3.Row, cancel: Optional[CancelToken] = None) -> Dict[str, Any]:
+        """Search once, analyze only unseen items and record a series point"""
+        cancel = cancel or CancelToken()
+        monitor_id, owner, topic = row["id"], row["lease_owner"], row["topic"]
+        summary = {"monitor_id": monitor_id, "topic": topic, "new_items": 0, "seen_items": 0}
+
+        with tracer.span("monitor.poll", topic=topic) as span:
+            items = extract_items(self.search(topic))
+            keys = [item["key"] for item in items]
+            conn = self._conn()
+            seen = {
+                r[0] for r in conn.execute(
+                    f"SELECT item_key FROM monitor_items WHERE monitor_id = ? "
+                    f"AND item_key IN ({','.join('?' * len(keys))})",
+                    (monitor_id, *keys),
+                )
+            } if keys else set()
+            new = [item for item in items if item["key"] not in seen]
+            summary.update(new_items=len(new), seen_items=len(seen))
+            metrics.MONITOR_ITEMS.inc("new", amount=len(new))
+            metrics.MONITOR_ITEMS.inc("seen", amount=len(seen))
+            if span is not None:
+                span.set(new_items=len(new), seen_items=len(seen))
+
+            analysis = None
+            if new:
+                cancel.check()
+                started = time.perf_counter()
+                with tracer.span("monitor.analyze", items=len(new)):
+                    analysis = self.analyze(topic, new, cancel)
+                metrics.STAGE_SECONDS.observe(time.perf_counter() - started, "monitor")
+                summary.update(analysis)
+
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # remove() may have run while the search or analysis was in
+            # flight; record nothing for a monitor that no longer exists
+            current = conn.execute("SELECT lease_owner FROM monitors WHERE id = ?", (monitor_id,)).fetchone()
+            if current is None:
+                conn.execute("COMMIT")
+                metrics.MONITOR_POLLS.inc("removed")
+                return dict(summary, removed=True)
+            # Or the lease lapsed and another poller took the monitor over;
+            # its poll records these items, not this one
+            if current["lease_owner"] != owner:
+                conn.execute("COMMIT")
+                with self._lock:
+                    self.lost_leases += 1
+                metrics.MONITOR_POLLS.inc("lost_lease")
+                return dict(summary, lost_lease=True)
+
+            point_id = None
+            if analysis is not None:
+                point_id = conn.execute(
+                    "INSERT INTO monitor_points (monitor_id, ts, new_items, sentiment_score, "
+                    "confidence, engine, key_findings) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (monitor_id, now, len(new), float(analysis["sentiment_score"]),
+                     float(analysis["confidence"]), analysis["engine"],
+                     "\n".join(analysis.get("key_findings") or [])),
+                ).lastrowid
+            conn.executemany(
+                "INSERT INTO monitor_items (monitor_id, item_key, link, title, snippet, "
+                "first_seen, last_seen, point_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (monitor_id, item_key) DO UPDATE SET last_seen = excluded.last_seen",
+                [
+                    (monitor_id, item["key"], item["link"], item["title"], item["snippet"],
+                     now, now, point_id)
+                    for item in items
+                ],
+            )
+            conn.execute(
+                "UPDATE monitors SET runs = runs + 1, items_seen = items_seen + ?, "
+                "last_run_at = ?, next_run_at = ? + interval, lease_expires = NULL, "
+                "lease_owner = NULL, last_error = NULL WHERE id = ?",
+                (len(new), now, now, monitor_id),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        metrics.MONITOR_POLLS.inc("analyzed" if new else "unchanged")
+        return summary
+
+    def _failed(self, monitor_id: str, owner: str, error: str):
+        # Try again at the next regular interval rather than hammering the APIs
+        now = time.time()
+        self._conn().execute(
+            "UPDATE monitors SET runs = runs + 1, last_run_at = ?, next_run_at = ? + interval, "
+            "lease_expires = NULL, lease_owner = NULL, last_error = ? "
+            "WHERE id = ? AND lease_owner = ?",
+            (now, now, error, monitor_id, owner),
+        )
+        metrics.MONITOR_POLLS.inc("error")
+
+    def _release(self, monitor_id: str, owner: str):
+        # Shutdown interrupted the poll; leave it due
+        self._conn().execute(
+            "UPDATE monitors SET lease_expires = NULL, lease_owner = NULL "
+            "WHERE id = ? AND lease_owner = ?",
+            (monitor_id, owner),
+        )
+
+    def _keep_lease(self, monitor_id: str, owner: str, token: CancelToken, timed_out: threading.Event,
+                    done: threading.Event):
+        """
+        Renew the lease of a running poll until it is done. Past `timeout`
+        the poll is cancelled; if it ignores that, the lease lapses and
+        another poller takes the monitor over.
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout > 0 else None
+        interval = self.lease / 3
+        while True:
+            wait = interval if deadline is None else min(interval, max(deadline - time.monotonic(), 0))
+            if done.wait(wait):
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out.set()
+                token.cancel()
+                return
+            try:
+                renewed = self._conn().execute(
+                    "UPDATE monitors SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+                    (time.time() + self.lease, monitor_id, owner),
+                ).rowcount
+            except sqlite3.OperationalError:
+                # Database busy; the lease still has two thirds left
+                continue
+            if not renewed:
+                # Removed, or another poller took the monitor over
+                token.cancel()
+                return
+
+    def run_one(self) -> bool:
+        """Claim and poll a single due monitor; returns False when none was due"""
+        row = self.claim()
+        if row is None:
+            return False
+
+        monitor_id, owner = row["id"], row["lease_owner"]
+        token = CancelToken()
+        timed_out, done = threading.Event(), threading.Event()
+        with self._lock:
+            self._running[monitor_id] = token
+        threading.Thread(
+            target=self._keep_lease,
+            args=(monitor_id, owner, token, timed_out, done),
+            name=f"senti-monitor-lease-{monitor_id[:8]}",
+            daemon=True,
+        ).start()
+
+        try:
+            self.poll(row, token)
+        except AnalysisCancelled:
+            if timed_out.is_set():
+                self._failed(monitor_id, owner, f"Poll exceeded {self.timeout:g}s time limit")
+            else:
+                self._release(monitor_id, owner)
+        except Exception as e:
+            metrics.ERRORS.inc("monitor", type(e).__name__)
+            self._failed(monitor_id, owner, str(e))
+        finally:
+            done.set()
+            with self._lock:
+                self._running.pop(monitor_id, None)
+        return True
+
+    def _work(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                if self.run_one():
+                    continue
+            except sqlite3.OperationalError:
+                # Database busy under heavy contention; back off and retry
+                pass
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def scale(self, workers: int):
+        """Grow or shrink the local poller pool to `workers` threads"""
+        with self._lock:
+            while len(self._workers) < workers:
+                stop = threading.Event()
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stop,),
+                    name=f"senti-monitor-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(thread)
+                self._stops.append(stop)
+                thread.start()
+            while len(self._workers) > workers:
+                self._workers.pop()
+                self._stops.pop().set()
+        self._wakeup.set()
+
+    def drain(self, timeout: float) -> bool:
+        """Stop claiming monitors; False if a poll is still running after `timeout`"""
+        self.scale(0)
+        return wait_until(self._idle, timeout)
+
+    def _idle(self) -> bool:
+        with self._lock:
+            return not self._running
+
+    def stop(self, cancel_running: bool = True):
+        """Stop all local pollers; running polls are cancelled and left due"""
+        self.scale(0)
+        if cancel_running:
+            with self._lock:
+                tokens = list(self._running.values())
+            for token in tokens:
+                token.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        monitors, enabled, due = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(enabled), 0), "
+            "COALESCE(SUM(enabled = 1 AND next_run_at <= ?), 0) FROM monitors",
+            (time.time(),),
+        ).fetchone()
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "polling_here": len(self._running),
+                "monitors": monitors,
+                "enabled": enabled,
+                "due": due,
+                "items": conn.execute("SELECT COUNT(*) FROM monitor_items").fetchone()[0],
+                "lost_leases": self.lost_leases,
+            }
+
+
+def main():
+    """Run monitor pollers without the API server"""
+    parser = argparse.ArgumentParser(description="Senti-Core topic monitor")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SENTI_MONITOR_WORKERS", "1")),
+        help="Number of poller threads",
+    )
+    args = parser.parse_args()
+
+    monitor = TopicMonitor.from_env()
+    monitor.scale(args.workers)
+    print(f"Senti-Core monitor started with {args.workers} pollers on {monitor.path}")
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    stopped.wait()
+    monitor.drain(float(os.environ.get("SENTI_DRAIN_SECONDS", "30")))
+    monitor.stop()
+
+
+if __name__ == "__main__":
+    main()
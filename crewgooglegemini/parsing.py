@@ -0,0 +1,190 @@
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# =============================================
+# AGENT OUTPUT PARSING - Compiled, single-pass extraction
+# =============================================
+#
+# Agents are asked for JSON, so the fast path decodes the first JSON object in
+# the output and reads the fields directly. Free-text outputs fall back to
+# precompiled, case-sensitive patterns over one lowercased copy of the text
+# (much faster than re.IGNORECASE): scores and confidence come from a single
+# scan, and findings stop after MAX_FINDINGS matches.
+
+_decoder = json.JSONDecoder()
+
+# Score and confidence labels in one alternation; group 1 is the label
+FIELD_PATTERN = re.compile(
+    r"(sentiment[_\s]*score|score|rating|confidence)[\"']?[:\s]+[\"']?(-?\d+(?:\.\d+)?)"
+)
+SCORE_PRIORITY = {"score": 1, "rating": 2}  # "sentiment score" is 0
+
+POSITIVE_WORDS = ("positive", "good", "excellent", "great", "optimistic")
+NEGATIVE_WORDS = ("negative", "bad", "poor", "pessimistic", "concerning")
+POLARITY_PATTERN = re.compile("|".join(POSITIVE_WORDS + NEGATIVE_WORDS))
+
+# Bullet or numbered line; group 1 is the finding text without its marker
+FINDING_PATTERN = re.compile(
+    r"^[ \t]*(?:[-•*→]|\d\.|\d[^\n]\.)[-•*→\d.) \t]*(.*?)[ \t]*$", re.MULTILINE
+)
+
+JSON_SCORE_KEYS = ("sentiment_score", "final_sentiment_score", "overall_score", "score")
+JSON_FINDING_KEYS = ("key_findings", "key_observations", "findings")
+
+MAX_FINDINGS = 5
+MAX_JSON_STARTS = 20  # '{' positions to try before giving up on JSON
+
+
+def extract_json_from_text(text: str) -> Dict[str, Any]:
+    """
+    Attempt to extract structured JSON data from agent output.
+    If not found, create structured data from text.
+    """
+    data = find_json_object(text)
+    if data is not None:
+        return data
+
+    # Fallback: create structured data from text
+    return {
+        "raw_analysis": text,
+        "extracted": True,
+        "format": "text"
+    }
+
+
+def _strip_code_fence(text: str) -> str:
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        newline = stripped.find("\n")
+        stripped = stripped[newline + 1:] if newline != -1 else ""
+        if stripped.endswith("```"):
+            stripped = stripped[:-3]
+        stripped = stripped.strip()
+    return stripped
+
+
+def find_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first decodable JSON object in text, or None.
+    raw_decode parses from a start offset and ignores trailing text, so this
+    is linear in the object size with no regex backtracking.
+    """
+    stripped = _strip_code_fence(text)
+    if stripped.startswith("{"):
+        try:
+            data = json.loads(stripped)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+
+    start = text.find("{")
+    attempts = 0
+    while start != -1 and attempts < MAX_JSON_STARTS:
+        try:
+            data, _ = _decoder.raw_decode(text, start)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+        attempts += 1
+        start = text.find("{", start + 1)
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_findings(data: Dict[str, Any]) -> List[str]:
+    for source in [data] + [v for v in data.values() if isinstance(v, dict)]:
+        for key in JSON_FINDING_KEYS:
+            value = source.get(key)
+            if isinstance(value, list):
+                return [str(item) for item in value if str(item).strip()][:MAX_FINDINGS]
+    return []
+
+
+def _text_fields(lowered: str) -> Tuple[float, Optional[float]]:
+    """Score and confidence from one scan over the lowercased output"""
+    best = None
+    confidence = None
+    for match in FIELD_PATTERN.finditer(lowered):
+        label, value = match.groups()
+        if label == "confidence":
+            if confidence is None and not value.startswith("-"):
+                confidence = float(value)
+        else:
+            priority = 0 if label.startswith("sentiment") else SCORE_PRIORITY[label]
+            if best is None or priority < best[0]:
+                best = (priority, float(value))
+        if confidence is not None and best is not None and best[0] == 0:
+            break
+    if best is not None:
+        return best[1], confidence
+
+    # Fallback sentiment detection: which polarity words appear at all
+    seen = set(POLARITY_PATTERN.findall(lowered))
+    pos_count = sum(word in seen for word in POSITIVE_WORDS)
+    neg_count = sum(word in seen for word in NEGATIVE_WORDS)
+    if pos_count > neg_count:
+        return 5.0, confidence
+    if neg_count > pos_count:
+        return -5.0, confidence
+    return 0.0, confidence
+
+
+def _text_findings(output: str) -> List[str]:
+    findings = []
+    for match in FINDING_PATTERN.finditer(output):
+        finding = match.group(1)
+        if len(finding) > 10:
+            findings.append(finding)
+            if len(findings) == MAX_FINDINGS:
+                break
+    return findings
+
+
+def parse_agent_output(output: str, agent_name: str) -> Dict[str, Any]:
+    """
+    Parse agent output into structured format.
+    Extracts sentiment scores, key findings, and confidence levels.
+    """
+    result = {
+        "agent_name": agent_name,
+        "timestamp": datetime.now().isoformat(),
+        "raw_output": output,
+    }
+
+    data = find_json_object(output) if "{" in output else None
+    score = confidence = None
+    findings: List[str] = []
+
+    if data is not None:
+        score = next(
+            (n for n in (_number(data.get(k)) for k in JSON_SCORE_KEYS) if n is not None),
+            None,
+        )
+        confidence = _number(data.get("confidence"))
+        findings = _json_findings(data)
+
+    if score is None or confidence is None:
+        text_score, text_confidence = _text_fields(output.lower())
+        if score is None:
+            score = text_score
+        if confidence is None:
+            confidence = text_confidence
+    if confidence is None:
+        confidence = 75.0  # Default confidence
+    if not findings:
+        findings = _text_findings(output)
+
+    result["sentiment_score"] = score
+    result["confidence"] = confidence
+    result["key_findings"] = findings or ["Analysis completed"]
+    return result
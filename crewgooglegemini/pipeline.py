@@ -0,0 +1,338 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Handle both relative and absolute imports
+try:
+    from .config import debug_enabled
+    from .executor import CancelToken
+    from .tools import search_cache, format_results
+    from .retrieval import retrieve
+    from .compaction import FUSION_CONTEXT, FUSION_CONTEXT_MODES, upstream_summary
+    from .parsing import parse_agent_output
+    from .http_client import get_http_client
+    from .tracing import tracer, run_in_context
+    from . import metrics
+except ImportError:
+    from config import debug_enabled
+    from executor import CancelToken
+    from tools import search_cache, format_results
+    from retrieval import retrieve
+    from compaction import FUSION_CONTEXT, FUSION_CONTEXT_MODES, upstream_summary
+    from parsing import parse_agent_output
+    from http_client import get_http_client
+    from tracing import tracer, run_in_context
+    import metrics
+
+# =============================================
+# ANALYSIS PIPELINE - Stage graph execution
+# =============================================
+#
+#             ┌──> lexicon ──┐
+#   search ───┤              ├──> fusion
+#             └──> vision  ──┘
+#
+# Lexicon and vision do not depend on each other, so in "dag" mode they run
+# concurrently and fusion starts once both are done. "sequential" mode runs
+# the same stages one after another, matching the original crew behaviour.
+
+PROCESS_MODES = ("dag", "sequential")
+DEFAULT_MODE = os.environ.get("SENTI_PROCESS_MODE", "dag")
+# Gemini calls are rate limited process-wide by ratelimit.llm_limiter, so
+# stage crews get no per-crew limit unless a caller asks for one
+DEFAULT_MAX_RPM = None
+
+# Lexicon/vision reports below this confidence (0-100) are redone once on
+# SENTI_ESCALATION_MODEL before fusion reads them; 0 disables escalation
+ESCALATE_BELOW = float(os.environ.get("SENTI_ESCALATE_BELOW", "0"))
+ESCALATION_MODEL = os.environ.get("SENTI_ESCALATION_MODEL", "gemini/gemini-2.5-pro")
+ESCALATION_STAGES = ("lexicon", "vision")
+
+
+
+# =============================================
+# LAZY CREW LOADING - Keep crewai off the import path
+# =============================================
+#
+# crewai, litellm and the agent graph take seconds to import, so the API
+# process starts without them. warm_up() loads them in the background right
+# after startup; otherwise the first analysis pays the cost.
+
+class WarmupState:
+    """Progress of the one-time crew import and LLM construction"""
+
+    def __init__(self):
+        self.status = "pending"  # pending -> warming -> ready | failed
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": self.status, "seconds": self.seconds, "error": self.error}
+
+
+warmup_state = WarmupState()
+_crew_api_cache: Optional[Tuple[Any, Any, Callable, Callable]] = None
+
+
+def _crew_api() -> Tuple[Any, Any, Callable, Callable]:
+    """Import CrewAI and the agent/task factories on first use"""
+    global _crew_api_cache
+    if _crew_api_cache is None:
+        from crewai import Crew, Process
+
+        try:
+            from .agents import build_agents
+            from .tasks import build_tasks
+        except ImportError:
+            from agents import build_agents
+            from tasks import build_tasks
+        _crew_api_cache = (Crew, Process, build_agents, build_tasks)
+    return _crew_api_cache
+
+
+def warm_up() -> WarmupState:
+    """
+    Import the crew stack and build the shared LLM and search tool once.
+    Safe to call from several threads; later calls return immediately.
+    """
+    with warmup_state._lock:
+        if warmup_state.status in ("ready", "warming"):
+            return warmup_state
+        warmup_state.status = "warming"
+        warmup_state.error = None
+
+    started = time.perf_counter()
+    try:
+        _crew_api()
+        try:
+            from .agents import AGENT_TEMPLATES, llm_for
+        except ImportError:
+            from agents import AGENT_TEMPLATES, llm_for
+        get_http_client()
+        for name in AGENT_TEMPLATES:
+            llm_for(name)
+        search_cache.search_tool
+    except Exception as e:
+        warmup_state.status = "failed"
+        warmup_state.error = str(e)
+    else:
+        warmup_state.status = "ready"
+    warmup_state.seconds = round(time.perf_counter() - started, 3)
+    return warmup_state
+
+
+def start_warm_up() -> threading.Thread:
+    """Run warm_up() on a daemon thread so startup is not blocked"""
+    thread = threading.Thread(target=warm_up, name="senti-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# Called as on_stage(stage_name, raw_output, report) from the worker thread as
+# soon as a stage finishes. report is the validated output_pydantic dump, or
+# None when the agent's answer did not validate; "search" reports the
+# pre-fetched results text with no report.
+StageCallback = Callable[[str, str, Optional[Dict[str, Any]]], None]
+
+
+class PipelineResult:
+    """In-memory outputs and wall-clock timings of one pipeline run"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.outputs: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.escalated: List[str] = []
+        self.fusion_context_chars: Optional[int] = None
+
+    def raw(self, stage: str) -> str:
+        output = self.outputs.get(stage)
+        return output.raw if output is not None else ""
+
+    def report(self, stage: str) -> Optional[Dict[str, Any]]:
+        """The stage's validated report (schemas.REPORT_MODELS), if any"""
+        output = self.outputs.get(stage)
+        if output is None or output.pydantic is None:
+            return None
+        return output.pydantic.model_dump()
+
+    def timing_report(self) -> Dict[str, Any]:
+        """Per-stage seconds plus the critical path of the stage graph"""
+        report = {name: round(seconds, 3) for name, seconds in self.timings.items()}
+        search = self.timings.get("search", 0.0)
+        upstream = [self.timings.get("lexicon", 0.0), self.timings.get("vision", 0.0)]
+        fusion = self.timings.get("fusion", 0.0)
+        if self.mode == "dag":
+            report["critical_path"] = round(search + max(upstream) + fusion, 3)
+        else:
+            report["critical_path"] = round(search + sum(upstream) + fusion, 3)
+        report["mode"] = self.mode
+        if self.escalated:
+            report["escalated"] = sorted(self.escalated)
+        if self.fusion_context_chars is not None:
+            report["fusion_context_chars"] = self.fusion_context_chars
+        return report
+
+
+def _kickoff(stage: str, agent, task, inputs: Dict[str, str], cancel: CancelToken, max_rpm: Optional[int]):
+    """Run one task as its own one-agent crew and return its task output"""
+    Crew, Process = _crew_api()[:2]
+    crew = Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=debug_enabled(),  # SENTI_DEBUG=1 prints crew progress
+        max_rpm=max_rpm,  # Optional extra per-crew limit
+        memory=False,  # Disable memory for faster execution
+        step_callback=cancel.check,  # Stop between agent steps once cancelled
+    )
+    with tracer.span("crew.kickoff", stage=stage, model=getattr(agent.llm, "model", None)):
+        return crew.kickoff(inputs=inputs).tasks_output[0]
+
+
+def _needs_escalation(stage: str, agent, output) -> bool:
+    if not ESCALATE_BELOW or stage not in ESCALATION_STAGES or output.pydantic is None:
+        return False
+    if getattr(agent.llm, "model", None) == ESCALATION_MODEL:
+        return False
+    return output.pydantic.confidence < ESCALATE_BELOW
+
+
+def _run_stage(
+    stage: str,
+    agents: Dict[str, Any],
+    tasks: Dict[str, Any],
+    inputs: Dict[str, str],
+    result: PipelineResult,
+    cancel: CancelToken,
+    on_stage: Optional[StageCallback],
+    max_rpm: Optional[int],
+):
+    """
+    Run a single task as its own one-agent crew and record its timing.
+    A low-confidence lexicon or vision report is redone once on the
+    escalation model, and the new task replaces the old one for fusion.
+    """
+    cancel.check()
+
+    with tracer.span("task", stage=stage, agent=agents[stage].role):
+        started = time.perf_counter()
+        output = _kickoff(stage, agents[stage], tasks[stage], inputs, cancel, max_rpm)
+
+        if _needs_escalation(stage, agents[stage], output):
+            try:
+                from .agents import build_agent, get_llm
+                from .tasks import build_task
+            except ImportError:
+                from agents import build_agent, get_llm
+                from tasks import build_task
+
+            cancel.check()
+            metrics.LLM_ESCALATIONS.inc(stage)
+            prefetched = "search_results" in inputs
+            agents[stage] = build_agent(stage, llm=get_llm(ESCALATION_MODEL), **({"tools": []} if prefetched else {}))
+            tasks[stage] = build_task(stage, agents[stage], prefetched=prefetched)
+            output = _kickoff(stage, agents[stage], tasks[stage], inputs, cancel, max_rpm)
+            result.escalated.append(stage)
+
+        result.timings[stage] = time.perf_counter() - started
+        metrics.STAGE_SECONDS.observe(result.timings[stage], stage)
+        result.outputs[stage] = output
+    if on_stage:
+        on_stage(stage, result.raw(stage), result.report(stage))
+
+
+def run_pipeline(
+    topic: str,
+    noofarticles: int,
+    mode: Optional[str] = None,
+    cancel: Optional[CancelToken] = None,
+    on_stage: Optional[StageCallback] = None,
+    max_rpm: Optional[int] = DEFAULT_MAX_RPM,
+    fusion_context: Optional[str] = None,
+    platforms: Optional[List[str]] = None,
+) -> PipelineResult:
+    """
+    Execute lexicon, vision and fusion for one topic.
+    Content is retrieved once per platform up front (retrieval.py) and the
+    agents analyze that corpus without searching. Fusion reads a compacted
+    summary of the upstream reports ("compact") or their full outputs
+    through its task context ("full").
+    """
+    mode = mode or DEFAULT_MODE
+    if mode not in PROCESS_MODES:
+        raise ValueError(f"Unknown process mode: {mode}")
+    fusion_context = fusion_context or FUSION_CONTEXT
+    if fusion_context not in FUSION_CONTEXT_MODES:
+        raise ValueError(f"Unknown fusion context mode: {fusion_context}")
+    cancel = cancel or CancelToken()
+
+    result = PipelineResult(mode)
+    started = time.perf_counter()
+    inputs = {
+        'topic': topic,
+        'noofarticles': str(noofarticles),
+        'platforms': ", ".join(platforms) if platforms else "the web",
+    }
+
+    # Fetch the corpus once (one concurrent search per platform) and hand it
+    # to every agent. If every search fails here the agents fall back to
+    # searching on their own.
+    try:
+        with tracer.span("search", query=topic):
+            inputs['search_results'] = format_results(retrieve(topic, noofarticles, platforms))
+        result.timings["search"] = time.perf_counter() - started
+        metrics.STAGE_SECONDS.observe(result.timings["search"], "search")
+    except Exception:
+        pass
+    else:
+        if on_stage:
+            on_stage("search", inputs['search_results'], None)
+
+    _, _, build_agents, build_tasks = _crew_api()
+    prefetched = 'search_results' in inputs
+    agents = build_agents(tools=[]) if prefetched else build_agents()
+    tasks = build_tasks(agents, prefetched=prefetched, compact=fusion_context == "compact")
+
+    if mode == "dag":
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="senti-stage") as pool:
+            upstream = [
+                pool.submit(
+                    # Copy the context so stage spans nest under the analysis
+                    run_in_context(_run_stage),
+                    stage, agents, tasks, inputs, result, cancel, on_stage, max_rpm,
+                )
+                for stage in ("lexicon", "vision")
+            ]
+            try:
+                for future in upstream:
+                    future.result()
+            except Exception:
+                # Stop the sibling stage instead of waiting for it to finish
+                cancel.cancel()
+                raise
+    else:
+        for stage in ("lexicon", "vision"):
+            _run_stage(stage, agents, tasks, inputs, result, cancel, on_stage, max_rpm)
+
+    if fusion_context == "compact":
+        with tracer.span("compaction"):
+            inputs['upstream_summary'] = upstream_summary({
+                stage: result.report(stage) or parse_agent_output(result.raw(stage), stage)
+                for stage in ("lexicon", "vision")
+            })
+        result.fusion_context_chars = len(inputs['upstream_summary'])
+    else:
+        # Upstream tasks may have been replaced by escalated ones
+        tasks["fusion"].context = [tasks["lexicon"], tasks["vision"]]
+        result.fusion_context_chars = len(result.raw("lexicon")) + len(result.raw("vision"))
+    _run_stage("fusion", agents, tasks, inputs, result, cancel, on_stage, max_rpm)
+    result.timings["total"] = time.perf_counter() - started
+    return result
@@ -0,0 +1,189 @@
+import os
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+# =============================================
+# LOCAL PRE-SCORING - Lexicon scorer that can skip the LLM crew
+# =============================================
+#
+# A small VADER-style scorer that runs over the Serper snippets with no
+# network calls. All snippets are tokenized once and scored together with
+# NumPy. When the snippets agree strongly (and show no sarcasm markers) the
+# result is returned as a full SentiCoreResponse payload; otherwise the
+# caller falls back to the LLM agents.
+
+# Word valences on VADER's -4..+4 scale
+LEXICON = {
+    # positive
+    "amazing": 2.8, "awesome": 3.1, "beautiful": 2.9, "best": 3.2, "better": 1.9,
+    "brilliant": 2.8, "celebrate": 2.7, "love": 3.2, "loved": 2.9, "loves": 2.7,
+    "excellent": 2.7, "excited": 2.2, "exciting": 2.2, "fantastic": 2.6, "fun": 2.3,
+    "good": 1.9, "great": 3.1, "happy": 2.7, "helpful": 1.8, "impressive": 2.3,
+    "improved": 1.9, "incredible": 2.4, "innovative": 1.9, "inspiring": 2.2,
+    "like": 1.5, "nice": 1.8, "perfect": 2.7, "positive": 2.6, "praise": 2.6,
+    "recommend": 1.5, "reliable": 1.9, "success": 2.7, "successful": 2.8,
+    "support": 1.7, "thrilled": 2.6, "win": 2.8, "wins": 2.7, "wonderful": 2.7,
+    "worth": 0.9, "optimistic": 2.0, "strong": 1.7, "smooth": 1.3, "fast": 1.0,
+    "gorgeous": 3.0, "stunning": 2.6, "favorite": 2.0, "glad": 2.0, "hopeful": 1.9,
+    "joy": 2.8, "proud": 2.1, "upgrade": 1.1, "solid": 1.3, "winner": 2.8,
+    # negative
+    "awful": -2.0, "bad": -2.5, "boring": -1.3, "broken": -2.1, "bug": -1.4,
+    "bugs": -1.4, "concern": -1.3, "concerning": -1.4, "concerns": -1.2,
+    "crash": -1.7, "crashes": -1.7, "disappointed": -1.9, "disappointing": -2.2,
+    "disaster": -3.1, "expensive": -0.9, "fail": -2.5, "failed": -2.3,
+    "failure": -2.3, "hate": -2.7, "hated": -3.2, "horrible": -2.5, "issue": -1.0,
+    "issues": -1.1, "lawsuit": -2.0, "negative": -2.7, "overpriced": -1.8,
+    "pessimistic": -1.9, "poor": -2.1, "problem": -1.7, "problems": -1.7,
+    "recall": -1.5, "sad": -2.1, "scam": -2.9, "slow": -1.2, "terrible": -2.1,
+    "ugly": -2.3, "useless": -1.8, "worse": -2.1, "worst": -3.1, "angry": -2.3,
+    "backlash": -2.0, "criticism": -1.9, "criticized": -1.9, "decline": -1.4,
+    "dead": -3.3, "fear": -2.2, "lonely": -1.5, "loss": -1.3, "outrage": -2.7,
+    "controversy": -1.6, "delay": -1.3, "delayed": -1.3, "struggle": -1.7,
+}
+
+NEGATIONS = {
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor",
+    "cannot", "cant", "can't", "dont", "don't", "doesnt", "doesn't", "didnt",
+    "didn't", "isnt", "isn't", "wasnt", "wasn't", "wont", "won't", "without",
+    "hardly", "barely",
+}
+
+BOOSTERS = {
+    "very": 0.293, "really": 0.293, "extremely": 0.293, "so": 0.293,
+    "incredibly": 0.293, "absolutely": 0.293, "totally": 0.293, "super": 0.293,
+    "slightly": -0.293, "somewhat": -0.293, "kinda": -0.293, "barely": -0.293,
+}
+
+# Phrases and emoji that often signal sarcasm; any hit routes to the LLM
+SARCASM_MARKERS = re.compile(
+    r"yeah right|sure,? because|oh great|thanks a lot|just what i needed|"
+    r"what could go wrong|/s\b|🙄|😒|🤡|\bsarcas",
+    re.IGNORECASE,
+)
+
+# Items with sentiment words needed for full confidence; fewer scale it down,
+# so one emphatic snippet can never skip the LLM on its own
+MIN_EVIDENCE_ITEMS = int(os.environ.get("SENTI_PRESCORE_MIN_ITEMS", "3"))
+
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+NORMALIZE_ALPHA = 15.0
+TOKEN_PATTERN = re.compile(r"[a-z']+")
+
+# Vocabulary arrays built once at import time
+_VOCAB = {word: i + 1 for i, word in enumerate(LEXICON)}  # 0 = not in lexicon
+_VALENCE = np.zeros(len(_VOCAB) + 1)
+for _word, _index in _VOCAB.items():
+    _VALENCE[_index] = LEXICON[_word]
+
+
+def score_texts(texts: List[str]) -> Dict[str, Any]:
+    """
+    Score many texts in one vectorized pass.
+    Returns per-text compound scores in [-1, 1] and how many sentiment words
+    each text contained.
+    """
+    if not texts:
+        return {"compound": np.zeros(0), "hits": np.zeros(0, dtype=int)}
+
+    tokens: List[str] = []
+    lengths = []
+    for text in texts:
+        words = TOKEN_PATTERN.findall(text.lower())
+        tokens.extend(words)
+        lengths.append(len(words))
+    lengths = np.asarray(lengths)
+
+    ids = np.fromiter((_VOCAB.get(t, 0) for t in tokens), dtype=np.int64, count=len(tokens))
+    is_negation = np.fromiter((t in NEGATIONS for t in tokens), dtype=bool, count=len(tokens))
+    boost = np.fromiter((BOOSTERS.get(t, 0.0) for t in tokens), dtype=float, count=len(tokens))
+
+    # Document id of every token; windows must not cross document boundaries
+    doc_ids = np.repeat(np.arange(len(texts)), lengths)
+    valence = _VALENCE[ids]
+
+    # Boosters strengthen the next word in its own direction
+    if len(tokens) > 1:
+        prev_boost = np.concatenate(([0.0], boost[:-1]))
+        prev_same_doc = np.concatenate(([False], doc_ids[1:] == doc_ids[:-1]))
+        valence = valence + np.sign(valence) * prev_boost * prev_same_doc
+
+    # A negation in the preceding NEGATION_WINDOW tokens flips and dampens
+    negated = np.zeros(len(tokens), dtype=bool)
+    for shift in range(1, NEGATION_WINDOW + 1):
+        if shift >= len(tokens):
+            break
+        hit = is_negation[:-shift] & (doc_ids[shift:] == doc_ids[:-shift])
+        negated[shift:] |= hit
+    valence = np.where(negated, valence * NEGATION_SCALAR, valence)
+
+    sums = np.bincount(doc_ids, weights=valence, minlength=len(texts))
+    hits = np.bincount(doc_ids, weights=(ids > 0), minlength=len(texts)).astype(int)
+    compound = sums / np.sqrt(sums * sums + NORMALIZE_ALPHA)
+    return {"compound": compound, "hits": hits}
+
+
+def extract_snippets(results: Any) -> List[Dict[str, str]]:
+    """Pull title/snippet/link triples out of a Serper response"""
+    if not isinstance(results, dict):
+        return []
+    return [
+        {
+            "text": f"{item.get('title', '')}. {item.get('snippet', '')}",
+            "link": item.get("link", ""),
+        }
+        for item in results.get("organic", [])
+    ]
+
+
+def prescore(results: Any) -> Dict[str, Any]:
+    """
+    Score search results locally and decide whether the LLM is needed.
+    Confidence (0-100) rewards snippet agreement, signal strength, lexicon
+    coverage and the number of items that carried any sentiment words.
+    """
+    snippets = extract_snippets(results)
+    texts = [s["text"] for s in snippets]
+    scored = score_texts(texts)
+    compound, hits = scored["compound"], scored["hits"]
+
+    sarcasm = any(SARCASM_MARKERS.search(text) for text in texts)
+    covered = hits > 0
+    if not covered.any():
+        return {
+            "sentiment_score": 0.0,
+            "confidence": 0.0,
+            "sarcasm_flagged": sarcasm,
+            "items": len(texts),
+            "per_item": [],
+        }
+
+    mean = float(compound[covered].mean())
+    signs = np.sign(compound[covered])
+    agreement = float((signs == np.sign(mean)).mean()) if mean else 0.0
+    strength = min(1.0, abs(mean) / 0.6)
+    coverage = float(covered.mean())
+    evidence = min(1.0, int(covered.sum()) / max(MIN_EVIDENCE_ITEMS, 1))
+    confidence = 100.0 * agreement * strength * (0.5 + 0.5 * coverage) * evidence
+
+    return {
+        "sentiment_score": round(mean * 10, 2),
+        "confidence": round(confidence, 1),
+        "sarcasm_flagged": sarcasm,
+        "items": len(texts),
+        "per_item": [
+            {"link": s["link"], "score": round(float(c) * 10, 2), "sentiment_words": int(h)}
+            for s, c, h in zip(snippets, compound, hits)
+        ],
+    }
+
+
+def is_clear_cut(score: Dict[str, Any], threshold: float) -> bool:
+    """True when the local score is confident enough to skip the LLM agents"""
+    return not score["sarcasm_flagged"] and score["confidence"] >= threshold
+
+
+PRESCORE_ENABLED = os.environ.get("SENTI_PRESCORE", "0").lower() in ("1", "true", "yes")
+PRESCORE_THRESHOLD = float(os.environ.get("SENTI_PRESCORE_THRESHOLD", "80"))
@@ -0,0 +1,243 @@
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# =============================================
+# RATE LIMITING - Global token buckets for LLM and search calls
+# =============================================
+#
+# One limiter per upstream API is shared by every crew in the process, and
+# optionally by every process on the machine through an SQLite file:
+#
+#   requests bucket: refills `rpm` requests per minute
+#   tokens bucket:   refills `tpm` tokens per minute (0 disables it)
+#
+# Waiters are served strictly in arrival order, so one busy analysis cannot
+# starve the others.
+
+
+class _LocalBuckets:
+    """Bucket levels held in this process"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = rpm
+        self.tokens = tpm
+        self.updated = time.monotonic()
+
+    def take(self, tokens: float) -> float:
+        """Take 1 request + `tokens`; return 0 on success or seconds to wait"""
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60.0)
+
+        # Never ask for more than the bucket can ever hold
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        waits = [0.0]
+        if self.requests < 1:
+            waits.append((1 - self.requests) * 60.0 / self.rpm)
+        if self.tpm and self.tokens < tokens:
+            waits.append((tokens - self.tokens) * 60.0 / self.tpm)
+        wait = max(waits)
+        if wait == 0:
+            self.requests -= 1
+            self.tokens -= tokens
+        return wait
+
+    def refund(self, tokens: float):
+        if self.tpm:
+            self.tokens = min(self.tpm, self.tokens + tokens)
+
+
+class _SQLiteBuckets:
+    """Bucket levels shared by all processes using the same database file"""
+
+    def __init__(self, path: str, name: str, rpm: float, tpm: float):
+        self.path = path
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self._local = threading.local()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "name TEXT PRIMARY KEY, requests REAL NOT NULL, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO rate_buckets (name, requests, tokens, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (name, rpm, tpm, time.time()),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, fn):
+        # BEGIN IMMEDIATE takes the write lock, so read-modify-write is atomic
+        # across processes
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            requests, tokens, updated = conn.execute(
+                "SELECT requests, tokens, updated_at FROM rate_buckets WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            now = time.time()
+            elapsed = max(0.0, now - updated)
+            requests = min(self.rpm, requests + elapsed * self.rpm / 60.0)
+            if self.tpm:
+                tokens = min(self.tpm, tokens + elapsed * self.tpm / 60.0)
+            requests, tokens, result = fn(requests, tokens)
+            conn.execute(
+                "UPDATE rate_buckets SET requests = ?, tokens = ?, updated_at = ? WHERE name = ?",
+                (requests, tokens, now, self.name),
+            )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def take(self, tokens: float) -> float:
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+
+        def take(requests, level):
+            waits = [0.0]
+            if requests < 1:
+                waits.append((1 - requests) * 60.0 / self.rpm)
+            if self.tpm and level < tokens:
+                waits.append((tokens - level) * 60.0 / self.tpm)
+            wait = max(waits)
+            if wait == 0:
+                return requests - 1, level - tokens, 0.0
+            return requests, level, wait
+
+        return self._update(take)
+
+    def refund(self, tokens: float):
+        if self.tpm:
+            self._update(lambda requests, level: (requests, min(self.tpm, level + tokens), None))
+
+
+class RateLimiter:
+    """
+    Blocking, first-come-first-served limiter over a request and token bucket.
+    Call acquire() before each outbound call; refund() unused token reservations.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float,
+        tpm: float = 0,
+        shared_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        if shared_path:
+            self._buckets = _SQLiteBuckets(shared_path, name, rpm, tpm)
+        else:
+            self._buckets = _LocalBuckets(rpm, tpm)
+
+        self._cond = threading.Condition()
+        self._tickets = itertools.count()
+        self._serving = 0
+        self._waiting = 0
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.tokens_reserved = 0.0
+        self.tokens_refunded = 0.0
+
+    @classmethod
+    def from_env(cls, name: str, default_rpm: float, default_tpm: float = 0) -> "RateLimiter":
+        prefix = f"SENTI_{name.upper()}"
+        return cls(
+            name,
+            rpm=float(os.environ.get(f"{prefix}_RPM", str(default_rpm))),
+            tpm=float(os.environ.get(f"{prefix}_TPM", str(default_tpm))),
+            shared_path=os.environ.get("SENTI_RATE_LIMIT_DB"),
+        )
+
+    def acquire(self, tokens: float = 0) -> float:
+        """Block until one request (and `tokens` tokens) may be spent; returns seconds waited"""
+        if self.rpm <= 0:
+            return 0.0
+
+        started = time.monotonic()
+        with self._cond:
+            ticket = next(self._tickets)
+            self._waiting += 1
+            try:
+                # Only the head of the line talks to the buckets
+                while ticket != self._serving:
+                    self._cond.wait()
+                while True:
+                    wait = self._buckets.take(tokens)
+                    if wait == 0:
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiting -= 1
+                self._serving += 1
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            self.acquired += 1
+            self.tokens_reserved += tokens
+            self.total_wait += waited
+            if waited > 0.001:
+                self.waited += 1
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def refund(self, tokens: float):
+        """Return part of a token reservation that turned out not to be used"""
+        if tokens > 0 and self.rpm > 0:
+            with self._cond:
+                self._buckets.refund(tokens)
+                self.tokens_refunded += tokens
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "shared": isinstance(self._buckets, _SQLiteBuckets),
+                "queue_depth": self._waiting,
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+                "max_wait_seconds": round(self.max_wait, 3),
+                "tokens_reserved": int(self.tokens_reserved),
+                "tokens_refunded": int(self.tokens_refunded),
+            }
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for budgeting"""
+    return len(text) // 4 + 1
+
+
+# Process-wide limiters shared by every crew and worker thread
+llm_limiter = RateLimiter.from_env("llm", default_rpm=10, default_tpm=120000)
+search_limiter = RateLimiter.from_env("search", default_rpm=60)
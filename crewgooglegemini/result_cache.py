@@ -0,0 +1,100 @@
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Handle both relative and absolute imports
+try:
+    from .cache import make_cache
+except ImportError:
+    from cache import make_cache
+
+# =============================================
+# RESULT CACHE - Topic-level caching with stale-while-revalidate
+# =============================================
+#
+# A cached analysis goes through three phases:
+#   fresh  (age <= fresh_for)             -> served as is
+#   stale  (age <= fresh_for + stale_for) -> served immediately, refreshed in the background
+#   gone   (older)                        -> evicted by the backend, full analysis runs
+
+
+class ResultCache:
+    """Caches successful SentiCoreResponse payloads per normalized request"""
+
+    def __init__(self, backend, fresh_for: float = 300.0, stale_for: float = 3600.0):
+        self.backend = backend
+        self.fresh_for = fresh_for
+        self.stale_for = stale_for
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        fresh_for = float(os.environ.get("SENTI_RESULT_CACHE_FRESH", "300"))
+        stale_for = float(os.environ.get("SENTI_RESULT_CACHE_STALE", "3600"))
+        backend = make_cache(
+            "results",
+            ttl=fresh_for + stale_for,
+            max_entries=int(os.environ.get("SENTI_RESULT_CACHE_SIZE", "256")),
+            path=os.environ.get("SENTI_RESULT_CACHE_DB"),
+            redis_url=os.environ.get("SENTI_RESULT_CACHE_REDIS"),
+        )
+        return cls(backend, fresh_for=fresh_for, stale_for=stale_for)
+
+    @staticmethod
+    def key(topic: str, noofarticles: int, platforms: List[str]) -> str:
+        topic = re.sub(r"\s+", " ", topic).strip().lower()
+        platforms = ",".join(sorted({p.strip().lower() for p in platforms}))
+        return f"{topic}|{noofarticles}|{platforms}"
+
+    def lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Return (payload, "fresh" | "stale") or (None, None) on a miss"""
+        entry = self.backend.get_entry(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None, None
+            value, stored_at = entry
+            if time.time() - stored_at <= self.fresh_for:
+                self.hits += 1
+                return value, "fresh"
+            self.stale_hits += 1
+            return value, "stale"
+
+    def store(self, key: str, result: Dict[str, Any]):
+        # Failed analyses are never cached so the next request retries
+        if result.get("success"):
+            self.backend.set(key, result)
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh for key; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "backend": self.backend.stats()["backend"],
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refreshing": len(self._refreshing),
+            }
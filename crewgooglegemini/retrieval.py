@@ -0,0 +1,148 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Handle both relative and absolute imports
+try:
+    from .tools import search_cache
+    from .tracing import tracer, run_in_context
+    from . import metrics
+except ImportError:
+    from tools import search_cache
+    from tracing import tracer, run_in_context
+    import metrics
+
+# =============================================
+# RETRIEVAL - One site-scoped search per platform, merged into one corpus
+# =============================================
+#
+#             ┌──> "<topic> site:tiktok.com"     ──┐
+#   topic ────┼──> "<topic> site:instagram.com"  ──┼──> merge, de-duplicate,
+#             └──> "<topic> (site:x.com OR ...)" ──┘    cut to noofarticles
+#
+# Shards run at the same time, so retrieval takes about as long as the
+# slowest query. Every shard goes through search_cache (cache, coalescing,
+# shared rate limit). Results are merged round-robin across platforms, so
+# the noofarticles budget is shared fairly rather than filled by the first
+# platform. Duplicates are dropped by canonical URL, or by a hash of
+# title + snippet when a result has no link.
+#
+# The merged corpus is what every agent analyzes; agents do not search.
+
+PLATFORM_SCOPES = {
+    "tiktok": "site:tiktok.com",
+    "instagram": "site:instagram.com",
+    "twitter": "(site:x.com OR site:twitter.com)",
+    "x": "(site:x.com OR site:twitter.com)",
+    "youtube": "site:youtube.com",
+    "reddit": "site:reddit.com",
+    "facebook": "site:facebook.com",
+}
+
+# Query parameters that identify a visit, not the content
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "igshid", "ref", "s", "t")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a result URL: no fragment, tracking params or trailing slash"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not any(key == p or (p.endswith("_") and key.startswith(p)) for p in TRACKING_PARAMS)
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower().removeprefix("www."),
+        parts.path.rstrip("/"),
+        urlencode(sorted(query)),
+        "",
+    ))
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Identity of a search result: canonical URL, else a hash of its text"""
+    link = result.get("link", "")
+    if link:
+        return normalize_url(link)
+    text = f"{result.get('title', '')}\n{result.get('snippet', '')}"
+    return "text:" + hashlib.sha256(text.encode()).hexdigest()
+
+
+def platform_query(topic: str, platform: str) -> str:
+    """Site-scoped query for one platform; unknown names are used as a keyword"""
+    name = platform.strip().lower()
+    scope = PLATFORM_SCOPES.get(name)
+    if scope is None:
+        scope = f"site:{name}" if "." in name else name
+    return f"{topic} {scope}"
+
+
+def merge_results(shards: Dict[str, List[Dict[str, Any]]], budget: int) -> List[Dict[str, Any]]:
+    """Round-robin over platforms, skipping duplicates, until budget items are taken"""
+    merged, seen = [], set()
+    queues = {platform: list(results) for platform, results in shards.items()}
+    while len(merged) < budget and any(queues.values()):
+        for platform, queue in queues.items():
+            while queue:
+                result = queue.pop(0)
+                key = result_key(result)
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(dict(result, platform=platform))
+                    break
+            if len(merged) >= budget:
+                break
+    return merged
+
+
+def retrieve(topic: str, noofarticles: int, platforms: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Search every platform concurrently and return one Serper-shaped result
+    ({"organic": [...]}) with at most noofarticles de-duplicated items,
+    each tagged with its platform. A failing platform is reported under
+    "shards" and skipped; if every platform fails the first error is raised.
+    Without platforms the topic is searched once, unscoped.
+    """
+    platforms = list(dict.fromkeys(p.strip().lower() for p in platforms or [] if p.strip()))
+    queries = {p: platform_query(topic, p) for p in platforms} or {"web": topic}
+
+    def fetch(query: str) -> List[Dict[str, Any]]:
+        # Each shard asks for the whole budget so duplicates can be replaced
+        results = search_cache.search(query, n_results=noofarticles)
+        return results.get("organic", []) if isinstance(results, dict) else []
+
+    started = time.perf_counter()
+    shards, report, errors = {}, {}, []
+    with tracer.span("retrieval", topic=topic, shards=len(queries)) as span:
+        with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="senti-retrieval") as pool:
+            futures = {
+                platform: pool.submit(run_in_context(fetch), query)
+                for platform, query in queries.items()
+            }
+            for platform, future in futures.items():
+                try:
+                    shards[platform] = future.result()
+                    report[platform] = {"query": queries[platform], "results": len(shards[platform])}
+                except Exception as e:
+                    errors.append(e)
+                    report[platform] = {"query": queries[platform], "error": str(e)}
+                    metrics.ERRORS.inc("retrieval", type(e).__name__)
+        if not shards:
+            raise errors[0]
+
+        organic = merge_results(shards, noofarticles)
+        fetched = sum(len(results) for results in shards.values())
+        unique = len({result_key(r) for results in shards.values() for r in results})
+        if span is not None:
+            span.set(fetched=fetched, unique=unique, kept=len(organic))
+
+    return {
+        "searchParameters": {"q": topic, "platforms": platforms, "type": "search"},
+        "organic": organic,
+        "shards": report,
+        "fetched": fetched,
+        "duplicates": fetched - unique,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Handle both relative and absolute imports
+try:
+    from .parsing import find_json_object, MAX_FINDINGS
+except ImportError:
+    from parsing import find_json_object, MAX_FINDINGS
+
+# =============================================
+# STAGE REPORT SCHEMAS - Structured task outputs
+# =============================================
+#
+# Each task declares one of these as its output_pydantic, so CrewAI asks the
+# agent for matching JSON and validates it. The shared fields mirror
+# endpoints.AgentReport, which lets the API read scores straight from
+# TaskOutput.pydantic instead of scraping free text.
+
+
+class StageReport(BaseModel):
+    """Fields every agent report carries"""
+
+    agent_name: str
+    analysis_type: str
+    sentiment_score: float = Field(..., ge=-10, le=10, description="Sentiment from -10 to +10")
+    confidence: float = Field(..., ge=0, le=100, description="Confidence from 0 to 100")
+    key_findings: List[str] = Field(..., min_length=1, description="3-5 main insights")
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def strip_percent(cls, value: Any) -> Any:
+        # Models often answer "85%" for a percentage field
+        if isinstance(value, str):
+            return value.strip().rstrip("%")
+        return value
+
+    @field_validator("key_findings")
+    @classmethod
+    def cap_findings(cls, value: List[str]) -> List[str]:
+        # Trim instead of failing so a long answer does not cost a retry
+        return [item for item in value if item.strip()][:MAX_FINDINGS]
+
+
+class LexiconReport(StageReport):
+    agent_name: str = "LexiconAgent"
+    analysis_type: str = "text_sentiment"
+    content_analyzed: int = 0
+    emotional_breakdown: Dict[str, Any] = Field(default_factory=dict)
+    themes: List[str] = Field(default_factory=list)
+    language_indicators: List[str] = Field(default_factory=list)
+    sarcasm_detected: bool = False
+    sources: List[str] = Field(default_factory=list)
+
+
+class VisionReport(StageReport):
+    agent_name: str = "VisionAgent"
+    analysis_type: str = "visual_sentiment"
+    content_analyzed: int = 0
+    visual_themes: List[str] = Field(default_factory=list)
+    mood_indicators: List[str] = Field(default_factory=list)
+    color_sentiment: str = ""
+
+
+class FusionReport(StageReport):
+    agent_name: str = "FusionAgent"
+    analysis_type: str = "multimodal_fusion"
+    alignment_status: str = "aligned"
+    true_sentiment: str = ""
+    sarcasm_detected: bool = False
+    contradictions: List[str] = Field(default_factory=list)
+    synthesis: str = ""
+    recommendation: str = ""
+    text_vs_visual: str = ""
+
+
+REPORT_MODELS: Dict[str, Type[StageReport]] = {
+    "lexicon": LexiconReport,
+    "vision": VisionReport,
+    "fusion": FusionReport,
+}
+
+# One corrective retry; a second bad answer fails the stage loudly
+REPORT_MAX_RETRIES = 1
+
+
+def report_guardrail(model: Type[StageReport]) -> Callable[[Any], Tuple[bool, Any]]:
+    """
+    Build a task guardrail that accepts the output only if it validates
+    against `model`. On failure the validation errors are sent back to the
+    agent, which gets REPORT_MAX_RETRIES more attempts.
+    """
+
+    def guardrail(output) -> Tuple[bool, Any]:
+        if isinstance(output.pydantic, model):
+            return True, output
+
+        # CrewAI's converter gave up (e.g. prose around the JSON); decode the
+        # first JSON object ourselves before asking the agent again
+        data = find_json_object(output.raw)
+        if data is None:
+            return False, f"Answer with a single JSON object matching the {model.__name__} schema."
+        try:
+            output.pydantic = model.model_validate(data)
+        except ValidationError as e:
+            return False, f"The JSON does not match the {model.__name__} schema: {e}"
+        return True, output
+
+    return guardrail
@@ -0,0 +1,42 @@
+from typing import Any, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+# Handle both relative and absolute imports
+try:
+    from .tools import search_cache
+    from .tracing import tracer
+except ImportError:
+    from tools import search_cache
+    from tracing import tracer
+
+# =============================================
+# SEARCH TOOL - CrewAI wrapper around the shared search cache
+# =============================================
+#
+# Kept apart from tools.py so the API can use the search cache without
+# importing crewai; tools.tool resolves to the instance below on first use.
+
+
+class SearchToolInput(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class CachedSearchTool(BaseTool):
+    """Drop-in replacement for SerperDevTool that goes through SearchCache"""
+
+    name: str = "Search the internet"
+    description: str = (
+        "A tool that can be used to search the internet with a search_query. "
+        "Results are cached and shared between agents."
+    )
+    args_schema: Type[BaseModel] = SearchToolInput
+
+    def _run(self, search_query: str, **kwargs) -> Any:
+        with tracer.span("tool.search", tool=self.name, query=search_query):
+            return search_cache.search(search_query)
+
+
+# Initialize the tool for internet searching capabilities
+tool = CachedSearchTool()
@@ -0,0 +1,120 @@
+import argparse
+import os
+from pathlib import Path
+
+# Handle both relative and absolute imports
+try:
+    from .config import PROJECT_ROOT, load_env
+except ImportError:
+    from config import PROJECT_ROOT, load_env
+
+# =============================================
+# PRODUCTION LAUNCHER - Multi-process API server with shared state
+# =============================================
+#
+#   python serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+#
+# Starts N uvicorn worker processes, one per available core by default,
+# under uvicorn's supervisor. A worker that dies is restarted.
+#
+# Each worker is a separate process, so state that would otherwise live in
+# process memory is moved to SQLite files under SENTI_STATE_DIR. Queues are
+# already on SQLite:
+#
+#   search cache, result cache,    SENTI_*_CACHE_DB   one file per cache
+#   LLM cache, image cache
+#   rate limits                    SENTI_RATE_LIMIT_DB  one Gemini/Serper budget
+#   jobs, monitors, history        data/jobs.db, data/monitor.db, data/history.db
+#                                  (already shared)
+#
+# Variables that are already set are left alone, e.g. a Redis URL for a cache.
+# Every worker imports the app and so opens these files itself; their schema
+# statements are idempotent, so concurrent first starts are safe.
+# On SIGTERM each worker stops accepting connections. It then waits up to
+# SENTI_DRAIN_SECONDS for open requests to finish, and the same again for
+# running jobs and monitor polls (see endpoints.shutdown_executor). Only
+# then are the rest cancelled.
+
+APP_DIR = Path(__file__).parent
+
+SHARED_STATE = {
+    "SENTI_SEARCH_CACHE_DB": "search_cache.db",
+    "SENTI_RESULT_CACHE_DB": "result_cache.db",
+    "SENTI_LLM_CACHE_DB": "llm_cache.db",
+    "SENTI_IMAGE_CACHE_DB": "image_cache.db",
+    "SENTI_RATE_LIMIT_DB": "rate_limits.db",
+}
+
+# Caches that can be shared through Redis instead; no SQLite file is
+# assigned when their Redis URL is set
+REDIS_OVERRIDES = {
+    "SENTI_RESULT_CACHE_DB": "SENTI_RESULT_CACHE_REDIS",
+    "SENTI_LLM_CACHE_DB": "SENTI_LLM_CACHE_REDIS",
+}
+
+
+def default_workers() -> int:
+    """Cores this process may run on (respects CPU affinity / cgroup pinning)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def share_state(state_dir: Path) -> dict:
+    """Point every per-process store at a SQLite file in state_dir"""
+    shared = {}
+    for variable, filename in SHARED_STATE.items():
+        if os.environ.get(variable) or os.environ.get(REDIS_OVERRIDES.get(variable, "")):
+            continue
+        os.environ[variable] = str(state_dir / filename)
+        shared[variable] = os.environ[variable]
+    return shared
+
+
+def main():
+    """Run the API with several worker processes"""
+    load_env()
+    parser = argparse.ArgumentParser(description="Senti-Core production server")
+    parser.add_argument("--host", default=os.environ.get("SENTI_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("SENTI_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SENTI_SERVER_WORKERS", "0")) or default_workers(),
+        help="Worker processes (default: one per available core)",
+    )
+    parser.add_argument(
+        "--drain",
+        type=float,
+        default=float(os.environ.get("SENTI_DRAIN_SECONDS", "30")),
+        help="Seconds in-flight work may run after SIGTERM",
+    )
+    parser.add_argument("--log-level", default=os.environ.get("SENTI_LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    import uvicorn
+
+    # Workers are spawned, not forked, so they inherit these variables and
+    # import the app fresh
+    os.environ["SENTI_DRAIN_SECONDS"] = str(args.drain)
+    if args.workers > 1:
+        state_dir = Path(os.environ.get("SENTI_STATE_DIR", str(PROJECT_ROOT / "data" / "state")))
+        state_dir.mkdir(parents=True, exist_ok=True)
+        shared = share_state(state_dir)
+        print(f"Senti-Core: {args.workers} workers sharing state in {state_dir} ({len(shared)} stores)")
+
+    uvicorn.run(
+        "endpoints:app",
+        app_dir=str(APP_DIR),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.drain,
+        log_level=args.log_level,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
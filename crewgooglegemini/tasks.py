@@ -1,106 +1,199 @@
 from crewai import Task
+from typing import Dict
 
 # Handle both relative and absolute imports
 try:
     from .tools import tool
-    from .agents import lexicon_agent, vision_agent, fusion_agent
+    from . import agents as _agents
+    from .agents import build_agents
+    from .schemas import REPORT_MODELS, REPORT_MAX_RETRIES, report_guardrail
 except ImportError:
     from tools import tool
-    from agents import lexicon_agent, vision_agent, fusion_agent
+    import agents as _agents
+    from agents import build_agents
+    from schemas import REPORT_MODELS, REPORT_MAX_RETRIES, report_guardrail
 
 # =============================================
 # SENTI-CORE TASKS - Multimodal Analysis Pipeline
 # =============================================
 
-# Task 1: Text Analysis (LexiconAgent)
-lexicon_task = Task(
-    description=(
-        "Analyze the textual content about {topic} from social media sources "
-        "(TikTok, Instagram Reels, X/Twitter). Extract and analyze:\n"
-        "1. Primary emotional tone (positive, negative, neutral)\n"
-        "2. Key themes and topics mentioned\n"
-        "3. Language patterns and linguistic features\n"
-        "4. Presence of sarcasm, irony, or humor indicators\n"
-        "5. Overall text sentiment score (-10 to +10)\n\n"
-        "Search for 3 pieces of content ONLY (use max 3 search queries) and provide detailed analysis."
+# Task templates are plain dicts so each analysis can build its own Task
+# objects. Tasks store their output on the instance, so sharing them across
+# concurrent requests would let one request read another's result.
+TASK_TEMPLATES = {
+    # Task 1: Text Analysis (LexiconAgent)
+    "lexicon": dict(
+        description=(
+            "Analyze the textual content about {topic} from social media sources "
+            "(TikTok, Instagram Reels, X/Twitter). Extract and analyze:\n"
+            "1. Primary emotional tone (positive, negative, neutral)\n"
+            "2. Key themes and topics mentioned\n"
+            "3. Language patterns and linguistic features\n"
+            "4. Presence of sarcasm, irony, or humor indicators\n"
+            "5. Overall text sentiment score (-10 to +10)"
+        ),
+        expected_output=(
+            "A single JSON object (no surrounding prose) containing:\n"
+            "- agent_name: 'LexiconAgent'\n"
+            "- analysis_type: 'text_sentiment'\n"
+            "- content_analyzed: number of items\n"
+            "- sentiment_score: number from -10 to +10\n"
+            "- confidence: number from 0 to 100\n"
+            "- key_findings: list of 3-5 main insights\n"
+            "- emotional_breakdown: dict of emotions detected\n"
+            "- themes: list of key themes\n"
+            "- language_indicators: list of notable linguistic patterns\n"
+            "- sarcasm_detected: boolean\n"
+            "- sources: list of source URLs"
+        ),
     ),
-    expected_output=(
-        "A structured JSON-formatted report containing:\n"
-        "- agent_name: 'LexiconAgent'\n"
-        "- analysis_type: 'text_sentiment'\n"
-        "- content_analyzed: number of items\n"
-        "- sentiment_score: -10 to +10\n"
-        "- confidence: 0 to 100%\n"
-        "- key_findings: list of main insights\n"
-        "- emotional_breakdown: dict of emotions detected\n"
-        "- themes: list of key themes\n"
-        "- language_indicators: notable linguistic patterns\n"
-        "- sources: list of source URLs"
-    ),
-    tools=[tool],
-    agent=lexicon_agent,
-)
 
-# Task 2: Visual Analysis (VisionAgent)
-vision_task = Task(
-    description=(
-        "Analyze the visual elements related to {topic} from social media content. "
-        "Focus on:\n"
-        "1. Visual mood and atmosphere\n"
-        "2. Color psychology and palette\n"
-        "3. Imagery themes (based on descriptions and metadata)\n"
-        "4. Visual sentiment indicators\n"
-        "5. Overall visual sentiment score (-10 to +10)\n\n"
-        "Analyze visual elements from the SAME 3 pieces of content. Be concise and quick."
+    # Task 2: Visual Analysis (VisionAgent)
+    "vision": dict(
+        description=(
+            "Analyze the visual elements related to {topic} from social media content. "
+            "Focus on:\n"
+            "1. Visual mood and atmosphere\n"
+            "2. Color psychology and palette\n"
+            "3. Imagery themes (based on descriptions and metadata)\n"
+            "4. Visual sentiment indicators\n"
+            "5. Overall visual sentiment score (-10 to +10)"
+        ),
+        expected_output=(
+            "A single JSON object (no surrounding prose) containing:\n"
+            "- agent_name: 'VisionAgent'\n"
+            "- analysis_type: 'visual_sentiment'\n"
+            "- content_analyzed: number of items\n"
+            "- sentiment_score: number from -10 to +10\n"
+            "- confidence: number from 0 to 100\n"
+            "- key_findings: list of 3-5 main visual insights\n"
+            "- visual_themes: list of visual patterns\n"
+            "- mood_indicators: list of visual mood descriptors\n"
+            "- color_sentiment: emotional impact of colors"
+        ),
     ),
-    expected_output=(
-        "A structured JSON-formatted report containing:\n"
-        "- agent_name: 'VisionAgent'\n"
-        "- analysis_type: 'visual_sentiment'\n"
-        "- content_analyzed: number of items\n"
-        "- sentiment_score: -10 to +10\n"
-        "- confidence: 0 to 100%\n"
-        "- visual_themes: list of visual patterns\n"
-        "- mood_indicators: visual mood descriptors\n"
-        "- color_sentiment: emotional impact of colors\n"
-        "- key_observations: main visual insights"
+
+    # Task 3: Multimodal Fusion (FusionAgent)
+    "fusion": dict(
+        description=(
+            "QUICKLY synthesize the LexiconAgent's text analysis with the VisionAgent's "
+            "visual analysis to determine the TRUE sentiment about {topic}.\n\n"
+            "Be CONCISE and focus on:\n"
+            "1. Final sentiment score (-10 to +10)\n"
+            "2. 3-5 key findings only\n"
+            "3. Quick contradiction check (if any)\n"
+            "4. Confidence level\n\n"
+            "Keep analysis brief and actionable. Focus on speed and clarity."
+        ),
+        expected_output=(
+            "A single JSON object (no surrounding prose) containing:\n"
+            "- agent_name: 'FusionAgent'\n"
+            "- analysis_type: 'multimodal_fusion'\n"
+            "- sentiment_score: final score from -10 to +10\n"
+            "- confidence: number from 0 to 100\n"
+            "- key_findings: list of 3-5 key findings\n"
+            "- alignment_status: 'aligned' or 'contradictory'\n"
+            "- true_sentiment: final determination\n"
+            "- sarcasm_detected: boolean\n"
+            "- contradictions: list of identified contradictions\n"
+            "- synthesis: detailed explanation of findings\n"
+            "- recommendation: actionable insights\n"
+            "- text_vs_visual: comparative analysis"
+        ),
     ),
-    tools=[tool],
-    agent=vision_agent,
+}
+
+
+# How lexicon and vision get their content. Without a pre-fetched corpus the
+# agents search themselves; with one (retrieval.py) they get no search tool
+# and the crew must be kicked off with {platforms} and {search_results}.
+SEARCH_INSTRUCTIONS = {
+    "lexicon": "\n\nSearch for 3 pieces of content ONLY (use max 3 search queries) and provide detailed analysis.",
+    "vision": "\n\nAnalyze visual elements from the SAME 3 pieces of content. Be concise and quick.",
+}
+PREFETCHED_RESULTS_NOTE = (
+    "\n\nThe content below about {topic} was retrieved from {platforms} and is "
+    "shared by all agents. Analyze only these items; no search tool is "
+    "available:\n{search_results}"
 )
 
-# Task 3: Multimodal Fusion (FusionAgent)
-fusion_task = Task(
-    description=(
-        "QUICKLY synthesize the LexiconAgent's text analysis with the VisionAgent's "
-        "visual analysis to determine the TRUE sentiment about {topic}.\n\n"
-        "Be CONCISE and focus on:\n"
-        "1. Final sentiment score (-10 to +10)\n"
-        "2. 3-5 key findings only\n"
-        "3. Quick contradiction check (if any)\n"
-        "4. Confidence level\n\n"
-        "Keep analysis brief and actionable. Focus on speed and clarity."
-    ),
-    expected_output=(
-        "A comprehensive JSON-formatted final report containing:\n"
-        "- agent_name: 'FusionAgent'\n"
-        "- analysis_type: 'multimodal_fusion'\n"
-        "- final_sentiment_score: -10 to +10\n"
-        "- confidence: 0 to 100%\n"
-        "- alignment_status: 'aligned' or 'contradictory'\n"
-        "- true_sentiment: final determination\n"
-        "- sarcasm_detected: boolean\n"
-        "- contradictions: list of identified contradictions\n"
-        "- synthesis: detailed explanation of findings\n"
-        "- recommendation: actionable insights\n"
-        "- text_vs_visual: comparative analysis"
-    ),
-    tools=[tool],
-    agent=fusion_agent,
-    async_execution=False,
-    output_file="senti-core-analysis.json",
+
+# Appended to the fusion description in compact context mode (compaction.py);
+# fusion then reads {upstream_summary} instead of the full upstream outputs.
+UPSTREAM_SUMMARY_NOTE = (
+    "\n\nCondensed LexiconAgent and VisionAgent reports (JSON):\n{upstream_summary}"
 )
 
-# Legacy tasks for backward compatibility
-research_task = lexicon_task
-write_task = fusion_task
+
+def build_task(name: str, agent, prefetched: bool = False, compact: bool = False, **overrides) -> Task:
+    """Create a fresh Task from its template, validated against its report schema"""
+    params = dict(
+        TASK_TEMPLATES[name],
+        tools=[] if prefetched else [tool],
+        agent=agent,
+        output_pydantic=REPORT_MODELS[name],
+        guardrail=report_guardrail(REPORT_MODELS[name]),
+        guardrail_max_retries=REPORT_MAX_RETRIES,
+    )
+    if name in SEARCH_INSTRUCTIONS:
+        params["description"] += PREFETCHED_RESULTS_NOTE if prefetched else SEARCH_INSTRUCTIONS[name]
+    if compact and name == "fusion":
+        params["description"] += UPSTREAM_SUMMARY_NOTE
+    params.update(overrides)
+    return Task(**params)
+
+
+def build_tasks(
+    agents: Dict[str, object] = None,
+    prefetched: bool = False,
+    compact: bool = False,
+    **overrides,
+) -> Dict[str, Task]:
+    """
+    Create a fresh lexicon + vision -> fusion task graph for one analysis.
+    Outputs stay in memory on the returned tasks; nothing is written to disk
+    unless an output_file override is passed for the fusion task. Each task
+    validates its answer against its schemas.REPORT_MODELS entry.
+
+    With prefetched=True no task has a search tool; pass agents built with
+    tools=[] too. With compact=True fusion gets no task context; the caller
+    must kick it off with an {upstream_summary} input instead.
+    """
+    agents = agents or build_agents()
+    tasks = {
+        name: build_task(name, agents[name], prefetched, compact, **overrides.get(name, {}))
+        for name in TASK_TEMPLATES
+    }
+
+    # Fusion reads both upstream reports explicitly, so it works whether the
+    # stages run in one sequential crew or as parallel single-task crews.
+    tasks["fusion"].context = [] if compact else [tasks["lexicon"], tasks["vision"]]
+    return tasks
+
+
+# Module-level instances for legacy callers (crew.py, old imports), built on
+# first access so importing this module never constructs agents or the LLM
+LEGACY_TASKS = {
+    "lexicon_task": "lexicon",
+    "vision_task": "vision",
+    "fusion_task": "fusion",
+    # Legacy tasks for backward compatibility
+    "research_task": "lexicon",
+    "write_task": "fusion",
+}
+_legacy_tasks = {}
+
+
+def __getattr__(name: str):
+    if name in LEGACY_TASKS:
+        if not _legacy_tasks:
+            _legacy_tasks.update(build_tasks(
+                {
+                    "lexicon": _agents.lexicon_agent,
+                    "vision": _agents.vision_agent,
+                    "fusion": _agents.fusion_agent,
+                },
+                fusion={"output_file": "senti-core-analysis.json"},
+            ))
+        return _legacy_tasks[LEGACY_TASKS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,205 @@
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
 
-# Load .env file from project root
-env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
+# Handle both relative and absolute imports
+try:
+    from .config import load_env
+    from .cache import make_cache
+    from .ratelimit import search_limiter
+    from .http_client import get_http_client
+    from .tracing import tracer
+    from . import metrics
+except ImportError:
+    from config import load_env
+    from cache import make_cache
+    from ratelimit import search_limiter
+    from http_client import get_http_client
+    from tracing import tracer
+    import metrics
 
-# Set SERPER_API_KEY for the tool
-serper_key = os.getenv("SERPER_API_KEY")
-if serper_key:
-    os.environ["SERPER_API_KEY"] = serper_key
+load_env()
 
 
-from crewai_tools import SerperDevTool
+# =============================================
+# SEARCH CACHE - Shared, de-duplicated Serper access
+# =============================================
 
-# Initialize the tool for internet searching capabilities
-tool = SerperDevTool(n_results=3)
+class SearchCache:
+    """
+    Caches search results keyed on normalized query + n_results.
+    Concurrent identical queries are coalesced so only one outbound call
+    is made; the other callers wait for and share its result.
+    The search client itself is created on the first cache miss.
+    """
+
+    def __init__(self, cache, n_results: int = 3, tool_factory: Optional[Callable[[], Any]] = None):
+        self.cache = cache
+        self.n_results = n_results
+        self._tool_factory = tool_factory or (lambda: SerperClient(n_results))
+        self._search_tool = None
+        self._tool_lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.outbound_calls = 0
+        self.coalesced = 0
+
+    @property
+    def search_tool(self):
+        if self._search_tool is None:
+            with self._tool_lock:
+                if self._search_tool is None:
+                    self._search_tool = self._tool_factory()
+        return self._search_tool
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return re.sub(r"\s+", " ", query).strip().lower()
+
+    def key(self, query: str, n_results: Optional[int] = None) -> str:
+        return f"{n_results or self.n_results}:{self.normalize(query)}"
+
+    def search(self, query: str, n_results: Optional[int] = None, fresh: bool = False) -> Any:
+        """
+        Cached results for query; n_results overrides the default result count.
+        fresh=True skips the cached entry (still coalesced, rate limited and
+        stored), for callers that need results newer than the cache TTL.
+        """
+        key = self.key(query, n_results)
+        cached = None if fresh else self.cache.get(key)
+        if cached is not None:
+            metrics.CACHE_REQUESTS.inc("search", "hit")
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            metrics.CACHE_REQUESTS.inc("search", "coalesced")
+            return future.result()
+
+        metrics.CACHE_REQUESTS.inc("search", "bypass" if fresh else "miss")
+        try:
+            with tracer.span("search.request", query=query):
+                metrics.RATE_LIMIT_WAIT_SECONDS.observe(search_limiter.acquire(), "search")
+                self.outbound_calls += 1
+                started = time.perf_counter()
+                try:
+                    if n_results and n_results != self.n_results:
+                        result = self.search_tool.run(search_query=query, n_results=n_results)
+                    else:
+                        result = self.search_tool.run(search_query=query)
+                except Exception:
+                    metrics.SEARCH_SECONDS.observe(time.perf_counter() - started, "error")
+                    raise
+                metrics.SEARCH_SECONDS.observe(time.perf_counter() - started, "ok")
+            self.cache.set(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            metrics.ERRORS.inc("search", type(e).__name__)
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        stats.update(outbound_calls=self.outbound_calls, coalesced=self.coalesced)
+        return stats
+
+
+def format_results(results: Any) -> str:
+    """Render Serper results as a compact numbered list for task prompts"""
+    if not isinstance(results, dict):
+        return str(results)
+
+    lines = []
+    for i, item in enumerate(results.get("organic", []), start=1):
+        platform = f"[{item['platform']}] " if item.get("platform") else ""
+        lines.append(
+            f"{i}. {platform}{item.get('title', '')}\n"
+            f"   URL: {item.get('link', '')}\n"
+            f"   {item.get('snippet', '')}"
+        )
+    return "\n".join(lines) if lines else "No search results found."
+
+
+class SerperClient:
+    """
+    Minimal Serper search client on the shared pooled HTTP client. Returns
+    the same result shape as crewai_tools' SerperDevTool (which opens a new
+    connection for every search).
+    """
+
+    def __init__(self, n_results: int = 3, base_url: Optional[str] = None, timeout: float = 10.0):
+        # SENTI_SERPER_URL swaps in a stand-in backend (benchmarks/fake_backends.py)
+        self.base_url = (base_url or os.environ.get("SENTI_SERPER_URL") or "https://google.serper.dev").rstrip("/")
+        self.n_results = n_results
+        self.timeout = timeout
+
+    def run(self, search_query: str, n_results: Optional[int] = None) -> Dict[str, Any]:
+        n_results = n_results or self.n_results
+        api_key = os.environ.get("SERPER_API_KEY")
+        if not api_key:
+            raise ValueError("SERPER_API_KEY not found in environment variables")
+
+        response = get_http_client().post(
+            f"{self.base_url}/search",
+            json={"q": search_query, "num": n_results},
+            headers={"X-API-KEY": api_key},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+
+        return {
+            "searchParameters": dict(results.get("searchParameters", {}), q=search_query, type="search"),
+            "organic": [
+                {
+                    "title": item["title"],
+                    "link": item["link"],
+                    "snippet": item.get("snippet", ""),
+                    "position": item.get("position"),
+                }
+                for item in results.get("organic", [])[:n_results]
+                if "title" in item and "link" in item
+            ],
+            "credits": results.get("credits", 1),
+        }
+
+
+# Initialize the shared search cache; the Serper client is created lazily
+search_cache = SearchCache(
+    make_cache(
+        "search",
+        ttl=float(os.environ.get("SENTI_SEARCH_CACHE_TTL", "900")),
+        max_entries=int(os.environ.get("SENTI_SEARCH_CACHE_SIZE", "512")),
+        path=os.environ.get("SENTI_SEARCH_CACHE_DB"),
+    ),
+    n_results=3,
+)
+
+
+def __getattr__(name: str):
+    # The CrewAI tool (and crewai itself) is only imported when an agent or
+    # task asks for it: `from tools import tool`
+    if name in ("tool", "CachedSearchTool", "SearchToolInput"):
+        try:
+            from . import search_tool
+        except ImportError:
+            import search_tool
+        return getattr(search_tool, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,217 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Handle both relative and absolute imports
+try:
+    from .config import PROJECT_ROOT, load_env
+except ImportError:
+    from config import PROJECT_ROOT, load_env
+
+# =============================================
+# TRACING - Nested spans around analyses, crews, tasks and tool calls
+# =============================================
+#
+# Spans follow the OpenTelemetry data model (trace id, span id, parent id,
+# attributes, status) and nest through a context variable, so a span opened
+# in a stage thread becomes a child of the analysis that started it as long
+# as the thread runs in a copied context (see run_in_context).
+#
+# Exporters, chosen with SENTI_TRACE_EXPORTER:
+#   none  - spans are not recorded (default)
+#   file  - one JSON object per finished span appended to SENTI_TRACE_FILE
+#   otlp  - spans are mirrored into the OpenTelemetry SDK, which sends them
+#           to the collector at OTEL_EXPORTER_OTLP_ENDPOINT
+
+load_env()
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("senti_span", default=None)
+
+
+class Span:
+    """One timed operation; finished spans are handed to the exporter"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start", "end", "status", "error", "_started")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.end = self.start + (time.perf_counter() - self._started)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class FileExporter:
+    """Append finished spans to a JSONL file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class OTLPExporter:
+    """Mirror spans into the OpenTelemetry SDK, which ships them over OTLP"""
+
+    def __init__(self, service_name: str = "senti-core"):
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            raise ImportError(
+                "The OpenTelemetry SDK is required for SENTI_TRACE_EXPORTER=otlp. "
+                "Install it with: pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"
+            )
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        self._trace = trace
+        self._tracer = provider.get_tracer("senti-core")
+        self._open: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def start(self, span: Span):
+        with self._lock:
+            parent = self._open.get(span.parent_id) if span.parent_id else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start * 1e9)
+        )
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def export(self, span: Span):
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(key, value)
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.end or time.time()) * 1e9))
+
+
+class Tracer:
+    """Creates spans and passes finished ones to the configured exporter"""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.exported = 0
+        self.export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Time the enclosed block as a child of the current span"""
+        if self.exporter is None:
+            yield None
+            return
+
+        span = Span(name, _current_span.get(), attributes)
+        try:
+            self.exporter.start(span)
+        except Exception:
+            self.export_errors += 1
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            try:
+                self.exporter.export(span)
+                self.exported += 1
+            except Exception:
+                # Tracing must never fail an analysis
+                self.export_errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "exporter": type(self.exporter).__name__ if self.exporter else None,
+            "exported": self.exported,
+            "export_errors": self.export_errors,
+        }
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def run_in_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn so that it runs in a copy of the caller's context (for threads)"""
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+
+    return wrapper
+
+
+def tracer_from_env() -> Tracer:
+    exporter_name = os.environ.get("SENTI_TRACE_EXPORTER", "none").lower()
+    if exporter_name == "file":
+        default_path = str(PROJECT_ROOT / "data" / "traces.jsonl")
+        return Tracer(FileExporter(os.environ.get("SENTI_TRACE_FILE", default_path)))
+    if exporter_name == "otlp":
+        return Tracer(OTLPExporter())
+    return Tracer()
+
+
+tracer = tracer_from_env()
@@ -1,7 +1,9 @@
 #!/bin/bash
 
 # Sentiment AI - Run Script
-# This script activates the virtual environment and starts the server
+# This script activates the virtual environment and starts the server.
+# ./run.sh          development server with auto-reload (one process)
+# ./run.sh --prod   production server, one worker process per core (serve.py)
 
 echo "=================================="
 echo "  Sentiment AI - Starting Server"
@@ -51,4 +53,8 @@ echo "Press Ctrl+C to stop the server"
 echo ""
 
 # Start the server
+if [ "$1" == "--prod" ]; then
+    shift
+    exec python serve.py --host 0.0.0.0 --port 8000 "$@"
+fi
 uvicorn endpoints:app --reload --host 0.0.0.0 --port 8000
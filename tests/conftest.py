@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The app modules import each other flat (as uvicorn runs them with
+# app_dir=crewgooglegemini), so tests import them the same way
+APP_DIR = Path(__file__).parent.parent / "crewgooglegemini"
+sys.path.insert(0, str(APP_DIR))
+
+# Module-level stores are created at import; keep them out of data/
+STATE_DIR = tempfile.mkdtemp(prefix="senti-tests-")
+os.environ.setdefault("SENTI_IMAGE_DIR", os.path.join(STATE_DIR, "uploads"))
+os.environ.setdefault("SENTI_HISTORY_DB", os.path.join(STATE_DIR, "history.db"))
+os.environ.setdefault("SENTI_JOB_DB", os.path.join(STATE_DIR, "jobs.db"))
+os.environ.setdefault("SENTI_MONITOR_DB", os.path.join(STATE_DIR, "monitor.db"))
+
+# No background pollers, job workers or crew warm-up when the app is imported
+os.environ.setdefault("SENTI_MONITOR_WORKERS", "0")
+os.environ.setdefault("SENTI_JOB_WORKERS", "0")
+os.environ.setdefault("SENTI_WARMUP", "0")
@@ -0,0 +1,30 @@
+import pytest
+
+from cache import MemoryCache, make_cache
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_unreachable_redis_degrades_to_misses():
+    pytest.importorskip("redis")
+    # Nothing listens on port 1, so every command fails to connect
+    cache = make_cache("outage", ttl=60, max_entries=4, redis_url="redis://127.0.0.1:1/0")
+
+    cache.set("key", {"value": 1})
+    assert cache.get("key") is None
+    assert cache.get_entry("key") is None
+    cache.delete("key")
+
+    stats = cache.stats()
+    assert stats["entries"] is None
+    assert stats["misses"] == 2
+    assert stats["errors"] >= 3
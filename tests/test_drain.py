@@ -0,0 +1,41 @@
+import threading
+import time
+
+import pytest
+
+from executor import AdmissionRejected, AnalysisExecutor
+from jobs import JobQueue
+
+
+def test_executor_drain_waits_for_in_flight_work_and_rejects_new():
+    executor = AnalysisExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    future = executor.submit(lambda cancel: release.wait(5))
+
+    assert executor.drain(0.1) is False
+    with pytest.raises(AdmissionRejected) as rejected:
+        executor.submit(lambda cancel: None)
+    assert rejected.value.status_code == 503
+
+    release.set()
+    future.result(timeout=5)
+    assert executor.drain(1) is True
+    executor.shutdown()
+
+
+def test_job_queue_drain_lets_running_job_finish(tmp_path):
+    started = threading.Event()
+
+    def runner(cancel, **payload):
+        started.set()
+        time.sleep(0.3)
+        return {"ok": True}
+
+    queue = JobQueue(runner, path=str(tmp_path / "jobs.db"), poll_interval=0.05)
+    job_id = queue.submit({"topic": "a"})
+    queue.scale(1)
+    assert started.wait(5)
+
+    assert queue.drain(5) is True
+    assert queue.get(job_id)["status"] == "succeeded"
+    assert queue.stats()["workers"] == 0
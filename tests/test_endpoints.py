@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import endpoints
+
+
+def fake_result(topic, score=4.0):
+    return {
+        "success": True,
+        "topic": topic,
+        "platforms": ["x"],
+        "content_analyzed": 1,
+        "timestamp": "2026-10-17T00:00:00",
+        "final_sentiment": {"overall_score": score, "confidence": 80.0, "sentiment_label": "Positive"},
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def run(topic, noofarticles, platforms, cancel, on_stage):
+        if topic.startswith("broken"):
+            raise RuntimeError("pipeline exploded")
+        return fake_result(topic)
+
+    monkeypatch.setattr(endpoints, "_run_analysis", run)
+    return TestClient(endpoints.app)
+
+
+def test_batch_reports_a_failed_topic_as_an_error(client):
+    topics = ["batch ok one", "broken batch topic", "batch ok two"]
+    response = client.post("/api/analyze/batch", json={
+        "requests": [{"topic": topic, "platforms": ["x"]} for topic in topics],
+    })
+
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == [0, 1, 2]
+    assert lines[1]["error"] == "pipeline exploded"
+    assert lines[1]["status_code"] == 500
+    assert "result" not in lines[1]
+    for index in (0, 2):
+        assert "error" not in lines[index]
+        assert lines[index]["result"]["success"] is True
+        assert lines[index]["result"]["topic"] == topics[index]
+
+
+def multipart(size: int) -> bytes:
+    return (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="big.jpg"\r\n'
+        b"Content-Type: image/jpeg\r\n\r\n" + b"x" * size + b"\r\n--boundary--\r\n"
+    )
+
+
+def chunks(body: bytes, size: int = 16 * 1024):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_chunked_upload_over_the_limit_is_rejected_while_streaming(client, monkeypatch, tmp_path):
+    import images
+
+    monkeypatch.setattr(endpoints, "MAX_UPLOAD_BYTES", 1000)
+    monkeypatch.setattr(images, "UPLOAD_DIR", tmp_path)
+
+    response = client.post(
+        "/api/analyze/image",
+        content=chunks(multipart(1024 * 1024)),
+        headers={"Content-Type": "multipart/form-data; boundary=boundary"},
+    )
+
+    assert response.status_code == 413
+    assert "content-length" not in {k.lower() for k in response.request.headers}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_declared_oversized_upload_is_rejected_before_reading(client, monkeypatch):
+    monkeypatch.setattr(endpoints, "MAX_UPLOAD_BYTES", 1000)
+
+    response = client.post(
+        "/api/analyze/image",
+        content=multipart(200 * 1024),
+        headers={"Content-Type": "multipart/form-data; boundary=boundary"},
+    )
+
+    assert response.status_code == 413
+
+
+def sse_events(text: str):
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        yield event[len("event: "):], json.loads(data[len("data: "):])
+
+
+def test_stream_sends_the_validated_stage_report(monkeypatch):
+    report = {"analysis_type": "text_sentiment", "sentiment_score": 7.5, "confidence": 90.0}
+
+    def run(topic, noofarticles, platforms, cancel, on_stage):
+        on_stage("search", "1. some post", None)
+        # The raw text disagrees with the validated report; the report wins
+        on_stage("lexicon", "Sentiment Score: -3", report)
+        on_stage("vision", "no structured answer here", None)
+        return fake_result(topic)
+
+    monkeypatch.setattr(endpoints, "_run_analysis", run)
+    response = TestClient(endpoints.app).post("/api/analyze/stream", json={
+        "topic": "stream report topic", "platforms": ["x"], "no_cache": True,
+    })
+
+    events = dict(sse_events(response.text))
+    assert events["search"] == {"results": "1. some post"}
+    assert events["lexicon"]["sentiment_score"] == 7.5
+    assert events["lexicon"]["confidence"] == 90.0
+    assert events["lexicon"]["raw_output"] == "Sentiment Score: -3"
+    assert events["lexicon"]["status"] == "completed"
+    assert events["vision"]["analysis_type"] == "visual_sentiment"
+    assert events["vision"]["status"] == "completed"
+    assert report == {"analysis_type": "text_sentiment", "sentiment_score": 7.5, "confidence": 90.0}
+    assert events["result"]["success"] is True
+
+
+def test_unknown_raw_output_default_fails_at_import():
+    env = dict(os.environ, SENTI_RAW_OUTPUT="verbose")
+    completed = subprocess.run(
+        [sys.executable, "-c", "import endpoints"],
+        cwd=os.path.dirname(endpoints.__file__), env=env, capture_output=True, text=True,
+    )
+
+    assert completed.returncode != 0
+    assert "Unknown SENTI_RAW_OUTPUT: verbose" in completed.stderr
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import history as history_module
+from history import HistoryStore, parse_time
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def at(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+def result(topic: str, score, confidence=80.0):
+    return {
+        "success": True,
+        "topic": topic,
+        "platforms": ["x"],
+        "final_sentiment": {"overall_score": score, "confidence": confidence, "sentiment_label": "Positive"},
+        "fusion_report": {"sentiment_score": score, "raw_output": "x" * 1000},
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(at("2026-10-16T23:10:00"))
+    monkeypatch.setattr(history_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.db"))
+
+
+def test_aggregates_split_at_the_utc_day_boundary(store, clock):
+    clock.now = at("2026-10-16T23:10:00")
+    store.record(result("Tesla", 2.0))
+    clock.now = at("2026-10-16T23:50:00")
+    store.record(result("tesla", 4.0))
+    clock.now = at("2026-10-17T00:20:00")
+    store.record(result("Tesla ", 9.0, confidence=50.0))
+    store.record(result("Apple", -5.0))
+
+    daily = store.aggregates("TESLA", window=24 * 3600, bucket="day", until=at("2026-10-17T01:00:00"))
+    assert daily["rolling"] == {
+        "analyses": 3, "sentiment_score": 5.0, "confidence": 70.0, "min_score": 2.0, "max_score": 9.0,
+    }
+    assert [(p["start"], p["analyses"], p["sentiment_score"]) for p in daily["series"]] == [
+        ("2026-10-16T00:00:00+00:00", 2, 3.0),
+        ("2026-10-17T00:00:00+00:00", 1, 9.0),
+    ]
+
+    hourly = store.aggregates("Tesla", window=3600, bucket="hour", until=at("2026-10-17T00:30:00"))
+    assert [(p["start"], p["analyses"]) for p in hourly["series"]] == [
+        ("2026-10-16T23:00:00+00:00", 2),
+        ("2026-10-17T00:00:00+00:00", 1),
+    ]
+
+    everything = store.aggregates(window=24 * 3600, until=at("2026-10-17T01:00:00"))
+    assert everything["rolling"]["analyses"] == 4
+
+
+def test_query_timestamps_round_trip_as_range_bounds(store, clock):
+    store.record(result("Tesla", 2.0))
+    clock.now += 60
+    store.record(result("Tesla", 4.0))
+
+    newest, oldest = store.query("tesla")
+    assert newest["timestamp"].endswith("+00:00")
+    assert [e["sentiment_score"] for e in store.query("tesla", since=parse_time(newest["timestamp"]))] == [4.0]
+    assert [e["sentiment_score"] for e in store.query("tesla", until=parse_time(oldest["timestamp"]))] == [2.0]
+
+
+def test_stored_results_leave_out_raw_output(store, clock):
+    store.record(result("Tesla", 2.0))
+
+    entry, = store.query("Tesla", include_results=True)
+    assert "raw_output" not in entry["result"]["fusion_report"]
+
+
+def test_record_never_raises(store, clock):
+    assert store.record(result("Tesla", "not a number")) is None
+    assert store.record({"success": True, "final_sentiment": {}}) is None
+    assert store.record(dict(result("Tesla", 1.0), success=False)) is None
+    assert store.stats()["failed_writes"] == 2
+    assert store.stats()["analyses"] == 0
+
+
+def test_parse_time_accepts_iso_and_epoch():
+    assert parse_time("2026-10-17T00:00:00Z") == at("2026-10-17T00:00:00")
+    assert parse_time("2026-10-17T00:00:00") == at("2026-10-17T00:00:00")
+    assert parse_time("1700000000") == 1700000000.0
+    assert parse_time(None) is None
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
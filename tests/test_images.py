@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+
+import pytest
+
+import images
+from images import ImageRejected, save_upload
+
+
+class FakeUpload:
+    """The parts of starlette's UploadFile that save_upload uses"""
+
+    def __init__(self, data: bytes, content_type: str = "image/jpeg"):
+        self.data = data
+        self.content_type = content_type
+        self.offset = 0
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "UPLOAD_DIR", tmp_path)
+    return tmp_path
+
+
+def test_save_upload_streams_and_hashes(upload_dir):
+    data = b"x" * (3 * images.CHUNK_SIZE + 7)
+    path, sha256, size = asyncio.run(save_upload(FakeUpload(data)))
+
+    assert path.read_bytes() == data
+    assert size == len(data)
+    assert sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_save_upload_rejects_oversized_body(upload_dir):
+    upload = FakeUpload(b"x" * (images.CHUNK_SIZE * 2))
+
+    with pytest.raises(ImageRejected) as rejected:
+        asyncio.run(save_upload(upload, max_bytes=images.CHUNK_SIZE + 1))
+
+    assert rejected.value.status_code == 413
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_save_upload_rejects_empty_body(upload_dir):
+    with pytest.raises(ImageRejected) as rejected:
+        asyncio.run(save_upload(FakeUpload(b"")))
+
+    assert rejected.value.status_code == 400
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_save_upload_rejects_unsupported_type(upload_dir):
+    with pytest.raises(ImageRejected) as rejected:
+        asyncio.run(save_upload(FakeUpload(b"%PDF", content_type="application/pdf")))
+
+    assert rejected.value.status_code == 415
+
+
+def test_analyze_leaves_no_files_behind(upload_dir, monkeypatch):
+    from PIL import Image
+
+    source = upload_dir / "upload.part"
+    Image.new("RGB", (2048, 1024), "red").save(source, "PNG")
+    seen = {}
+
+    def fake_vision(jpeg, cancel=None):
+        seen["jpeg"] = jpeg
+        raise RuntimeError("vision backend down")
+
+    monkeypatch.setattr(images, "call_vision_model", fake_vision)
+    analyzer = images.ImageAnalyzer(images.make_cache("images-test", ttl=60, max_entries=4))
+
+    with pytest.raises(RuntimeError):
+        analyzer.analyze(str(source), "0" * 64, source.stat().st_size)
+
+    assert seen["jpeg"][:2] == b"\xff\xd8"
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_make_thumbnail_rejects_too_many_pixels(upload_dir, monkeypatch):
+    from PIL import Image
+
+    source = upload_dir / "big.png"
+    Image.new("RGB", (200, 200)).save(source, "PNG")
+    monkeypatch.setattr(images, "MAX_PIXELS", 100 * 100)
+
+    with pytest.raises(ImageRejected) as rejected:
+        images.make_thumbnail(source)
+
+    assert rejected.value.status_code == 422
@@ -0,0 +1,133 @@
+import time
+
+import httpx
+import pytest
+
+from errors import is_transient
+from executor import AnalysisCancelled
+from jobs import JobQueue
+
+
+def make_queue(tmp_path, runner=None, **kwargs):
+    return JobQueue(runner or (lambda cancel, **payload: {"ok": True}), path=str(tmp_path / "jobs.db"), **kwargs)
+
+
+def expire_leases(queue):
+    queue._conn().execute("UPDATE jobs SET lease_expires = ? WHERE status = 'running'", (time.time() - 1,))
+
+
+def test_lapsed_lease_is_reclaimed_while_attempts_remain(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = queue.submit({"topic": "a"})
+
+    first = queue.claim()
+    expire_leases(queue)
+    second = queue.claim()
+
+    assert second["id"] == job_id
+    assert second["attempts"] == 2
+    assert second["lease_owner"] != first["lease_owner"]
+
+
+def test_lapsed_lease_with_exhausted_attempts_fails(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = queue.submit({"topic": "a"})
+
+    queue.claim()
+    expire_leases(queue)
+    queue.claim()
+    expire_leases(queue)
+
+    assert queue.claim() is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+
+
+def test_previous_owner_cannot_overwrite_reclaimed_job(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({"topic": "a"})
+
+    stale = queue.claim()
+    expire_leases(queue)
+    current = queue.claim()
+
+    assert not queue._finish(job_id, stale["lease_owner"], "failed", error="late")
+    assert queue.get(job_id)["status"] == "running"
+    assert queue._finish(job_id, current["lease_owner"], "succeeded", result={"ok": True})
+    assert queue.get(job_id)["status"] == "succeeded"
+    assert queue.stats()["lost_leases"] == 1
+
+
+def test_job_past_timeout_is_cancelled_and_retried(tmp_path):
+    def slow(cancel, **payload):
+        while True:
+            cancel.check()
+            time.sleep(0.01)
+
+    queue = make_queue(tmp_path, runner=slow, timeout=0.1, max_attempts=2, backoff=0)
+    job_id = queue.submit({"topic": "a"})
+
+    assert queue.run_one()
+    job = queue.get(job_id)
+    assert job["status"] == "queued"
+    assert "time limit" in job["error"]
+
+    assert queue.run_one()
+    assert queue.get(job_id)["status"] == "failed"
+
+
+def test_shutdown_cancel_gives_the_attempt_back(tmp_path):
+    def cancelled(cancel, **payload):
+        raise AnalysisCancelled("stopping")
+
+    queue = make_queue(tmp_path, runner=cancelled)
+    job_id = queue.submit({"topic": "a"})
+
+    assert queue.run_one()
+    job = queue.get(job_id)
+    assert (job["status"], job["attempts"]) == ("queued", 0)
+
+
+def status_error(code):
+    request = httpx.Request("POST", "https://example.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+@pytest.mark.parametrize("error, transient", [
+    (status_error(429), True),
+    (status_error(503), True),
+    (status_error(401), False),
+    (httpx.ConnectTimeout("timed out"), True),
+    (TimeoutError(), True),
+    (ValueError("prompt exceeds 5000 tokens"), False),
+    (RuntimeError("connection refused: invalid API key"), False),
+])
+def test_is_transient_classifies_by_type_and_status(error, transient):
+    assert is_transient(error) is transient
+
+
+def test_is_transient_follows_wrapped_causes():
+    try:
+        try:
+            raise status_error(502)
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError("crew failed") from e
+    except RuntimeError as wrapped:
+        assert is_transient(wrapped)
+
+
+def test_running_job_keeps_its_lease(tmp_path):
+    reclaimed = []
+
+    def outlives_lease(cancel, **payload):
+        time.sleep(0.5)
+        reclaimed.append(queue.claim())
+        return {"ok": True}
+
+    queue = make_queue(tmp_path, runner=outlives_lease, lease=0.3)
+    job_id = queue.submit({"topic": "a"})
+
+    assert queue.run_one()
+    assert reclaimed == [None]
+    assert queue.get(job_id)["status"] == "succeeded"
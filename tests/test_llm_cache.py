@@ -0,0 +1,115 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import llm_client
+from cache import make_cache
+from llm_cache import LLMResponseCache, NearDuplicateIndex, bypass, canonical_tokens
+
+MODEL = "gemini/gemini-2.0-flash"
+
+TEMPLATE = (
+    "Analyze the textual content of recent social media posts about {topic}. "
+    "Search for {topic} on each platform, extract the primary emotional tone, key themes, "
+    "language patterns, any sarcasm or irony, and score the overall text sentiment of "
+    "{topic} from -10 to +10 across the three items found today."
+)
+
+
+def messages(topic):
+    return [
+        {"role": "system", "content": "You are a sentiment analyst."},
+        {"role": "user", "content": TEMPLATE.format(topic=topic)},
+    ]
+
+
+@pytest.fixture
+def llm_cache():
+    return LLMResponseCache(make_cache("llm-test", ttl=60, max_entries=32))
+
+
+@pytest.fixture
+def near_cache():
+    # A low threshold so only the token guard stands between similar prompts
+    near = NearDuplicateIndex(threshold=0.5, max_entries=32)
+    return LLMResponseCache(make_cache("llm-near-test", ttl=60, max_entries=32), near=near)
+
+
+def test_exact_key_covers_model_temperature_and_tools(llm_cache):
+    llm_cache.put(llm_cache.get(MODEL, messages("Tesla"), 0.2), "cached answer")
+
+    # Key order inside a message does not matter
+    reordered = [{"content": m["content"], "role": m["role"]} for m in messages("Tesla")]
+    hit = llm_cache.get(MODEL, reordered, 0.2)
+    assert (hit.match, hit.response) == ("exact", "cached answer")
+
+    assert llm_cache.get(MODEL, messages("Tesla"), 0.7).match == "miss"
+    assert llm_cache.get("gemini/gemini-1.5-pro", messages("Tesla"), 0.2).match == "miss"
+    tools = [{"type": "function", "function": {"name": "search"}}]
+    assert llm_cache.get(MODEL, messages("Tesla"), 0.2, tools).match == "miss"
+    assert llm_cache.stats()["exact_hits"] == 1
+
+
+def test_empty_responses_are_not_stored(llm_cache):
+    llm_cache.put(llm_cache.get(MODEL, messages("Tesla")), "   ")
+
+    assert llm_cache.get(MODEL, messages("Tesla")).match == "miss"
+
+
+def test_bypass_skips_lookups_but_still_stores(llm_cache):
+    llm_cache.put(llm_cache.get(MODEL, messages("Tesla")), "old answer")
+
+    with bypass():
+        lookup = llm_cache.get(MODEL, messages("Tesla"))
+        assert (lookup.match, lookup.response) == ("bypass", None)
+        llm_cache.put(lookup, "fresh answer")
+
+        # Other threads keep their own context
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(llm_cache.get(MODEL, messages("Tesla")).match))
+        thread.start()
+        thread.join()
+        assert seen == ["exact"]
+
+    assert llm_cache.get(MODEL, messages("Tesla")).response == "fresh answer"
+    assert llm_cache.stats()["bypassed"] == 1
+
+
+def test_calls_with_available_functions_are_not_cached(monkeypatch, llm_cache):
+    monkeypatch.setattr(llm_client, "llm_cache", llm_cache)
+    calls = []
+
+    def call_with_fallbacks(messages, *args, **kwargs):
+        calls.append(kwargs)
+        return f"answer {len(calls)}"
+
+    # SentiLLM.call only needs these attributes; no provider is involved
+    llm = SimpleNamespace(model=MODEL, temperature=0.2, _call_with_fallbacks=call_with_fallbacks)
+    call = llm_client.SentiLLM.call
+
+    assert call(llm, messages("Tesla")) == "answer 1"
+    assert call(llm, messages("Tesla")) == "answer 1"
+    functions = {"search": lambda query: query}
+    assert call(llm, messages("Tesla"), available_functions=functions) == "answer 2"
+    assert call(llm, messages("Tesla"), available_functions=functions) == "answer 3"
+    assert len(calls) == 3
+
+
+def test_near_duplicate_prompt_reuses_the_response(near_cache):
+    near_cache.put(near_cache.get(MODEL, messages("iPhone17 Pro")), "iphone answer")
+
+    lookup = near_cache.get(MODEL, messages("iphone 17   pros"))
+    assert (lookup.match, lookup.response) == ("near", "iphone answer")
+
+
+def test_different_topic_is_never_served_a_near_match(near_cache):
+    near_cache.put(near_cache.get(MODEL, messages("Ford")), "ford answer")
+
+    lookup = near_cache.get(MODEL, messages("Tesla"))
+    assert (lookup.match, lookup.response) == ("miss", None)
+    assert near_cache.stats()["near_hits"] == 0
+
+
+def test_canonical_tokens_split_digits_and_drop_plurals():
+    assert canonical_tokens("iPhone17 Pros, GLASS") == ["iphone", "17", "pro", "glass"]
@@ -0,0 +1,150 @@
+import itertools
+import time
+
+import pytest
+
+import monitor
+from cache import make_cache
+from monitor import TopicMonitor
+from tools import SearchCache
+
+
+class FeedTool:
+    """Search backend that returns one more new result on every call"""
+
+    def __init__(self):
+        self.calls = itertools.count(1)
+
+    def run(self, search_query, n_results=None):
+        n = next(self.calls)
+        return {"organic": [
+            {"link": f"https://example.com/post/{i}", "title": f"Post {i}", "snippet": "great"}
+            for i in range(1, n + 1)
+        ]}
+
+
+def local_analysis(topic, items, cancel):
+    return {"engine": "local", "sentiment_score": 5.0, "confidence": 80.0, "key_findings": []}
+
+
+@pytest.fixture
+def search_cache(monkeypatch):
+    # TTL far longer than the gap between polls
+    cache = SearchCache(make_cache("monitor-test", ttl=900, max_entries=16), tool_factory=FeedTool)
+    monkeypatch.setattr(monitor, "search_cache", cache)
+    return cache
+
+
+def test_polls_within_search_ttl_see_new_items(tmp_path, search_cache):
+    topics = TopicMonitor(path=str(tmp_path / "monitor.db"), analyze=local_analysis)
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+
+    first = topics.poll(topics.claim())
+    topics.trigger(monitor_id)
+    second = topics.poll(topics.claim())
+
+    assert (first["new_items"], first["seen_items"]) == (1, 0)
+    assert (second["new_items"], second["seen_items"]) == (1, 1)
+    assert search_cache.outbound_calls == 2
+    assert topics.get(monitor_id)["items_seen"] == 2
+
+
+def test_unchanged_results_are_not_analyzed(tmp_path):
+    results = {"organic": [{"link": "https://example.com/a?utm_source=x", "title": "A"}]}
+    calls = []
+
+    def analyze(topic, items, cancel):
+        calls.append(items)
+        return local_analysis(topic, items, cancel)
+
+    topics = TopicMonitor(path=str(tmp_path / "monitor.db"), analyze=analyze, search=lambda topic: results)
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+    topics.poll(topics.claim())
+    topics.trigger(monitor_id)
+    summary = topics.poll(topics.claim())
+
+    assert summary["new_items"] == 0
+    assert len(calls) == 1
+    assert len(topics.get(monitor_id)["series"]) == 1
+
+
+def test_poll_of_removed_monitor_records_nothing(tmp_path, search_cache):
+    topics = TopicMonitor(path=str(tmp_path / "monitor.db"))
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+
+    def analyze_then_remove(topic, items, cancel):
+        assert topics.remove(monitor_id)
+        return local_analysis(topic, items, cancel)
+
+    topics.analyze = analyze_then_remove
+    summary = topics.poll(topics.claim())
+
+    conn = topics._conn()
+    assert summary["removed"] is True
+    assert conn.execute("SELECT COUNT(*) FROM monitor_items").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM monitor_points").fetchone()[0] == 0
+
+
+def test_series_timestamps_are_utc(tmp_path, search_cache):
+    topics = TopicMonitor(path=str(tmp_path / "monitor.db"), analyze=local_analysis)
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+    topics.poll(topics.claim())
+
+    (point,) = topics.get(monitor_id)["series"]
+    assert point["timestamp"].endswith("+00:00")
+
+
+def test_running_poll_keeps_its_lease(tmp_path, search_cache):
+    others = []
+
+    def slow_analysis(topic, items, cancel):
+        # Several lease lengths; renewal must keep other pollers away
+        time.sleep(0.6)
+        others.append(second.claim())
+        return local_analysis(topic, items, cancel)
+
+    path = str(tmp_path / "monitor.db")
+    topics = TopicMonitor(path=path, analyze=slow_analysis, lease=0.3)
+    second = TopicMonitor(path=path, analyze=slow_analysis, lease=0.3)
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+
+    assert topics.run_one()
+    assert others == [None]
+    assert topics.get(monitor_id)["runs"] == 1
+
+
+def test_poll_past_the_timeout_is_cancelled(tmp_path, search_cache):
+    def hanging_analysis(topic, items, cancel):
+        while True:
+            cancel.check()
+            time.sleep(0.01)
+
+    topics = TopicMonitor(path=str(tmp_path / "monitor.db"), analyze=hanging_analysis, timeout=0.2)
+    monitor_id = topics.add("Example", interval=60)["monitor_id"]
+
+    started = time.monotonic()
+    assert topics.run_one()
+    assert time.monotonic() - started < 5
+
+    state = topics.get(monitor_id)
+    assert "time limit" in state["last_error"]
+    assert state["next_run_at"] > time.time()
+    assert not topics.run_one()
+
+
+def test_poll_that_lost_its_lease_records_nothing(tmp_path, search_cache):
+    path = str(tmp_path / "monitor.db")
+    topics = TopicMonitor(path=path, analyze=local_analysis, lease=0.1)
+    other = TopicMonitor(path=path, analyze=local_analysis, lease=60)
+    topics.add("Example", interval=60)
+
+    stale = topics.claim()
+    time.sleep(0.2)
+    assert other.claim() is not None
+    summary = topics.poll(stale)
+
+    assert summary["lost_lease"] is True
+    assert topics.stats()["lost_leases"] == 1
+    conn = topics._conn()
+    assert conn.execute("SELECT COUNT(*) FROM monitor_items").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM monitor_points").fetchone()[0] == 0
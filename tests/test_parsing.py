@@ -0,0 +1,87 @@
+from parsing import MAX_FINDINGS, extract_json_from_text, find_json_object, parse_agent_output
+
+
+def test_fenced_json_is_decoded():
+    text = '```json\n{"sentiment_score": 6.5, "confidence": 82, "key_findings": ["Fans love the camera"]}\n```'
+
+    assert find_json_object(text) == {
+        "sentiment_score": 6.5, "confidence": 82, "key_findings": ["Fans love the camera"],
+    }
+    report = parse_agent_output(text, "LexiconAgent")
+    assert (report["sentiment_score"], report["confidence"]) == (6.5, 82.0)
+    assert report["key_findings"] == ["Fans love the camera"]
+
+
+def test_nested_braces_and_trailing_prose():
+    text = (
+        'Here is my analysis: {"overall_score": -2, "details": {"tone": "wary", "flags": {"sarcasm": true}}, '
+        '"findings": ["Battery complaints {often} repeat"]} Let me know if you need more.'
+    )
+
+    data = find_json_object(text)
+    assert data["details"] == {"tone": "wary", "flags": {"sarcasm": True}}
+    report = parse_agent_output(text, "FusionAgent")
+    assert report["sentiment_score"] == -2.0
+    assert report["key_findings"] == ["Battery complaints {often} repeat"]
+
+
+def test_findings_nested_one_level_down():
+    report = parse_agent_output('{"score": 3, "analysis": {"key_observations": ["Calm replies"]}}', "VisionAgent")
+
+    assert report["key_findings"] == ["Calm replies"]
+
+
+def test_malformed_json_falls_back_to_text():
+    text = '{"sentiment_score": 4.0, "confidence": 70,\n- Reviewers praise the display quality'
+
+    assert find_json_object(text) is None
+    assert extract_json_from_text(text)["format"] == "text"
+    report = parse_agent_output(text, "LexiconAgent")
+    assert (report["sentiment_score"], report["confidence"]) == (4.0, 70.0)
+    assert report["key_findings"] == ["Reviewers praise the display quality"]
+
+
+def test_json_without_a_score_borrows_it_from_the_text():
+    report = parse_agent_output('Sentiment Score: -3.5\n{"confidence": "64%"}', "LexiconAgent")
+
+    assert (report["sentiment_score"], report["confidence"]) == (-3.5, 64.0)
+
+
+def test_legacy_text_output():
+    text = (
+        "Overall the reaction was mixed.\n"
+        "Rating: 2\n"
+        "Sentiment Score: 7.5\n"
+        "Confidence: 88%\n"
+        "1. Buyers are excited about the launch\n"
+        "2. Some worry about the price increase\n"
+        "- ok\n"
+    )
+
+    report = parse_agent_output(text, "LexiconAgent")
+    # "sentiment score" wins over "rating" wherever it appears
+    assert report["sentiment_score"] == 7.5
+    assert report["confidence"] == 88.0
+    assert report["key_findings"] == [
+        "Buyers are excited about the launch", "Some worry about the price increase",
+    ]
+    assert report["agent_name"] == "LexiconAgent"
+    assert report["raw_output"] == text
+
+
+def test_polarity_words_and_defaults_without_any_numbers():
+    positive = parse_agent_output("People sound optimistic and the feedback is great.", "LexiconAgent")
+    negative = parse_agent_output("The coverage is negative and concerning.", "LexiconAgent")
+    neutral = parse_agent_output("Nothing to report.", "LexiconAgent")
+
+    assert positive["sentiment_score"] == 5.0
+    assert negative["sentiment_score"] == -5.0
+    assert neutral["sentiment_score"] == 0.0
+    assert neutral["confidence"] == 75.0
+    assert neutral["key_findings"] == ["Analysis completed"]
+
+
+def test_findings_are_capped():
+    text = "\n".join(f"- Finding number {i} about the topic" for i in range(10))
+
+    assert len(parse_agent_output(text, "LexiconAgent")["key_findings"]) == MAX_FINDINGS
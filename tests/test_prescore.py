@@ -0,0 +1,71 @@
+import pytest
+
+from prescore import MIN_EVIDENCE_ITEMS, is_clear_cut, prescore, score_texts
+
+THRESHOLD = 80.0
+
+
+def results(*snippets):
+    return {"organic": [
+        {"title": "", "snippet": text, "link": f"https://example.com/{i}"}
+        for i, text in enumerate(snippets)
+    ]}
+
+
+POSITIVE = [
+    "Absolutely love it, the best phone this year",
+    "Amazing camera and great battery, highly recommend",
+    "Fantastic upgrade, really impressive and fast",
+]
+
+
+def test_agreeing_snippets_are_clear_cut():
+    score = prescore(results(*POSITIVE))
+
+    assert score["sentiment_score"] > 5
+    assert score["confidence"] >= THRESHOLD
+    assert is_clear_cut(score, THRESHOLD)
+
+
+def test_a_single_snippet_never_skips_the_llm():
+    score = prescore(results("not good not great at all"))
+
+    assert score["sentiment_score"] < 0
+    assert score["confidence"] <= 100.0 / MIN_EVIDENCE_ITEMS
+    assert not is_clear_cut(score, THRESHOLD)
+
+
+def test_confidence_grows_with_evidence():
+    confidences = [prescore(results(*POSITIVE[:n]))["confidence"] for n in (1, 2, 3)]
+
+    assert confidences == sorted(confidences)
+    assert confidences[0] < confidences[-1]
+
+
+def test_sarcasm_routes_to_the_llm():
+    score = prescore(results(*POSITIVE, "Oh great, another update that breaks everything 🙄"))
+
+    assert score["sarcasm_flagged"]
+    assert not is_clear_cut(score, THRESHOLD)
+
+
+def test_disagreeing_snippets_are_not_clear_cut():
+    score = prescore(results(*POSITIVE, "Terrible, the worst purchase ever", "Awful and broken, total scam"))
+
+    assert not is_clear_cut(score, THRESHOLD)
+
+
+def test_snippets_without_sentiment_words_score_zero():
+    score = prescore(results("Launch event on Tuesday", "Specs and price list"))
+
+    assert score == {"sentiment_score": 0.0, "confidence": 0.0, "sarcasm_flagged": False,
+                     "items": 2, "per_item": []}
+
+
+def test_negation_flips_and_boosters_strengthen():
+    compound = score_texts(["good", "not good", "very good"])["compound"]
+
+    assert compound[0] > 0 > compound[1]
+    assert compound[2] > compound[0]
+    # Negation windows do not leak across documents
+    assert score_texts(["not", "good"])["compound"][1] == pytest.approx(compound[0])
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from executor import wait_until
+from ratelimit import RateLimiter, _LocalBuckets, _SQLiteBuckets
+
+
+def test_waiters_are_served_in_arrival_order():
+    # 20 requests per second, starting empty
+    limiter = RateLimiter("fifo", rpm=1200)
+    limiter._buckets.requests = 0
+    served = []
+
+    def acquire(index):
+        limiter.acquire()
+        served.append(index)
+
+    threads = []
+    for index in range(5):
+        thread = threading.Thread(target=acquire, args=(index,))
+        thread.start()
+        threads.append(thread)
+        # Queue them one by one so arrival order is well defined
+        assert wait_until(lambda: limiter.stats()["queue_depth"] == index + 1, timeout=2, interval=0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert served == [0, 1, 2, 3, 4]
+    assert limiter.stats()["acquired"] == 5
+
+
+def test_refund_returns_an_unused_reservation():
+    limiter = RateLimiter("refund", rpm=6000, tpm=1000)
+    limiter.acquire(800)
+
+    # Another 800 tokens would take ~36s to refill
+    assert limiter._buckets.take(800) > 30
+    limiter.refund(700)
+    assert limiter.acquire(800) < 0.5
+
+    stats = limiter.stats()
+    assert stats["tokens_reserved"] == 1600
+    assert stats["tokens_refunded"] == 700
+
+
+def test_requests_and_tokens_both_limit():
+    buckets = _LocalBuckets(rpm=60, tpm=600)
+
+    # Out of requests: one refills in a second
+    buckets.requests, buckets.tokens = 0, 600
+    assert buckets.take(10) == pytest.approx(1.0, abs=0.05)
+    # Out of tokens: 100 tokens at 10 per second
+    buckets.requests, buckets.tokens = 5, 0
+    assert buckets.take(100) == pytest.approx(10.0, abs=0.05)
+    # Both short: the longer wait wins and nothing is taken
+    buckets.requests, buckets.tokens = 0, 0
+    assert buckets.take(600) == pytest.approx(60.0, abs=0.05)
+    assert buckets.requests < 1 and buckets.tokens < 1
+
+
+def test_oversized_reservation_is_capped_at_the_bucket_size():
+    buckets = _LocalBuckets(rpm=60, tpm=600)
+
+    assert buckets.take(10_000) == 0
+    assert buckets.tokens == pytest.approx(0, abs=1)
+
+
+def test_sqlite_buckets_share_one_budget(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first = _SQLiteBuckets(path, "llm", rpm=2, tpm=100)
+    second = _SQLiteBuckets(path, "llm", rpm=2, tpm=100)
+    other = _SQLiteBuckets(path, "search", rpm=2, tpm=0)
+
+    assert first.take(40) == 0
+    assert second.take(40) == 0
+    # The two requests are spent for both, and only 20 tokens are left
+    assert first.take(0) > 0
+    assert second.take(0) > 0
+    second.refund(40)
+    assert first._update(lambda requests, tokens: (requests, tokens, tokens)) == pytest.approx(60, abs=1)
+    # Buckets are per name
+    assert other.take(0) == 0
+
+
+def test_shared_limiters_report_shared(tmp_path):
+    limiter = RateLimiter("llm", rpm=60, shared_path=str(tmp_path / "ratelimit.db"))
+
+    assert limiter.acquire() < 0.5
+    assert limiter.stats()["shared"] is True
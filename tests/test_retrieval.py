@@ -0,0 +1,109 @@
+import pytest
+
+import retrieval
+from cache import make_cache
+from retrieval import merge_results, normalize_url, platform_query, result_key, retrieve
+from tools import SearchCache
+
+SHARDS = {
+    "tiktok.com": [
+        {"link": "https://www.tiktok.com/@a/video/1?utm_source=share", "title": "T1"},
+        {"link": "https://example.com/story/", "title": "Shared story"},
+        {"link": "https://www.tiktok.com/@a/video/2", "title": "T2"},
+    ],
+    "instagram.com": [
+        {"link": "https://example.com/story#comments", "title": "Shared story again"},
+        {"link": "https://instagram.com/p/1", "title": "I1"},
+        {"link": "https://instagram.com/p/2", "title": "I2"},
+    ],
+    "reddit.com": RuntimeError("reddit is down"),
+}
+
+
+class ShardTool:
+    """Search backend answering each site-scoped query from SHARDS"""
+
+    def run(self, search_query, n_results=None):
+        for site, results in SHARDS.items():
+            if f"site:{site}" in search_query:
+                if isinstance(results, Exception):
+                    raise results
+                return {"organic": results}
+        return {"organic": []}
+
+
+@pytest.fixture(autouse=True)
+def search_cache(monkeypatch):
+    cache = SearchCache(make_cache("retrieval-test", ttl=60, max_entries=16), tool_factory=ShardTool)
+    monkeypatch.setattr(retrieval, "search_cache", cache)
+    return cache
+
+
+def test_normalize_url():
+    assert normalize_url(" HTTPS://WWW.Example.com/Post/1/?utm_source=x&b=2&fbclid=y&a=1#top ") == (
+        "https://example.com/Post/1?a=1&b=2"
+    )
+    # Tracking names match exactly, or by prefix when they end in "_"
+    assert normalize_url("https://x.com/p?s=20&sort=new&t=5") == "https://x.com/p?sort=new"
+    assert normalize_url("https://x.com/p?reference=1") == "https://x.com/p?reference=1"
+
+
+def test_result_key_falls_back_to_text():
+    assert result_key({"link": "https://www.example.com/a/"}) == "https://example.com/a"
+    same = result_key({"title": "No link", "snippet": "text"})
+    assert same.startswith("text:")
+    assert same == result_key({"title": "No link", "snippet": "text"})
+    assert same != result_key({"title": "No link", "snippet": "other"})
+
+
+def test_platform_query():
+    assert platform_query("Tesla", "Twitter") == "Tesla (site:x.com OR site:twitter.com)"
+    assert platform_query("Tesla", "news.ycombinator.com") == "Tesla site:news.ycombinator.com"
+    assert platform_query("Tesla", "forums") == "Tesla forums"
+
+
+def test_merge_is_round_robin_within_budget():
+    shards = {
+        "a": [{"link": f"https://a.com/{i}"} for i in range(3)],
+        "b": [{"link": "https://www.a.com/0/"}, {"link": "https://b.com/1"}],
+    }
+
+    merged = merge_results(shards, budget=4)
+
+    assert [(r["platform"], r["link"]) for r in merged] == [
+        ("a", "https://a.com/0"),
+        ("b", "https://b.com/1"),  # its first result duplicated a.com/0
+        ("a", "https://a.com/1"),
+        ("a", "https://a.com/2"),
+    ]
+    assert len(merge_results(shards, budget=2)) == 2
+
+
+def test_duplicates_across_platforms_are_dropped():
+    result = retrieve("Topic", 5, ["tiktok", "instagram"])
+
+    titles = [r["title"] for r in result["organic"]]
+    # Instagram's copy of the shared story comes first in round-robin order
+    assert titles == ["T1", "Shared story again", "T2", "I1", "I2"]
+    assert result["fetched"] == 6
+    assert result["duplicates"] == 1
+    assert result["shards"]["tiktok"] == {"query": "Topic site:tiktok.com", "results": 3}
+
+
+def test_budget_is_shared_between_platforms():
+    result = retrieve("Topic", 2, ["tiktok", "instagram", "tiktok"])
+
+    assert [r["platform"] for r in result["organic"]] == ["tiktok", "instagram"]
+    assert result["searchParameters"]["platforms"] == ["tiktok", "instagram"]
+
+
+def test_a_failing_shard_is_reported_and_skipped():
+    result = retrieve("Topic", 3, ["reddit", "tiktok"])
+
+    assert result["shards"]["reddit"]["error"] == "reddit is down"
+    assert [r["platform"] for r in result["organic"]] == ["tiktok"] * 3
+
+
+def test_all_shards_failing_raises():
+    with pytest.raises(RuntimeError, match="reddit is down"):
+        retrieve("Topic", 3, ["reddit"])
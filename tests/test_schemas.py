@@ -0,0 +1,120 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agents
+import images
+from parsing import MAX_FINDINGS
+from schemas import REPORT_MAX_RETRIES, REPORT_MODELS, FusionReport, LexiconReport, report_guardrail
+from tasks import build_task
+
+VALID = {"sentiment_score": 6.5, "confidence": "85%", "key_findings": ["Fans love the camera", " "]}
+
+
+def task_output(raw, pydantic=None):
+    return SimpleNamespace(raw=raw, pydantic=pydantic)
+
+
+def test_valid_report_in_prose_is_accepted():
+    output = task_output(f"Here is the report:\n{json.dumps(VALID)}\nThanks!")
+
+    ok, result = report_guardrail(LexiconReport)(output)
+
+    assert ok and result is output
+    report = output.pydantic
+    assert isinstance(report, LexiconReport)
+    assert (report.sentiment_score, report.confidence) == (6.5, 85.0)
+    assert report.key_findings == ["Fans love the camera"]
+    assert (report.agent_name, report.analysis_type) == ("LexiconAgent", "text_sentiment")
+
+
+def test_converted_output_passes_through():
+    report = LexiconReport(sentiment_score=1, confidence=50, key_findings=["Quiet week"])
+    output = task_output("not even json", pydantic=report)
+
+    assert report_guardrail(LexiconReport)(output) == (True, output)
+    assert output.pydantic is report
+
+
+@pytest.mark.parametrize("field, value", [
+    ("sentiment_score", 12),
+    ("sentiment_score", -10.5),
+    ("confidence", 150),
+    ("confidence", -1),
+    ("key_findings", []),
+])
+def test_out_of_range_values_are_sent_back(field, value):
+    output = task_output(json.dumps(dict(VALID, **{field: value})))
+
+    ok, feedback = report_guardrail(FusionReport)(output)
+
+    assert not ok
+    assert "does not match the FusionReport schema" in feedback
+    assert field in feedback
+    assert output.pydantic is None
+
+
+@pytest.mark.parametrize("field", ["sentiment_score", "confidence", "key_findings"])
+def test_missing_fields_are_sent_back(field):
+    data = {k: v for k, v in VALID.items() if k != field}
+
+    ok, feedback = report_guardrail(LexiconReport)(task_output(json.dumps(data)))
+
+    assert not ok
+    assert field in feedback
+
+
+def test_answer_without_json_asks_for_json():
+    ok, feedback = report_guardrail(LexiconReport)(task_output("The sentiment is positive."))
+
+    assert not ok
+    assert feedback == "Answer with a single JSON object matching the LexiconReport schema."
+
+
+def test_long_findings_are_trimmed_not_rejected():
+    findings = [f"Finding {i}" for i in range(MAX_FINDINGS + 3)]
+    output = task_output(json.dumps(dict(VALID, key_findings=findings)))
+
+    assert report_guardrail(LexiconReport)(output)[0]
+    assert output.pydantic.key_findings == findings[:MAX_FINDINGS]
+
+
+@pytest.mark.parametrize("name", sorted(REPORT_MODELS))
+def test_tasks_validate_against_their_report(name):
+    task = build_task(name, None, prefetched=True)
+
+    assert task.output_pydantic is REPORT_MODELS[name]
+    assert task.guardrail_max_retries == REPORT_MAX_RETRIES
+    ok, _ = task.guardrail(task_output(json.dumps(VALID)))
+    assert ok
+
+
+class ScriptedLLM:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def call(self, messages):
+        self.prompts.append(messages[0]["content"][0]["text"])
+        return self.answers.pop(0)
+
+
+def test_vision_call_retries_with_the_validation_error(monkeypatch):
+    llm = ScriptedLLM([json.dumps(dict(VALID, sentiment_score=40)), json.dumps(VALID)])
+    monkeypatch.setattr(agents, "llm_for", lambda name: llm)
+
+    report = images.call_vision_model(b"jpeg")
+
+    assert report.sentiment_score == 6.5
+    assert len(llm.prompts) == 2
+    assert "sentiment_score" in llm.prompts[1]
+
+
+def test_vision_call_gives_up_after_the_retries(monkeypatch):
+    llm = ScriptedLLM(["no json"] * (REPORT_MAX_RETRIES + 2))
+    monkeypatch.setattr(agents, "llm_for", lambda name: llm)
+
+    with pytest.raises(ValueError, match="invalid report"):
+        images.call_vision_model(b"jpeg")
+    assert len(llm.prompts) == REPORT_MAX_RETRIES + 1